@@ -1,65 +1,115 @@
 import pytest
-import time
-import pickle
-import os
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from browser_pool import inject_cookies
+from cookie_vault import KINERJA_HOST, load_jar, save_jar
+from kinerja_http import KINERJA_BASE_URL
+from page_waits import NUXT_ROOT, TIMINGS, wait_for_network_idle, wait_until_settled, watch_page
+from request_blocking import BLOCKED
+from session_preflight import require_session
+
+# KINERJA_BASE_URL points the flow at another host, e.g. the stand-in (bench_flows.py)
+REVIEW_URL = f"{KINERJA_BASE_URL}/kinerjajabar/review-perilaku"
 
 class TestReview:
     @pytest.fixture(autouse=True)
-    # SAFARI BROWSER
-    def setup(self):
-        self.driver = webdriver.Safari()
-        self.driver.maximize_window()
-        yield
-        self.driver.quit()
+    # SHARED SESSION BROWSER (see conftest.py), one fresh tab per test
+    def setup(self, browser_pool):
+        # Fail fast on an expired session, before the browser is started
+        require_session(KINERJA_HOST)
+        self.browser_pool = browser_pool
+        with browser_pool.tab() as driver:
+            self.driver = driver
+            yield
     
-    def load_cookies(self, url=None):
-        """Load saved cookies if they exist"""
-        # Try multiple cookie files (same pattern as autoKuesioner)
-        cookie_files = ["peer_review_cookies.pkl", "cookies.pkl"]
+    def load_cookies(self, url=None, cookie_files=None, account=None):
+        """Load saved cookies if they exist and have not expired"""
+        # Legacy cookie files to import (same pattern as autoKuesioner)
+        if cookie_files is None:
+            cookie_files = ["peer_review_cookies.pkl", "cookies.pkl"]
+        
+        # Shared browser already holds this domain's cookies: just open the page
+        target = url or f"{KINERJA_BASE_URL}/"
+        pool = getattr(self, "browser_pool", None)
+        if pool and pool.is_warm(target):
+            self.driver.get(target)
+            print("✓ Reusing cookies already loaded in the shared browser")
+            return True
         
-        for cookie_file in cookie_files:
-            if os.path.exists(cookie_file):
-                try:
-                    # Navigate to a page first (required for adding cookies)
-                    if url:
-                        self.driver.get(url)
-                    else:
-                        self.driver.get("https://kinerja.jabarprov.go.id/")
-                    
-                    # Load cookies from file
-                    cookies = pickle.load(open(cookie_file, "rb"))
-                    for cookie in cookies:
-                        try:
-                            self.driver.add_cookie(cookie)
-                        except Exception as e:
-                            print(f"Could not add cookie: {e}")
-                    self.driver.refresh()
-                    print(f"✓ Loaded cookies from {cookie_file}")
-                    return True
-                except Exception as e:
-                    print(f"Error loading cookies from {cookie_file}: {e}")
-                    continue
+        # Freshest unexpired jar from the cookie vault (legacy .pkl files are imported)
+        jar = load_jar(KINERJA_HOST, account, legacy_files=cookie_files)
+        if jar is None:
+            print("💡 Run 'python3 extract_cookies.py' to log in again")
+            return False
+        account, cookies = jar
         
-        return False
+        try:
+            # Cookies go in before the first real load, so target opens logged in
+            method = inject_cookies(self.driver, target, cookies)
+            print(f"✓ Loaded cookies for account '{account}' ({method})")
+            if pool:
+                pool.mark_warm(target)
+            return True
+        except Exception as e:
+            print(f"Error loading cookies for account '{account}': {e}")
+            return False
     
     def save_cookies(self):
         """Save cookies for future use"""
         try:
-            cookie_file = "cookies.pkl"
-            pickle.dump(self.driver.get_cookies(), open(cookie_file, "wb"))
-            print("✓ Cookies saved successfully!")
+            save_jar(KINERJA_HOST, self.driver.get_cookies())
         except Exception as e:
             print(f"Could not save cookies: {e}")
     
+    def run_review_loop(self, max_iterations=100, page_loaded=False):
+        """Submit every pending review-perilaku review, return how many were submitted.
+        page_loaded: REVIEW_URL is already open (load_cookies(REVIEW_URL)), skip the first load"""
+        iteration = 0
+        
+        while iteration < max_iterations:
+            if iteration or not page_loaded:
+                self.driver.get(REVIEW_URL)
+            
+            try:
+                # Wait for page to load and check if "Lakukan Review" link exists
+                review_button = WebDriverWait(self.driver, 10).until(
+                    EC.presence_of_element_located((By.LINK_TEXT, "Lakukan Review"))
+                )
+                
+                # Click the review button
+                review_button.click()
+                
+                # Click all 7 rating elements
+                for i in range(1, 8):
+                    selector = f".flex:nth-child({i}) > .flex > .flex > .hidden > .bg-white:nth-child(6)"
+                    element = WebDriverWait(self.driver, 10).until(
+                        EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
+                    )
+                    element.click()
+                
+                # Click submit button
+                submit_button = WebDriverWait(self.driver, 10).until(
+                    EC.element_to_be_clickable((By.CSS_SELECTOR, ".button-green > span"))
+                )
+                watch_page(self.driver)
+                submit_button.click()
+                # Let the submit request finish before navigating away
+                wait_for_network_idle(self.driver, label="review submitted")
+                
+                iteration += 1
+                
+            except (NoSuchElementException, TimeoutException):
+                # If "Lakukan Review" button not found, exit loop
+                break
+        
+        return iteration
+    
     def test_20251003Review(self):
       
       # Try to load saved cookies first
-      cookies_loaded = self.load_cookies()
+      cookies_loaded = self.load_cookies(REVIEW_URL)
       
       if not cookies_loaded:
           
@@ -68,40 +118,12 @@ class TestReview:
           
       else:
           print("✓ Loaded saved cookies - skipping manual login")
-          time.sleep(2)  # Brief pause to ensure page is loaded
+          wait_until_settled(self.driver, NUXT_ROOT, label="review page after cookies")
       
       # Automation starts here
-      max_iterations = 100  # Safety limit
-      iteration = 0
+      reviews_done = self.run_review_loop(max_iterations=100, page_loaded=True)  # Safety limit
+      print(f"✓ Submitted {reviews_done} review(s)")
       
-      while iteration < max_iterations:
-          self.driver.get("https://kinerja.jabarprov.go.id/kinerjajabar/review-perilaku")
-          
-          try:
-              # Wait for page to load and check if "Lakukan Review" link exists
-              review_button = WebDriverWait(self.driver, 10).until(
-                  EC.presence_of_element_located((By.LINK_TEXT, "Lakukan Review"))
-              )
-              
-              # Click the review button
-              review_button.click()
-              
-              # Click all 7 rating elements
-              for i in range(1, 8):
-                  selector = f".flex:nth-child({i}) > .flex > .flex > .hidden > .bg-white:nth-child(6)"
-                  element = WebDriverWait(self.driver, 10).until(
-                      EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                  )
-                  element.click()
-              
-              # Click submit button
-              submit_button = WebDriverWait(self.driver, 10).until(
-                  EC.element_to_be_clickable((By.CSS_SELECTOR, ".button-green > span"))
-              )
-              submit_button.click()
-              
-              iteration += 1
-              
-          except (NoSuchElementException, TimeoutException):
-              # If "Lakukan Review" button not found, exit loop
-              break
\ No newline at end of file
+      TIMINGS.print_summary()
+      BLOCKED.collect(self.driver)
+      BLOCKED.print_summary()
\ No newline at end of file
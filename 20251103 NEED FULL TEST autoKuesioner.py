@@ -1,58 +1,159 @@
 import pytest
-import time
-import pickle
 import os
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+from browser_pool import inject_cookies
+from cookie_vault import KINERJA_HOST, load_jar, save_jar
+from kinerja_http import KINERJA_BASE_URL
+from locator_registry import REGISTRY
+from page_waits import (
+    NUXT_ROOT, TIMINGS, wait_for_dom_quiet, wait_for_network_idle, wait_until_settled, watch_page,
+)
+from peer_review_page import (
+    HIGH_SCORE, RADIO_IDS_JS, SCORES_FILE, build_radio_index, load_pegawai_scores, parse_roster,
+    positive_comment, question_ids_from_index,
+)
+from request_blocking import BLOCKED
+from session_preflight import require_session
+
+# KINERJA_BASE_URL points the flow at another host, e.g. the stand-in (bench_flows.py)
+KUESIONER_URL = f"{KINERJA_BASE_URL}/kuisioner-kinerja/peer-review"
+
+# Fallback locators for the step buttons; locator_registry.py learns which one to try first
+SELANJUTNYA_SELECTORS = [
+    (By.CSS_SELECTOR, "#__nuxt > div > div > div > section > section > div.mt-8.lg\\:w-8\\/12.pr-2.flex.justify-between > button:nth-child(2)"),
+    (By.CSS_SELECTOR, "div.mt-8 > button:nth-child(2)"),
+    (By.XPATH, "//button[contains(text(), 'Selanjutnya')]"),
+]
+SELESAI_KIRIM_SELECTORS = [
+    (By.CSS_SELECTOR, "#__nuxt > div > div > div > section > section > div.mt-8.lg\\:w-8\\/12.pr-2.flex.justify-between > button:nth-child(2)"),
+    (By.XPATH, "//*[@id=\"__nuxt\"]/div/div/div/section/section/div[2]/button[2]"),
+    (By.XPATH, "//button[contains(@class, 'bg-green-700') and contains(text(), 'Selesai')]"),
+    (By.XPATH, "//button[contains(text(), 'Selesai') or contains(text(), 'Kirim')]"),
+]
+
+# Applies a list of {question_id, pegawai_id, score, radio_id} cells in the page and
+# returns {"<question_id>-<pegawai_id>-<score>": status} for every cell.
+# Status is "checked", "missing", "disabled" or "unchecked". Cells with a
+# radio_id from the grid index are resolved by ID only, never by selector.
+BATCH_FILL_SCORES_JS = """
+const cells = arguments[0];
+const results = {};
+for (const cell of cells) {
+  const id = `${cell.question_id}-${cell.pegawai_id}-${cell.score}`;
+  let radio = document.getElementById(cell.radio_id || id);
+  if (!radio && !cell.radio_id) {
+    radio = document.querySelector(
+      `input[type='radio'][id^='${cell.question_id}-'][id$='-${cell.pegawai_id}-${cell.score}']`
+    );
+  }
+  if (!radio) { results[id] = "missing"; continue; }
+  if (radio.disabled) { results[id] = "disabled"; continue; }
+  if (!radio.checked) { radio.click(); }
+  results[id] = radio.checked ? "checked" : "unchecked";
+}
+return results;
+"""
+
+# Clicks "Kenal" and "Tidak" on every form > div row in one pass. Returns the
+# per-row class names of each target button and its sibling, and the target's
+# aria-pressed/aria-checked, from before the click, so READ_YES_NO_STATE_JS can
+# tell which rows actually took.
+BULK_ANSWER_YES_NO_JS = """
+const targets = [["div:nth-child(3)", 1], ["div:nth-child(5)", 2]];
+const baseline = {};
+Array.from(document.querySelectorAll("form > div")).forEach((row, i) => {
+  baseline[i + 1] = targets.map(([group, nth]) => {
+    const target = row.querySelector(`:scope > div > ${group} > div > button:nth-child(${nth})`);
+    const sibling = row.querySelector(`:scope > div > ${group} > div > button:nth-child(${3 - nth})`);
+    const before = [
+      target ? target.className : null,
+      sibling ? sibling.className : null,
+      target ? target.getAttribute("aria-pressed") || target.getAttribute("aria-checked") : null,
+    ];
+    if (target && !target.disabled) { target.click(); }
+    return before;
+  });
+});
+return baseline;
+"""
+
+# Returns the 1-based form > div rows whose Kenal and Tidak buttons both read
+# as selected: aria-pressed/aria-checked "true", or (buttons without aria state)
+# a class that changed since before the click and now differs from the sibling.
+# Two buttons that merely look different, as every yes/no pair does, are not
+# enough: a click that changed nothing is left to the per-row fallback.
+READ_YES_NO_STATE_JS = """
+const baseline = arguments[0];
+const targets = [["div:nth-child(3)", 1], ["div:nth-child(5)", 2]];
+const confirmed = [];
+Array.from(document.querySelectorAll("form > div")).forEach((row, i) => {
+  const before = baseline[i + 1];
+  if (!before) { return; }
+  const ok = targets.every(([group, nth], t) => {
+    const target = row.querySelector(`:scope > div > ${group} > div > button:nth-child(${nth})`);
+    const sibling = row.querySelector(`:scope > div > ${group} > div > button:nth-child(${3 - nth})`);
+    if (!target) { return false; }
+    const [targetBefore, , ariaBefore] = before[t];
+    const aria = target.getAttribute("aria-pressed") || target.getAttribute("aria-checked");
+    if (aria === "true") { return true; }
+    if (aria !== null || ariaBefore !== null) { return false; }
+    if (!sibling || target.className === sibling.className) { return false; }
+    return target.className !== targetBefore;
+  });
+  if (ok) { confirmed.push(i + 1); }
+});
+return confirmed;
+"""
 
 class TestKuesioner:
     @pytest.fixture(autouse=True)
-    # SAFARI BROWSER
-    def setup(self):
-        self.driver = webdriver.Safari()
-        self.driver.maximize_window()
-        yield
-        self.driver.quit()
+    # SHARED SESSION BROWSER (see conftest.py), one fresh tab per test
+    def setup(self, browser_pool):
+        # Fail fast on an expired session, before the browser is started
+        require_session(KINERJA_HOST)
+        self.browser_pool = browser_pool
+        with browser_pool.tab() as driver:
+            self.driver = driver
+            yield
     
-    def load_cookies(self, url=None):
-        """Load peer-review cookies if they exist"""
-        # Try peer-review cookies first, fallback to regular cookies
+    def load_cookies(self, url=None, account=None):
+        """Load peer-review cookies if they exist and have not expired"""
+        # Legacy cookie files to import: peer-review cookies and regular cookies
         cookie_files = ["peer_review_cookies.pkl", "cookies.pkl"]
         
-        for cookie_file in cookie_files:
-            if os.path.exists(cookie_file):
-                try:
-                    # Navigate to a page first (required for adding cookies)
-                    if url:
-                        self.driver.get(url)
-                    else:
-                        self.driver.get("https://kinerja.jabarprov.go.id/kuisioner-kinerja/peer-review")
-                    
-                    # Load cookies from file
-                    cookies = pickle.load(open(cookie_file, "rb"))
-                    for cookie in cookies:
-                        try:
-                            self.driver.add_cookie(cookie)
-                        except Exception as e:
-                            print(f"Could not add cookie: {e}")
-                    self.driver.refresh()
-                    print(f"✓ Loaded cookies from {cookie_file}")
-                    return True
-                except Exception as e:
-                    print(f"Error loading cookies from {cookie_file}: {e}")
-                    continue
+        # Shared browser already holds this domain's cookies: just open the page
+        target = url or KUESIONER_URL
+        pool = getattr(self, "browser_pool", None)
+        if pool and pool.is_warm(target):
+            self.driver.get(target)
+            print("✓ Reusing cookies already loaded in the shared browser")
+            return True
         
-        return False
+        # Freshest unexpired jar from the cookie vault (legacy .pkl files are imported)
+        jar = load_jar(KINERJA_HOST, account, legacy_files=cookie_files)
+        if jar is None:
+            print("💡 Run 'python3 extract_peer_review_cookies.py' to log in again")
+            return False
+        account, cookies = jar
+        
+        try:
+            # Cookies go in before the first real load, so target opens logged in
+            method = inject_cookies(self.driver, target, cookies)
+            print(f"✓ Loaded cookies for account '{account}' ({method})")
+            if pool:
+                pool.mark_warm(target)
+            return True
+        except Exception as e:
+            print(f"Error loading cookies for account '{account}': {e}")
+            return False
     
     def save_cookies(self):
         """Save cookies for future use"""
         try:
-            cookie_file = "cookies.pkl"
-            pickle.dump(self.driver.get_cookies(), open(cookie_file, "wb"))
-            print("✓ Cookies saved successfully!")
+            save_jar(KINERJA_HOST, self.driver.get_cookies())
         except Exception as e:
             print(f"Could not save cookies: {e}")
 
@@ -63,10 +164,10 @@ class TestKuesioner:
         print("="*60)
         
         # Wait for page to load (should already be on second page after clicking Selanjutnya)
-        time.sleep(3)
+        wait_until_settled(self.driver, NUXT_ROOT, label="second page")
         
-        # Use nth-child pattern to find pegawai names from second page
-        print("🔍 Looking for pegawai names using nth-child pattern (second page)...")
+        # Parse the whole roster from a single page snapshot
+        print("🔍 Parsing pegawai names and IDs from one page snapshot (second page)...")
         
         pegawai_names = []
         
@@ -83,108 +184,18 @@ class TestKuesioner:
         # - form > div:nth-child(section) - sections (1, 2, 3, ...)
         # - Each section contains the same pegawai but in different positions
         # - form > div:nth-child(1) > div:nth-child(3) = first pegawai in first section
-        # - form > div:nth-child(2) > div:nth-child(3) = first pegawai in second section (same name)
         # - form > div:nth-child(1) > div:nth-child(4) = second pegawai in first section
-        # - form > div:nth-child(1) > div:nth-child(5) = third pegawai in first section
         # 
-        # Solution: Extract from first section only, starting from div:nth-child(3) onwards
-        
-        # Extract pegawai names and IDs from the first section only
-        # Try div indices starting from 3, 4, 5, ... until we can't find more
-        pegawai_index = 3  # Start from 3 (as shown in examples)
-        max_attempts = 50  # Safety limit
-        attempts = 0
-        
-        pegawai_data = []  # Store both name and ID
-        
-        print("🔍 Extracting pegawai names and IDs from first section...")
+        # Solution: Parse the first section only, from div:nth-child(3) onwards,
+        # out of one page_source instead of one wait + query per index
+        try:
+            pegawai_data = parse_roster(self.driver.page_source)
+        except Exception as e:
+            print(f"   ⚠️  Error parsing page source: {e}")
+            pegawai_data = []
         
-        while attempts < max_attempts:
-            name = None
-            pegawai_id = None
-            
-            # Try to find the pegawai name in the first section at this index
-            try:
-                # Pattern: form > div:nth-child(1) > div:nth-child(pegawai_index) > div > div.flex.flex-col.gap-4.items-center > div > h6
-                selector = f"form > div:nth-child(1) > div:nth-child({pegawai_index}) > div > div.flex.flex-col.gap-4.items-center > div > h6"
-                element = WebDriverWait(self.driver, 2).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                )
-                name = element.text.strip()
-                
-                if name:
-                    # Try to extract pegawai ID from radio buttons in the same section
-                    # Look for radio buttons with pattern: [id*="-{pegawai_id}-"]
-                    # Try to find a radio button near this pegawai to extract the ID
-                    try:
-                        # Look for radio buttons in the same div structure
-                        # Radio buttons might be: form > div:nth-child(1) > div:nth-child(pegawai_index) > ... > input[type="radio"]
-                        radio_selector = f"form > div:nth-child(1) > div:nth-child({pegawai_index}) input[type='radio']"
-                        radio_buttons = self.driver.find_elements(By.CSS_SELECTOR, radio_selector)
-                        
-                        if radio_buttons:
-                            # Get the first radio button's ID to extract pegawai_id
-                            radio_id = radio_buttons[0].get_attribute("id")
-                            if radio_id:
-                                # Pattern: \31 435-199010262012061002-9 or 1435-199010262012061002-9
-                                # Extract the middle part (pegawai_id) between dashes
-                                # Remove escape sequences and split
-                                clean_id = radio_id.replace("\\31 ", "").replace("\\3", "").strip()
-                                parts = clean_id.split("-")
-                                if len(parts) >= 2:
-                                    pegawai_id = parts[1]  # Second part is the pegawai ID
-                                    print(f"      Extracted ID from radio button: {pegawai_id}")
-                        
-                        # Alternative: try to find by looking at Question 1 radio buttons (1435)
-                        if not pegawai_id:
-                            # Look for radio buttons in Question 1 to extract IDs by order
-                            try:
-                                # Try different patterns for finding Question 1 radios
-                                q1_selectors = [
-                                    "input[type='radio'][id^='\\31 435-']",
-                                    "input[type='radio'][id^='1435-']",
-                                    "input[type='radio'][id*='1435-']",
-                                ]
-                                
-                                all_radios = []
-                                for selector in q1_selectors:
-                                    try:
-                                        all_radios = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                                        if all_radios:
-                                            break
-                                    except:
-                                        continue
-                                
-                                # Get radio button at the position matching our pegawai index
-                                if all_radios and len(pegawai_data) < len(all_radios):
-                                    radio_id = all_radios[len(pegawai_data)].get_attribute("id")
-                                    if radio_id:
-                                        clean_id = radio_id.replace("\\31 ", "").replace("\\3", "").strip()
-                                        parts = clean_id.split("-")
-                                        if len(parts) >= 2:
-                                            pegawai_id = parts[1]
-                                            print(f"      Extracted ID from Q1 radio: {pegawai_id}")
-                            except Exception as e:
-                                pass
-                    except Exception as e:
-                        print(f"   ⚠️  Could not extract ID for pegawai {len(pegawai_data) + 1}: {e}")
-                    
-                    pegawai_data.append({"name": name, "id": pegawai_id, "index": pegawai_index})
-                    print(f"   ✓ Found pegawai {len(pegawai_data)}: {name} (ID: {pegawai_id or 'not found'})")
-                    pegawai_index += 1  # Move to next pegawai index
-                    attempts = 0  # Reset attempts since we found one
-                else:
-                    # Empty name, probably no more pegawai
-                    break
-            except (NoSuchElementException, TimeoutException):
-                # No more pegawai found, stop searching
-                break
-            except Exception as e:
-                print(f"   ⚠️  Error extracting pegawai at div:nth-child({pegawai_index}): {e}")
-                attempts += 1
-                if attempts >= 3:  # If we fail 3 times in a row, probably no more pegawai
-                    break
-                pegawai_index += 1  # Try next index anyway
+        for i, p in enumerate(pegawai_data, 1):
+            print(f"   ✓ Found pegawai {i}: {p['name']} (ID: {p['id'] or 'not found'})")
         
         # Return list of names for compatibility
         pegawai_names = [p["name"] for p in pegawai_data]
@@ -291,7 +302,7 @@ class TestKuesioner:
             print(f"   {i}. {scores[i]['name']}: {scores[i]['score']}")
         
         # Save scores to file
-        output_file = "pegawai_scores.txt"
+        output_file = SCORES_FILE
         try:
             with open(output_file, "w", encoding="utf-8") as file:
                 for i in sorted(scores.keys()):
@@ -302,8 +313,8 @@ class TestKuesioner:
         
         return scores
     
-    def fill_scores(self, pegawai_scores):
-        """Fill in scores by clicking radio buttons based on assigned scores"""
+    def fill_scores(self, pegawai_scores, batch=True):
+        """Fill in scores based on assigned scores (batch script first, then clicks for failed cells)"""
         print("\n" + "="*60)
         print("=== FILLING SCORES ===")
         print("="*60)
@@ -323,20 +334,11 @@ class TestKuesioner:
         # Question ID starts at 1435 and increments: 1435, 1436, 1437, ...
         # We need to find how many questions there are
         
-        # First, find all unique question IDs by looking at radio buttons
+        # First, index every radio button from a single snapshot of the grid
         try:
-            all_radio_buttons = self.driver.find_elements(By.CSS_SELECTOR, "input[type='radio'][id^='\\31 ']")
-            question_ids = set()
-            
-            for radio in all_radio_buttons:
-                radio_id = radio.get_attribute("id")
-                if radio_id:
-                    # Extract question ID: \31 1435-... -> 1435
-                    parts = radio_id.replace("\\31 ", "").split("-")
-                    if len(parts) >= 1 and parts[0].isdigit():
-                        question_ids.add(int(parts[0]))
-            
-            question_ids = sorted(list(question_ids))
+            self.radio_index = self.index_score_grid()
+            question_ids = question_ids_from_index(self.radio_index)
+            print(f"✓ Indexed {len(self.radio_index)} radio buttons")
             print(f"✓ Found {len(question_ids)} questions: {question_ids}")
             
             if not question_ids:
@@ -350,86 +352,55 @@ class TestKuesioner:
         successful_clicks = 0
         failed_clicks = 0
         
-        # Loop through each question and each pegawai
+        # Build the full (question, pegawai, score) plan up front
+        plan = []
         for question_num, question_id in enumerate(question_ids, 1):
-            print(f"\n📝 Processing Question {question_num} (ID: {question_id})...")
-            
             for pegawai_num, pegawai_info in enumerate(self.pegawai_data, 1):
                 pegawai_id = pegawai_info.get("id")
                 pegawai_name = pegawai_info.get("name")
                 
                 if not pegawai_id:
-                    print(f"   ⚠️  Pegawai {pegawai_num} ({pegawai_name}): No ID found, skipping")
+                    if question_num == 1:
+                        print(f"   ⚠️  Pegawai {pegawai_num} ({pegawai_name}): No ID found, skipping")
                     continue
                 
                 # Get assigned score for this pegawai
                 if pegawai_num not in pegawai_scores:
-                    print(f"   ⚠️  Pegawai {pegawai_num} ({pegawai_name}): No score assigned, skipping")
+                    if question_num == 1:
+                        print(f"   ⚠️  Pegawai {pegawai_num} ({pegawai_name}): No score assigned, skipping")
                     continue
                 
-                assigned_score = pegawai_scores[pegawai_num]["score"]
-                
-                # Construct radio button ID: Pattern is [question_id]-[pegawai_id]-[score]
-                # The actual ID in HTML might be: \31 [question_id]-[pegawai_id]-[score] or just [question_id]-[pegawai_id]-[score]
-                # Try multiple formats
-                radio_id_formats = [
-                    f"{question_id}-{pegawai_id}-{assigned_score}",  # Direct format
-                    f"\\31 {question_id}-{pegawai_id}-{assigned_score}",  # With escape sequence
-                ]
-                
-                clicked = False
-                
-                # Try finding by ID first
-                for radio_id in radio_id_formats:
-                    try:
-                        radio_button = WebDriverWait(self.driver, 1).until(
-                            EC.element_to_be_clickable((By.ID, radio_id))
-                        )
-                        radio_button.click()
-                        print(f"   ✓ Q{question_num} - Pegawai {pegawai_num} ({pegawai_name[:30]}...): Score {assigned_score}")
-                        time.sleep(0.2)  # Brief pause between clicks
-                        successful_clicks += 1
-                        clicked = True
-                        break
-                    except (NoSuchElementException, TimeoutException):
-                        continue
-                
-                # If ID method didn't work, try CSS selector with pegawai_id
-                if not clicked:
-                    try:
-                        # CSS selector: input[id*="{pegawai_id}-{score}"] for this question
-                        # Match radio buttons that contain both pegawai_id and the score, and the question_id
-                        alt_selector = f"input[type='radio'][id*='{question_id}-'][id*='-{pegawai_id}-'][id*='-{assigned_score}']"
-                        radio_button = WebDriverWait(self.driver, 2).until(
-                            EC.element_to_be_clickable((By.CSS_SELECTOR, alt_selector))
-                        )
-                        radio_button.click()
-                        print(f"   ✓ Q{question_num} - Pegawai {pegawai_num} ({pegawai_name[:30]}...): Score {assigned_score} (CSS selector)")
-                        time.sleep(0.2)
-                        successful_clicks += 1
-                        clicked = True
-                    except Exception as e2:
-                        # Last resort: try simpler pattern matching
-                        try:
-                            # Just match pegawai_id and score for this question
-                            simple_selector = f"input[type='radio'][id*='{pegawai_id}-{assigned_score}']"
-                            # Filter to only those in this question section
-                            all_matching = self.driver.find_elements(By.CSS_SELECTOR, simple_selector)
-                            for rb in all_matching:
-                                rb_id = rb.get_attribute("id")
-                                if rb_id and f"{question_id}-" in rb_id:
-                                    rb.click()
-                                    print(f"   ✓ Q{question_num} - Pegawai {pegawai_num} ({pegawai_name[:30]}...): Score {assigned_score} (pattern match)")
-                                    time.sleep(0.2)
-                                    successful_clicks += 1
-                                    clicked = True
-                                    break
-                        except Exception:
-                            pass
-                
-                if not clicked:
-                    print(f"   ⚠️  Q{question_num} - Pegawai {pegawai_num} ({pegawai_name[:30]}...): Could not click score {assigned_score} (ID: {pegawai_id})")
-                    failed_clicks += 1
+                plan.append({
+                    "question_num": question_num,
+                    "question_id": question_id,
+                    "pegawai_num": pegawai_num,
+                    "pegawai_id": pegawai_id,
+                    "pegawai_name": pegawai_name,
+                    "score": pegawai_scores[pegawai_num]["score"],
+                })
+        
+        # Batch mode: apply the whole plan in the page with one round trip
+        results = {}
+        if batch and plan:
+            results = self.fill_scores_batch(plan)
+            applied = sum(1 for status in results.values() if status == "checked")
+            print(f"✓ Batch fill applied {applied}/{len(plan)} cells in one call")
+        
+        # Retry only the cells the batch did not confirm through the click path
+        for cell in plan:
+            key = (cell["question_id"], cell["pegawai_id"], cell["score"])
+            if results.get(key) == "checked":
+                successful_clicks += 1
+                continue
+            
+            if batch:
+                print(f"   ↻ Q{cell['question_num']} - Pegawai {cell['pegawai_num']}: batch status '{results.get(key, 'missing')}', retrying with click")
+            
+            if self.click_score_radio(cell):
+                successful_clicks += 1
+            else:
+                print(f"   ⚠️  Q{cell['question_num']} - Pegawai {cell['pegawai_num']} ({cell['pegawai_name'][:30]}...): Could not click score {cell['score']} (ID: {cell['pegawai_id']})")
+                failed_clicks += 1
         
         print(f"\n✅ Completed filling scores:")
         print(f"   ✓ Successful: {successful_clicks}")
@@ -442,46 +413,127 @@ class TestKuesioner:
         
         return successful_clicks > 0 and selanjutnya_clicked
     
+    def index_score_grid(self):
+        """Snapshot all radio IDs in one call and index them by (question_id, pegawai_id, score)"""
+        radio_ids = self.driver.execute_script(RADIO_IDS_JS) or []
+        return build_radio_index(radio_ids)
+    
+    def fill_scores_batch(self, plan):
+        """Apply a whole score plan in one script call, return {(question_id, pegawai_id, score): status}"""
+        radio_index = getattr(self, "radio_index", None) or {}
+        cells = []
+        for c in plan:
+            locator = radio_index.get((c["question_id"], c["pegawai_id"], c["score"]))
+            cells.append({
+                "question_id": c["question_id"],
+                "pegawai_id": c["pegawai_id"],
+                "score": c["score"],
+                "radio_id": locator[1] if locator else None,
+            })
+        try:
+            raw_results = self.driver.execute_script(BATCH_FILL_SCORES_JS, cells) or {}
+        except Exception as e:
+            print(f"⚠️  Batch fill failed, falling back to clicks: {e}")
+            return {}
+        
+        results = {}
+        for c in cells:
+            radio_id = f"{c['question_id']}-{c['pegawai_id']}-{c['score']}"
+            results[(c["question_id"], c["pegawai_id"], c["score"])] = raw_results.get(radio_id, "missing")
+        return results
+    
+    def click_score_radio(self, cell):
+        """Click a single score radio button, trying ID then CSS fallbacks"""
+        question_num = cell["question_num"]
+        question_id = cell["question_id"]
+        pegawai_num = cell["pegawai_num"]
+        pegawai_id = cell["pegawai_id"]
+        pegawai_name = cell["pegawai_name"]
+        assigned_score = cell["score"]
+        
+        # Use the precomputed grid index when available: one lookup, no selector guessing.
+        # A cell the index lacks (e.g. a radio rendered after the snapshot) goes through
+        # the selector fallbacks below instead of being skipped.
+        radio_index = getattr(self, "radio_index", None) or {}
+        locator = radio_index.get((question_id, pegawai_id, assigned_score))
+        if locator:
+            try:
+                radio_button = WebDriverWait(self.driver, 1).until(
+                    EC.element_to_be_clickable(locator)
+                )
+                radio_button.click()
+                print(f"   ✓ Q{question_num} - Pegawai {pegawai_num} ({pegawai_name[:30]}...): Score {assigned_score}")
+                return True
+            except (NoSuchElementException, TimeoutException):
+                return False
+        
+        # Construct radio button ID: Pattern is [question_id]-[pegawai_id]-[score]
+        # The actual ID in HTML might be: \31 [question_id]-[pegawai_id]-[score] or just [question_id]-[pegawai_id]-[score]
+        # Try multiple formats
+        radio_id_formats = [
+            f"{question_id}-{pegawai_id}-{assigned_score}",  # Direct format
+            f"\\31 {question_id}-{pegawai_id}-{assigned_score}",  # With escape sequence
+        ]
+        
+        # Try finding by ID first
+        for radio_id in radio_id_formats:
+            try:
+                radio_button = WebDriverWait(self.driver, 1).until(
+                    EC.element_to_be_clickable((By.ID, radio_id))
+                )
+                radio_button.click()
+                print(f"   ✓ Q{question_num} - Pegawai {pegawai_num} ({pegawai_name[:30]}...): Score {assigned_score}")
+                return True
+            except (NoSuchElementException, TimeoutException):
+                continue
+        
+        # If ID method didn't work, try CSS selector with pegawai_id
+        try:
+            # CSS selector: input[id*="{pegawai_id}-{score}"] for this question
+            # Match radio buttons that contain both pegawai_id and the score, and the question_id
+            alt_selector = f"input[type='radio'][id*='{question_id}-'][id*='-{pegawai_id}-'][id*='-{assigned_score}']"
+            radio_button = WebDriverWait(self.driver, 2).until(
+                EC.element_to_be_clickable((By.CSS_SELECTOR, alt_selector))
+            )
+            radio_button.click()
+            print(f"   ✓ Q{question_num} - Pegawai {pegawai_num} ({pegawai_name[:30]}...): Score {assigned_score} (CSS selector)")
+            return True
+        except Exception as e2:
+            # Last resort: try simpler pattern matching
+            try:
+                # Just match pegawai_id and score for this question
+                simple_selector = f"input[type='radio'][id*='{pegawai_id}-{assigned_score}']"
+                # Filter to only those in this question section
+                all_matching = self.driver.find_elements(By.CSS_SELECTOR, simple_selector)
+                for rb in all_matching:
+                    rb_id = rb.get_attribute("id")
+                    if rb_id and f"{question_id}-" in rb_id:
+                        rb.click()
+                        print(f"   ✓ Q{question_num} - Pegawai {pegawai_num} ({pegawai_name[:30]}...): Score {assigned_score} (pattern match)")
+                        return True
+            except Exception:
+                pass
+        
+        return False
+    
     def click_selanjutnya_button(self):
         """Click the Selanjutnya button - reusable method"""
+        watch_page(self.driver)
+        # All candidates race in one wait; the one that worked last wins a tie
+        selanjutnya_button, locator = REGISTRY.find(
+            self.driver, "kuesioner: Selanjutnya", SELANJUTNYA_SELECTORS, timeout=10, clickable=True,
+        )
+        if not selanjutnya_button:
+            print("   ⚠️  Could not find 'Selanjutnya' button with any selector")
+            return False
         try:
-            # Selector: #__nuxt > div > div > div > section > section > div.mt-8.lg\:w-8\/12.pr-2.flex.justify-between > button:nth-child(2)
-            # Full path selector with proper escaping
-            selanjutnya_selector = "#__nuxt > div > div > div > section > section > div.mt-8.lg\\:w-8\\/12.pr-2.flex.justify-between > button:nth-child(2)"
-            
-            selanjutnya_button = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, selanjutnya_selector))
-            )
             selanjutnya_button.click()
-            print("   ✓ Clicked 'Selanjutnya' button")
-            time.sleep(2)  # Wait for page to navigate/load next step
+            print(f"   ✓ Clicked 'Selanjutnya' button ({locator[0]}={locator[1]})")
+            wait_until_settled(self.driver, NUXT_ROOT, label="next step")  # Wait for page to navigate/load next step
             return True
-        except (NoSuchElementException, TimeoutException) as e:
-            print(f"   ⚠️  Could not find or click 'Selanjutnya' button (full path): {e}")
-            # Try simpler selector pattern if full path fails
-            try:
-                simple_selector = "div.mt-8 > button:nth-child(2)"
-                selanjutnya_button = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, simple_selector))
-                )
-                selanjutnya_button.click()
-                print("   ✓ Clicked 'Selanjutnya' button (using simpler selector)")
-                time.sleep(2)
-                return True
-            except Exception as e2:
-                # Try finding by text content using XPath as last resort
-                try:
-                    selanjutnya_xpath = "//button[contains(text(), 'Selanjutnya')]"
-                    selanjutnya_button = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((By.XPATH, selanjutnya_xpath))
-                    )
-                    selanjutnya_button.click()
-                    print("   ✓ Clicked 'Selanjutnya' button (using XPath)")
-                    time.sleep(2)
-                    return True
-                except Exception as e3:
-                    print(f"   ⚠️  All methods failed: {e3}")
-                    return False
+        except Exception as e:
+            print(f"   ⚠️  Could not click 'Selanjutnya' button: {e}")
+            return False
     
     def add_comments_for_high_scores(self, pegawai_scores):
         """Add comments for pegawai with high scores (9 or 10)"""
@@ -490,7 +542,7 @@ class TestKuesioner:
         print("="*60)
         
         # Wait for page to load (should be on comments page after clicking Selanjutnya)
-        time.sleep(3)
+        wait_until_settled(self.driver, NUXT_ROOT, label="comments page")
         
         # Get pegawai data with IDs
         if not hasattr(self, 'pegawai_data') or not self.pegawai_data:
@@ -502,7 +554,7 @@ class TestKuesioner:
         for pegawai_num, pegawai_info in enumerate(self.pegawai_data, 1):
             if pegawai_num in pegawai_scores:
                 score = pegawai_scores[pegawai_num]["score"]
-                if score >= 9:  # High score is 9 or 10
+                if score >= HIGH_SCORE:  # High score is 9 or 10
                     high_score_pegawai.append({
                         "num": pegawai_num,
                         "name": pegawai_info.get("name"),
@@ -533,7 +585,7 @@ class TestKuesioner:
             
             # Textbox ID pattern: positif-{pegawai_id}
             textbox_id = f"positif-{pegawai_id}"
-            comment_text = f"{pegawai_name} sangat baik"
+            comment_text = positive_comment(pegawai_name)
             
             try:
                 # Find textbox by ID
@@ -545,7 +597,6 @@ class TestKuesioner:
                 textbox.clear()
                 textbox.send_keys(comment_text)
                 print(f"   ✓ Added comment for {pegawai_name[:30]}...: '{comment_text}'")
-                time.sleep(0.3)  # Brief pause between fills
                 successful += 1
                 
             except (NoSuchElementException, TimeoutException) as e:
@@ -562,23 +613,15 @@ class TestKuesioner:
         
         # Click "Selesai dan Kirim" button
         print("\n🔘 Clicking 'Selesai dan Kirim' button...")
-        time.sleep(2)
-        
-        # Try multiple selectors in order
-        selectors = [
-            (By.CSS_SELECTOR, "#__nuxt > div > div > div > section > section > div.mt-8.lg\\:w-8\\/12.pr-2.flex.justify-between > button:nth-child(2)"),
-            (By.XPATH, "//*[@id=\"__nuxt\"]/div/div/div/section/section/div[2]/button[2]"),
-            (By.XPATH, "//button[contains(@class, 'bg-green-700') and contains(text(), 'Selesai')]"),
-            (By.XPATH, "//button[contains(text(), 'Selesai') or contains(text(), 'Kirim')]"),
-        ]
-        
-        for by, selector in selectors:
+        wait_for_dom_quiet(self.driver, label="comments filled")
+        
+        # All selectors race in one wait; the last one that worked wins a tie
+        submit_button, locator = REGISTRY.find(
+            self.driver, "kuesioner: Selesai dan Kirim", SELESAI_KIRIM_SELECTORS, timeout=10,
+        )
+        if submit_button:
+            by = locator[0]
             try:
-                # Wait for button to be present and enabled
-                submit_button = WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((by, selector))
-                )
-                
                 # Check if button is disabled
                 is_disabled = submit_button.get_attribute("disabled") is not None
                 if is_disabled:
@@ -590,23 +633,24 @@ class TestKuesioner:
                 
                 # Scroll into view
                 self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", submit_button)
-                time.sleep(0.5)
+                wait_for_dom_quiet(self.driver, quiet=0.2, label="scrolled to submit")
+                watch_page(self.driver)
                 
                 # Try regular click first
                 try:
                     submit_button.click()
                     print(f"   ✓ Clicked 'Selesai dan Kirim' button (using {by})")
-                    time.sleep(2)
+                    wait_for_network_idle(self.driver, label="kuesioner submitted")
                     return True
                 except Exception:
                     # Fallback to JavaScript click
                     self.driver.execute_script("arguments[0].click();", submit_button)
                     print(f"   ✓ Clicked 'Selesai dan Kirim' button using JavaScript (using {by})")
-                    time.sleep(2)
+                    wait_for_network_idle(self.driver, label="kuesioner submitted")
                     return True
                     
             except (NoSuchElementException, TimeoutException):
-                continue
+                pass
         
         # If all selectors failed
         print(f"   ⚠️  Could not find or click 'Selesai dan Kirim' button with any selector")
@@ -662,7 +706,7 @@ class TestKuesioner:
                             print(f"\n✅ No buttons found after {consecutive_not_found} checks. Assuming done!")
                             break
                         print(f"   ⏳ Buttons not found, waiting... (attempt {consecutive_not_found}/{max_not_found})")
-                        time.sleep(3)  # Wait longer before retrying
+                        wait_until_settled(self.driver, NUXT_ROOT, timeout=3, label="waiting for buttons")
                         continue
                     
                     # Reset counter since we found buttons
@@ -694,7 +738,7 @@ class TestKuesioner:
                         print(f"\n✅ No button container found after {consecutive_not_found} checks. Assuming done!")
                         break
                     print(f"   ⏳ Button container not found, waiting... (attempt {consecutive_not_found}/{max_not_found})")
-                    time.sleep(3)
+                    wait_until_settled(self.driver, NUXT_ROOT, timeout=3, label="waiting for button container")
                     continue
                     
             except Exception as e:
@@ -703,7 +747,7 @@ class TestKuesioner:
                 if consecutive_not_found >= max_not_found:
                     print(f"\n⚠️  Too many errors. Stopping.")
                     break
-                time.sleep(3)
+                wait_until_settled(self.driver, NUXT_ROOT, timeout=3, label="recovering from error")
                 continue
         
         if click_count >= max_attempts:
@@ -714,7 +758,34 @@ class TestKuesioner:
         
         return click_count > 0
     
-    def answer_yes_no_questions(self, num_pegawai):
+    def yes_no_button(self, i, group, nth, timeout=5):
+        """Wait for button nth of the group in row i of the form > div list (1-based, the same
+        list BULK_ANSWER_YES_NO_JS numbers) and return it once it is clickable.
+        form > div:nth-child(i) would count every child of the form, not just the div rows."""
+        selector = f":scope > div > {group} > div > button:nth-child({nth})"
+        
+        def clickable(driver):
+            rows = driver.find_elements(By.CSS_SELECTOR, "form > div")
+            if len(rows) < i:
+                return False
+            buttons = rows[i - 1].find_elements(By.CSS_SELECTOR, selector)
+            if buttons and buttons[0].is_displayed() and buttons[0].is_enabled():
+                return buttons[0]
+            return False
+        
+        return WebDriverWait(self.driver, timeout, ignored_exceptions=(StaleElementReferenceException,)).until(clickable)
+    
+    def answer_yes_no_row(self, i):
+        """Click 'Kenal' and 'Tidak' for row i of the form > div list"""
+        # Click "Kenal" button (first question): row > div > div:nth-child(3) > div > button:nth-child(1)
+        self.yes_no_button(i, "div:nth-child(3)", 1).click()
+        print(f"   ✓ Pegawai {i}: Clicked 'Kenal'")
+        
+        # Click "Tidak" button (second question): row > div > div:nth-child(5) > div > button:nth-child(2)
+        self.yes_no_button(i, "div:nth-child(5)", 2).click()
+        print(f"   ✓ Pegawai {i}: Clicked 'Tidak'")
+    
+    def answer_yes_no_questions(self, num_pegawai, bulk=True):
         """Answer yes/no questions for each pegawai: Kenal (first) and Tidak (second)"""
         print("\n" + "="*60)
         print("=== ANSWERING YES/NO QUESTIONS ===")
@@ -743,33 +814,37 @@ class TestKuesioner:
         successful = 0
         failed = 0
         
-        # Loop through each nth-child to answer questions
-        for i in range(1, len(form_divs) + 1):
+        # Bulk mode: click every row in one script call, then confirm by reading state back
+        pending_rows = list(range(1, len(form_divs) + 1))
+        if bulk and pending_rows:
             try:
-                # Click "Kenal" button (first question)
-                # Selector: form > div:nth-child(n) > div > div:nth-child(3) > div > button:nth-child(1)
-                kenal_selector = f"form > div:nth-child({i}) > div > div:nth-child(3) > div > button:nth-child(1)"
-                
-                kenal_button = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, kenal_selector))
-                    # EC.presence_of_element_located((By.LINK_TEXT, "Kenal"))
-                )
-                kenal_button.click()
-                print(f"   ✓ Pegawai {i}: Clicked 'Kenal'")
-                time.sleep(0.5)  # Brief pause between clicks
+                baseline = self.driver.execute_script(BULK_ANSWER_YES_NO_JS) or {}
+                # Rows without both buttons cannot take in bulk; don't wait on them
+                expected = {
+                    int(row) for row, before in baseline.items()
+                    if all(state[0] is not None for state in before)
+                }
+                confirmed = set()
                 
-                # Click "Tidak" button (second question)
-                # Selector: form > div:nth-child(n) > div > div:nth-child(5) > div > button:nth-child(2)
-                tidak_selector = f"form > div:nth-child({i}) > div > div:nth-child(5) > div > button:nth-child(2)"
+                def all_rows_confirmed(driver):
+                    confirmed.update(driver.execute_script(READ_YES_NO_STATE_JS, baseline) or [])
+                    return expected <= confirmed
                 
-                tidak_button = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, tidak_selector))
-                    # EC.presence_of_element_located((By.LINK_TEXT, "Tidak"))
-                )
-                tidak_button.click()
-                print(f"   ✓ Pegawai {i}: Clicked 'Tidak'")
-                time.sleep(0.5)  # Brief pause before next pegawai
+                try:
+                    WebDriverWait(self.driver, 5, poll_frequency=0.2).until(all_rows_confirmed)
+                except TimeoutException:
+                    pass
                 
+                successful += len(confirmed)
+                pending_rows = [i for i in pending_rows if i not in confirmed]
+                print(f"✓ Bulk answered {len(confirmed)} row(s), {len(pending_rows)} left for per-row clicks")
+            except Exception as e:
+                print(f"⚠️  Bulk answering failed, falling back to per-row clicks: {e}")
+        
+        # Per-row clicks only for rows the bulk pass did not confirm
+        for i in pending_rows:
+            try:
+                self.answer_yes_no_row(i)
                 successful += 1
                 
             except (NoSuchElementException, TimeoutException) as e:
@@ -804,13 +879,9 @@ class TestKuesioner:
           raise Exception("No peer-review cookies found. Please extract cookies using 'python3 extract_peer_review_cookies.py'")
       else:
           print("✓ Loaded saved cookies - skipping manual login")
-          time.sleep(2)  # Brief pause to ensure page is loaded
       
-      # Navigate to kuesioner page (first page with yes/no questions)
-      print("\n🌐 Navigating to kuesioner page...")
-      kuesioner_url = "https://kinerja.jabarprov.go.id/kuisioner-kinerja/peer-review"
-      self.driver.get(kuesioner_url)
-      time.sleep(3)
+      # load_cookies already opened the kuesioner page (first page with yes/no questions)
+      wait_until_settled(self.driver, NUXT_ROOT, label="kuesioner page")
       
       # First: Answer yes/no questions (indiscriminate, doesn't need names)
       # Find number of pegawai by counting form divs
@@ -852,22 +923,11 @@ class TestKuesioner:
       
       # Assign scores to pegawai names (from second page)
       # If pegawai_scores.txt exists, load from file, otherwise assign interactively
-      if os.path.exists("pegawai_scores.txt"):
+      if os.path.exists(SCORES_FILE):
           print("\n✅ Pegawai scores already assigned. Loading from file...")
           # Load scores from file
-          pegawai_scores = {}
           try:
-              with open("pegawai_scores.txt", "r", encoding="utf-8") as file:
-                  for line in file:
-                      # Format: "1. Name: 8"
-                      parts = line.strip().split(": ")
-                      if len(parts) == 2:
-                          num_part = parts[0].split(". ")[0]
-                          if num_part.isdigit():
-                              num = int(num_part)
-                              name = parts[0].split(". ", 1)[1] if ". " in parts[0] else ""
-                              score = int(parts[1]) if parts[1].isdigit() else 8
-                              pegawai_scores[num] = {"name": name, "score": score}
+              pegawai_scores = load_pegawai_scores(SCORES_FILE)
               print(f"📋 Loaded scores for {len(pegawai_scores)} pegawai(s)")
           except Exception as e:
               print(f"⚠️  Error loading scores from file: {e}")
@@ -901,4 +961,7 @@ class TestKuesioner:
       # Click randomly between left and right buttons until done
       buttons_clicked = self.click_random_buttons_until_done()
       
+      TIMINGS.print_summary()
+      BLOCKED.collect(self.driver)
+      BLOCKED.print_summary()
       print(f"\n🎉 Automation complete for {len(pegawai_names)} pegawai(s)!")
\ No newline at end of file
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark of the Selenium flows against the local stand-in.
+Starts standin_server.py (the JSON API plus the review-perilaku, peer-review
+kuesioner and tampilanData pages) with a configurable latency, points the
+flows at it through KINERJA_BASE_URL / SIASN_BASE_URL, seeds a throwaway
+cookie vault and runs TestReview, TestKuesioner and TestUsulNIP in one
+browser. Reports records/min per flow; nothing touches the real portals.
+
+Records are what the stand-in accepted: submitted reviews, pegawai rated in
+a submitted kuesioner and sent usul.
+
+Usage:
+   python3 bench_flows.py --browser chrome --headless
+   python3 bench_flows.py --latency 0.15 --reviews 20 --usul 50 --flows review,usul
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from browser_backend import BROWSER, BROWSER_NAMES, HEADLESS, make_driver
+from browser_pool import BrowserPool
+from flows import KUESIONER_FLOW, REVIEW_FLOW, USUL_FLOW, load_flow
+from peer_review_page import HIGH_SCORE, SCORES_FILE
+from standin_server import StandinState, start_standin
+from usul_records import USUL_CSV, USUL_LOG
+
+FLOW_NAMES = ("review", "kuesioner", "usul")
+# Any cookie counts as logged in on the stand-in
+STANDIN_COOKIE = {"name": "standin_session", "value": "bench", "path": "/"}
+
+
+def write_inputs(workdir, state, usul_rows):
+    """pegawai_scores.txt and testUsul.csv, which the flows read from the working directory"""
+    with open(os.path.join(workdir, SCORES_FILE), "w", encoding="utf-8") as fh:
+        for num, pegawai in enumerate(state.pegawai, start=1):
+            # Every third pegawai scores high, so the positif-{id} comments are exercised too
+            fh.write(f"{num}. {pegawai['nama']}: {HIGH_SCORE if num % 3 == 0 else 8}\n")
+    with open(os.path.join(workdir, USUL_CSV), "w", encoding="utf-8") as fh:
+        fh.write("no_urut;no_peserta\n")
+        for i in range(1, usul_rows + 1):
+            fh.write(f"{i};{20250000000 + i}\n")
+
+
+def run_review(pool):
+    module = load_flow(REVIEW_FLOW)
+    flow = module.TestReview()
+    with pool.tab() as driver:
+        flow.browser_pool, flow.driver = pool, driver
+        if not flow.load_cookies(module.REVIEW_URL):
+            raise RuntimeError("stand-in cookies were not loaded")
+        flow.run_review_loop(page_loaded=True)
+
+
+def run_kuesioner(pool):
+    flow = load_flow(KUESIONER_FLOW).TestKuesioner()
+    with pool.tab() as driver:
+        flow.browser_pool, flow.driver = pool, driver
+        flow.test_20251103Kuesioner()
+
+
+def run_usul(pool):
+    flow = load_flow(USUL_FLOW).TestUsulNIP()
+    with pool.tab() as driver:
+        flow.browser_pool, flow.driver = pool, driver
+        if not flow.load_cookies():
+            raise RuntimeError("stand-in cookies were not loaded")
+        flow.open_filter_dialog()
+        flow.process_usul_records_from_csv(USUL_CSV, resume=False, log_path=USUL_LOG)
+
+
+RUNNERS = {"review": ("TestReview", run_review), "kuesioner": ("TestKuesioner", run_kuesioner),
+           "usul": ("TestUsulNIP", run_usul)}
+
+
+def count_records(state, name):
+    if name == "review":
+        return len(state.submitted_reviews)
+    if name == "kuesioner":
+        return len(state.kuesioner_submissions) * len(state.pegawai)
+    return len(state.usul_sent)
+
+
+def run_bench(flows=FLOW_NAMES, latency=0.05, reviews=10, pegawai=30, usul_rows=25,
+              browser=BROWSER, headless=HEADLESS, workdir=None):
+    """Run the flows against a fresh stand-in; returns [(name, records, seconds, error)]"""
+    state = StandinState(reviews=reviews, pegawai=pegawai)
+    server, base_url = start_standin(state=state, latency=latency)
+    workdir = workdir or tempfile.mkdtemp(prefix="kinerja_bench_")
+    os.makedirs(workdir, exist_ok=True)
+    # The flows and the vault read these at import time, so they are set before any is loaded
+    os.environ["KINERJA_BASE_URL"] = base_url
+    os.environ["SIASN_BASE_URL"] = base_url
+    os.environ["KINERJA_COOKIE_VAULT"] = os.path.join(workdir, "cookie_vault.sqlite3")
+    from cookie_vault import KINERJA_HOST, SIASN_HOST, save_jar
+
+    for host in (KINERJA_HOST, SIASN_HOST):
+        save_jar(host, [STANDIN_COOKIE])
+    write_inputs(workdir, state, usul_rows)
+    previous_cwd = os.getcwd()
+    os.chdir(workdir)
+    print(f"🧪 Stand-in at {base_url} ({latency * 1000:.0f} ms latency), working directory {workdir}")
+
+    pool = BrowserPool(lambda: make_driver(browser, headless))
+    results = []
+    try:
+        for name in flows:
+            label, runner = RUNNERS[name]
+            print(f"\n{'=' * 60}\n🏁 {label}\n{'=' * 60}")
+            start = time.perf_counter()
+            error = ""
+            try:
+                runner(pool)
+            except Exception as e:
+                error = str(e).splitlines()[0] if str(e) else type(e).__name__
+                print(f"⚠️  {label} stopped: {error}")
+            results.append((label, count_records(state, name), time.perf_counter() - start, error))
+    finally:
+        pool.quit()
+        server.shutdown()
+        os.chdir(previous_cwd)
+
+    print(f"\n📊 Stand-in benchmark ({browser}{' headless' if headless else ''}, {latency * 1000:.0f} ms latency)")
+    print(f"   {'flow':15} {'records':>8} {'seconds':>9} {'records/min':>12}")
+    for label, records, seconds, error in results:
+        print(f"   {label:15} {records:8} {seconds:9.1f} {records / max(seconds, 1e-6) * 60:12.1f}"
+              + (f"  ⚠️ {error}" if error else ""))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Selenium flows against the local stand-in")
+    parser.add_argument("--flows", default=",".join(FLOW_NAMES), help="comma-separated: review,kuesioner,usul")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds added to every stand-in response")
+    parser.add_argument("--reviews", type=int, default=10, help="pending review-perilaku reviews")
+    parser.add_argument("--pegawai", type=int, default=30, help="colleagues on the peer-review kuesioner")
+    parser.add_argument("--usul", type=int, default=25, help="rows in the generated testUsul.csv")
+    parser.add_argument("--browser", choices=BROWSER_NAMES, default=BROWSER)
+    parser.add_argument("--headless", action="store_true", default=HEADLESS)
+    parser.add_argument("--workdir", help="where logs and inputs go (default: a new temp directory)")
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.flows.split(",") if n.strip()]
+    unknown = set(names) - set(FLOW_NAMES)
+    if unknown:
+        parser.error(f"unknown flow(s): {', '.join(sorted(unknown))}")
+    run_bench(names, args.latency, args.reviews, args.pegawai, args.usul,
+              args.browser, args.headless, args.workdir)
@@ -0,0 +1,86 @@
+"""
+Browser selection shared by every flow and cookie extractor.
+Set KINERJA_BROWSER to chrome, firefox or safari (default safari) and
+KINERJA_HEADLESS=1 to run Chrome/Chromium or Firefox without a window, e.g.
+on a Linux server or in a container:
+
+   KINERJA_BROWSER=chrome KINERJA_HEADLESS=1 python3 -m pytest '20251003 TESTED autoReview.py' -v -s
+"""
+
+import os
+
+from selenium import webdriver
+
+from har_recorder import HAR
+from request_blocking import BLOCK_REQUESTS, RECORD_SIZES, apply_blocking, configure_chrome, configure_firefox
+
+BROWSER = os.environ.get("KINERJA_BROWSER", "safari").strip().lower()
+HEADLESS = os.environ.get("KINERJA_HEADLESS", "").strip().lower() in ("1", "true", "yes", "on")
+# Headless windows start small; the flows' selectors assume a desktop layout
+WINDOW_SIZE = (1920, 1080)
+BROWSER_NAMES = ("chrome", "firefox", "safari")
+
+
+def chrome_options(headless, block_requests=False):
+    options = webdriver.ChromeOptions()
+    if block_requests or HAR or RECORD_SIZES:
+        # All three read the network events from the performance log
+        configure_chrome(options)
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument(f"--window-size={WINDOW_SIZE[0]},{WINDOW_SIZE[1]}")
+        # Needed when running as root inside containers
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+    return options
+
+
+def firefox_options(headless, block_requests=False):
+    options = webdriver.FirefoxOptions()
+    if block_requests:
+        configure_firefox(options)
+    if headless:
+        options.add_argument("-headless")
+        options.add_argument(f"--width={WINDOW_SIZE[0]}")
+        options.add_argument(f"--height={WINDOW_SIZE[1]}")
+    return options
+
+
+def prepare_tab(driver, block_requests=None, verbose=True):
+    """Install the request filter and the HAR recorder on the driver's current tab.
+    Both are CDP settings of one target, so every new tab needs them again."""
+    block_requests = BLOCK_REQUESTS if block_requests is None else block_requests
+    if not hasattr(driver, "execute_cdp_cmd"):
+        return  # Firefox blocks through preferences; Safari can do neither
+    if block_requests:
+        apply_blocking(driver, verbose=verbose)
+    if HAR:
+        HAR.start(driver)
+
+
+def make_driver(browser=None, headless=None, block_requests=None):
+    """Start a WebDriver session for the configured (or given) browser.
+    block_requests (default KINERJA_BLOCK_REQUESTS) filters images, fonts, media and analytics"""
+    browser = (browser or BROWSER).lower()
+    headless = HEADLESS if headless is None else headless
+    block_requests = BLOCK_REQUESTS if block_requests is None else block_requests
+    if browser == "chrome":
+        driver = webdriver.Chrome(options=chrome_options(headless, block_requests))
+        prepare_tab(driver, block_requests)
+    elif browser == "firefox":
+        driver = webdriver.Firefox(options=firefox_options(headless, block_requests))
+    elif browser == "safari":
+        if headless:
+            print("ℹ️ Safari has no headless mode; opening a normal window")
+            headless = False
+        if block_requests:
+            print("ℹ️ Safari cannot block requests; loading every asset")
+        driver = webdriver.Safari()
+    else:
+        raise ValueError(f"Unknown browser '{browser}' (expected one of {', '.join(BROWSER_NAMES)})")
+
+    if HAR and browser != "chrome":
+        print("ℹ️ HAR recording needs Chrome; this run is not recorded")
+    if not headless:
+        driver.maximize_window()
+    return driver
@@ -0,0 +1,154 @@
+"""
+One browser shared by every flow in a test session.
+The browser is launched once; cookies loaded for a domain stay in its cookie
+store, so later flows on the same domain skip the cookie round trips. Each
+flow gets a fresh tab and the tab is closed afterwards.
+
+inject_cookies puts a saved jar into a browser before the first real page
+load, so that load is already authenticated. When the URL is on another host
+than the jar (the stand-in server or a HAR replay on 127.0.0.1), the cookies
+are installed as host-only cookies of that host instead of being rejected.
+"""
+
+import os
+import threading
+import urllib.parse
+from contextlib import contextmanager
+
+from selenium.common.exceptions import WebDriverException
+
+from browser_backend import make_driver, prepare_tab
+
+# Cheap same-origin URL to open before add_cookie when CDP is not available
+COOKIE_BOOTSTRAP_PATH = os.environ.get("COOKIE_BOOTSTRAP_PATH", "/favicon.ico")
+CDP_SAME_SITE = {"strict": "Strict", "lax": "Lax", "none": "None"}
+
+
+def domain_of(url):
+    """Host name used as the warm-session key"""
+    return (urllib.parse.urlsplit(url).hostname or "").lower()
+
+
+def domain_matches(host, cookie_domain):
+    """Cookie domain-match: the host itself or a subdomain of it"""
+    cookie_domain = cookie_domain.lstrip(".").lower()
+    return host == cookie_domain or host.endswith("." + cookie_domain)
+
+
+def for_target(cookie, url):
+    """The cookie as it should be set for url: unchanged when url is on the cookie's domain,
+    otherwise without its domain (host-only for url's host) and, on plain http, without
+    Secure and SameSite=None, which such a host would reject"""
+    parts = urllib.parse.urlsplit(url)
+    if not cookie.get("domain") or domain_matches((parts.hostname or "").lower(), cookie["domain"]):
+        return cookie
+    cookie = {k: v for k, v in cookie.items() if k != "domain"}
+    if parts.scheme == "http":
+        cookie["secure"] = False
+        if str(cookie.get("sameSite", "")).lower() == "none":
+            cookie.pop("sameSite")
+    return cookie
+
+
+def cdp_cookie(cookie, url):
+    """Selenium cookie dict -> Network.CookieParam"""
+    param = {
+        "name": cookie["name"],
+        "value": cookie["value"],
+        "path": cookie.get("path") or "/",
+        "secure": bool(cookie.get("secure")),
+        "httpOnly": bool(cookie.get("httpOnly")),
+    }
+    if cookie.get("domain"):
+        param["domain"] = cookie["domain"]
+    else:
+        param["url"] = url
+    if cookie.get("expiry"):
+        param["expires"] = cookie["expiry"]
+    same_site = CDP_SAME_SITE.get(str(cookie.get("sameSite", "")).lower())
+    if same_site:
+        param["sameSite"] = same_site
+    return param
+
+
+def inject_cookies(driver, url, cookies):
+    """Install cookies, then open url once; returns how they were set ("cdp" or "bootstrap").
+    Chromium drivers set the whole jar in one Network.setCookies call. Other
+    browsers open a tiny same-origin URL first, because add_cookie only works
+    on the cookie's own domain, then go straight to url instead of refreshing."""
+    retargeted = [for_target(c, url) for c in cookies]
+    moved = sum(1 for before, after in zip(cookies, retargeted) if before is not after)
+    if moved:
+        print(f"ℹ️ Setting {moved} cookie(s) saved for another domain on {domain_of(url)}")
+    cookies = retargeted
+    if hasattr(driver, "execute_cdp_cmd"):
+        try:
+            driver.execute_cdp_cmd("Network.setCookies", {"cookies": [cdp_cookie(c, url) for c in cookies]})
+            driver.get(url)
+            return "cdp"
+        except WebDriverException as e:
+            print(f"⚠️  Network.setCookies failed, using the bootstrap page: {e.msg}")
+
+    parts = urllib.parse.urlsplit(url)
+    driver.get(f"{parts.scheme}://{parts.netloc}{COOKIE_BOOTSTRAP_PATH}")
+    for cookie in cookies:
+        try:
+            driver.add_cookie({k: v for k, v in cookie.items() if v is not None})
+        except Exception as e:
+            print(f"Could not add cookie {cookie.get('name')}: {e}")
+    driver.get(url)
+    return "bootstrap"
+
+
+class BrowserPool:
+    """Lazily launched shared browser handing out one clean tab per flow"""
+
+    def __init__(self, driver_factory=make_driver, tab_setup=prepare_tab):
+        self.driver_factory = driver_factory
+        self.tab_setup = tab_setup
+        self.driver = None
+        self.base_handle = None
+        self.warm_domains = set()
+        self.lock = threading.Lock()
+
+    def start(self):
+        if self.driver is None:
+            print("🔧 Launching shared browser...")
+            self.driver = self.driver_factory()
+            self.base_handle = self.driver.current_window_handle
+        return self.driver
+
+    @contextmanager
+    def tab(self):
+        """Yield the driver switched to a fresh tab; close the tab afterwards"""
+        with self.lock:
+            driver = self.start()
+            driver.switch_to.new_window("tab")
+            handle = driver.current_window_handle
+            # Request blocking and HAR recording are per tab (CDP target)
+            if self.tab_setup:
+                self.tab_setup(driver, verbose=False)
+        try:
+            yield driver
+        finally:
+            with self.lock:
+                try:
+                    if handle in driver.window_handles:
+                        driver.switch_to.window(handle)
+                        driver.close()
+                    driver.switch_to.window(self.base_handle)
+                except Exception as e:
+                    print(f"⚠️  Could not close tab: {e}")
+
+    def is_warm(self, url):
+        """True once cookies for this url's domain are in the browser"""
+        return domain_of(url) in self.warm_domains
+
+    def mark_warm(self, url):
+        self.warm_domains.add(domain_of(url))
+
+    def quit(self):
+        if self.driver is not None:
+            self.driver.quit()
+            self.driver = None
+            self.warm_domains.clear()
@@ -0,0 +1,28 @@
+import pytest
+
+from browser_pool import BrowserPool
+from standin_server import start_standin
+
+
+@pytest.fixture(scope="session")
+def browser_pool():
+    """Shared browser for TestReview, TestKuesioner and TestUsulNIP"""
+    pool = BrowserPool()
+    yield pool
+    pool.quit()
+
+
+@pytest.fixture
+def standin():
+    """Start a stand-in portal: standin(state=None) returns (server, base_url); stopped after the test"""
+    servers = []
+
+    def start(state=None):
+        server, base_url = start_standin(state=state)
+        servers.append(server)
+        return server, base_url
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
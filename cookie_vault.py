@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Cookie vault: every saved browser session in one SQLite file.
+Jars are keyed by (domain, account) and carry the session's expiry, so a flow
+picks its jar with one indexed lookup and stale sessions are skipped before
+any browser is opened. The database runs in WAL mode, so several worker
+processes can read (and the extractors write) at the same time.
+
+The old cookies.pkl / peer_review_cookies.pkl / siasn_cookies.pkl files are
+imported automatically the first time a flow asks for them.
+
+Usage:
+   python3 cookie_vault.py list
+   python3 cookie_vault.py import cookies.pkl --domain kinerja.jabarprov.go.id --account default
+"""
+
+import argparse
+import json
+import os
+import pickle
+import re
+import sqlite3
+import time
+import urllib.parse
+from contextlib import closing, contextmanager
+
+VAULT_PATH = os.environ.get("KINERJA_COOKIE_VAULT", "cookie_vault.sqlite3")
+KINERJA_HOST = "kinerja.jabarprov.go.id"
+SIASN_HOST = "siasn-instansi.bkn.go.id"
+DEFAULT_ACCOUNT = "default"
+# Account names for the legacy pickles; any other .pkl uses its file stem
+LEGACY_ACCOUNTS = {
+    "cookies.pkl": DEFAULT_ACCOUNT,
+    "peer_review_cookies.pkl": "peer_review",
+    "siasn_cookies.pkl": DEFAULT_ACCOUNT,
+}
+# nuxt/auth stores the token expiry (ms since epoch) in this cookie
+TOKEN_EXPIRY_COOKIE = "auth._token_expiration.local"
+# Cookies that carry the login (nuxt/auth tokens, Keycloak and server sessions); analytics
+# and CSRF cookies expire on their own schedule and say nothing about the session
+AUTH_COOKIE = re.compile(r"auth|token|session|sess|sid|keycloak|jwt", re.IGNORECASE)
+NOT_AUTH_COOKIE = re.compile(r"csrf|xsrf", re.IGNORECASE)
+# Bumped when jar_expiry changes, so stored expiries are recomputed
+SCHEMA_VERSION = 1
+# Treat a jar as stale this many seconds before it actually expires
+EXPIRY_MARGIN = 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jars (
+    domain TEXT NOT NULL,
+    account TEXT NOT NULL,
+    cookies TEXT NOT NULL,
+    saved_at REAL NOT NULL,
+    expires_at REAL,
+    PRIMARY KEY (domain, account)
+)
+"""
+
+
+def domain_key(url_or_host):
+    """Normalise a URL or host name to the vault's domain key"""
+    text = url_or_host.strip().lower()
+    if "//" in text:
+        text = urllib.parse.urlsplit(text).hostname or ""
+    return text.lstrip(".")
+
+
+def legacy_account(path):
+    name = os.path.basename(path)
+    return LEGACY_ACCOUNTS.get(name, os.path.splitext(name)[0])
+
+
+def is_auth_cookie(name):
+    return bool(AUTH_COOKIE.search(name or "")) and not NOT_AUTH_COOKIE.search(name or "")
+
+
+def jar_expiry(cookies):
+    """Earliest expiry (epoch seconds) among the jar's auth cookies, None for session-only jars
+    and jars without a recognisable auth cookie"""
+    auth = [c for c in cookies if is_auth_cookie(c.get("name"))]
+    expiries = [float(c["expiry"]) for c in auth if c.get("expiry")]
+    for cookie in auth:
+        if cookie.get("name") == TOKEN_EXPIRY_COOKIE:
+            try:
+                expiries.append(float(cookie["value"]) / 1000)
+            except (TypeError, ValueError):
+                pass
+    return min(expiries) if expiries else None
+
+
+def is_stale(expires_at, now=None):
+    if expires_at is None:
+        return False
+    return expires_at - EXPIRY_MARGIN <= (now or time.time())
+
+
+class CookieVault:
+    """SQLite-backed store of cookie jars indexed by (domain, account)"""
+
+    def __init__(self, path=VAULT_PATH):
+        self.path = path
+        with self._transaction() as conn:
+            conn.execute(SCHEMA)
+            if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                # Jars saved before expiry ignored non-auth cookies may be marked stale too early
+                rows = conn.execute("SELECT domain, account, cookies FROM jars").fetchall()
+                conn.executemany(
+                    "UPDATE jars SET expires_at = ? WHERE domain = ? AND account = ?",
+                    [(jar_expiry(json.loads(c)), d, a) for d, a, c in rows],
+                )
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """A connection that commits (or rolls back) and is closed afterwards;
+        "with sqlite3.connect()" alone only commits"""
+        with closing(self._connect()) as conn:
+            with conn:
+                yield conn
+
+    def put(self, domain, account, cookies):
+        """Store (or replace) a jar; returns its expiry"""
+        expires_at = jar_expiry(cookies)
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO jars (domain, account, cookies, saved_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (domain_key(domain), account, json.dumps(cookies), time.time(), expires_at),
+            )
+        return expires_at
+
+    def _row(self, domain, account):
+        with self._transaction() as conn:
+            return conn.execute(
+                "SELECT account, cookies, saved_at, expires_at FROM jars WHERE domain = ? AND account = ?",
+                (domain_key(domain), account),
+            ).fetchone()
+
+    def saved_at(self, domain, account):
+        row = self._row(domain, account)
+        return row[2] if row else None
+
+    def get(self, domain, account=DEFAULT_ACCOUNT, include_stale=False):
+        """Return (account, cookies) for the account's fresh jar, or None"""
+        row = self._row(domain, account or DEFAULT_ACCOUNT)
+        if row and (include_stale or not is_stale(row[3])):
+            return row[0], json.loads(row[1])
+        return None
+
+    def accounts(self, domain):
+        """Accounts with a jar (fresh or not) for the domain"""
+        with self._transaction() as conn:
+            rows = conn.execute("SELECT account FROM jars WHERE domain = ? ORDER BY account",
+                                (domain_key(domain),)).fetchall()
+        return [row[0] for row in rows]
+
+    def jars(self, domain=None):
+        """List (domain, account, cookie count, saved_at, expires_at) for every jar"""
+        query = "SELECT domain, account, cookies, saved_at, expires_at FROM jars"
+        params = ()
+        if domain:
+            query += " WHERE domain = ?"
+            params = (domain_key(domain),)
+        with self._transaction() as conn:
+            rows = conn.execute(query + " ORDER BY domain, account", params).fetchall()
+        return [(d, a, len(json.loads(c)), s, e) for d, a, c, s, e in rows]
+
+    def delete(self, domain, account):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM jars WHERE domain = ? AND account = ?", (domain_key(domain), account))
+
+    def import_pickle(self, path, domain, account=None):
+        """Import a legacy .pkl jar; returns the account it was stored under"""
+        with open(path, "rb") as fh:
+            cookies = pickle.load(fh)
+        account = account or legacy_account(path)
+        self.put(domain, account, cookies)
+        return account
+
+
+def candidate_accounts(account=None, legacy_files=()):
+    """Accounts to look in, in order: the given one, or else the caller's legacy files
+    in the order given (e.g. peer_review before default) followed by the default account"""
+    if account:
+        return [account]
+    names = [legacy_account(path) for path in legacy_files] + [DEFAULT_ACCOUNT]
+    return list(dict.fromkeys(names))
+
+
+def load_jar(domain, account=None, legacy_files=(), vault=None):
+    """Find a fresh jar for the domain, importing newer legacy .pkl files first.
+    Without an account only the caller's own accounts are tried (see candidate_accounts);
+    a jar saved for another account, e.g. one imported by run_review_accounts.py, is
+    never used instead. Returns (account, cookies) or None when nothing usable is stored."""
+    vault = vault or CookieVault()
+    for path in legacy_files:
+        if not os.path.exists(path):
+            continue
+        name = account or legacy_account(path)
+        saved_at = vault.saved_at(domain, name)
+        if saved_at is None or os.path.getmtime(path) > saved_at:
+            try:
+                vault.import_pickle(path, domain, name)
+                print(f"📥 Imported {path} into the cookie vault as {domain_key(domain)}/{name}")
+            except Exception as e:
+                print(f"⚠️  Could not import {path}: {e}")
+
+    candidates = candidate_accounts(account, legacy_files)
+    for name in candidates:
+        found = vault.get(domain, name)
+        if found is not None:
+            return found
+
+    stale = [name for name in candidates if vault.get(domain, name, include_stale=True)]
+    others = [name for name in vault.accounts(domain) if name not in candidates]
+    if stale:
+        print(f"⌛ Cookies for {domain_key(domain)}/{stale[0]} have expired")
+    else:
+        print(f"ℹ️ No cookies stored for {domain_key(domain)}/{' or '.join(candidates)}")
+    if others:
+        print(f"   Not guessing between the other saved account(s) ({', '.join(others)}); pass the account explicitly")
+    return None
+
+
+def save_jar(domain, cookies, account=DEFAULT_ACCOUNT, vault=None):
+    """Store a browser's cookies in the vault (used by the extractors and flows)"""
+    vault = vault or CookieVault()
+    expires_at = vault.put(domain, account, cookies)
+    until = time.strftime("%Y-%m-%d %H:%M", time.localtime(expires_at)) if expires_at else "end of session"
+    print(f"💾 Saved {len(cookies)} cookies to {vault.path} as {domain_key(domain)}/{account} (valid until {until})")
+    return expires_at
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or fill the cookie vault")
+    parser.add_argument("--vault", default=VAULT_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="show stored jars and their expiry")
+    imp = sub.add_parser("import", help="import a legacy .pkl cookie jar")
+    imp.add_argument("path")
+    imp.add_argument("--domain", default=KINERJA_HOST)
+    imp.add_argument("--account")
+    args = parser.parse_args()
+
+    vault = CookieVault(args.vault)
+    if args.command == "import":
+        name = vault.import_pickle(args.path, args.domain, args.account)
+        print(f"✓ Imported {args.path} as {domain_key(args.domain)}/{name}")
+    else:
+        for domain, account, count, saved_at, expires_at in vault.jars():
+            status = "expired" if is_stale(expires_at) else "fresh"
+            until = time.strftime("%Y-%m-%d %H:%M", time.localtime(expires_at)) if expires_at else "session"
+            print(f"{domain:32} {account:20} {count:3} cookies  until {until:16}  {status}")
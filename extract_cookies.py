@@ -4,15 +4,15 @@ Helper script to extract cookies by automated login.
 Enter username and password in terminal, script will automate login.
 """
 
-import pickle
 import time
 import os
 import getpass
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import NoSuchElementException
+
+from browser_backend import BROWSER, HEADLESS, make_driver
+from cookie_vault import DEFAULT_ACCOUNT, KINERJA_HOST, VAULT_PATH, save_jar
+from locator_registry import REGISTRY
 
 def extract_cookies():
     """Automate login and extract cookies"""
@@ -21,7 +21,7 @@ def extract_cookies():
     print("="*60)
     print("\n📋 This script will:")
     print("   1. Ask for your username and password in terminal")
-    print("   2. Open Safari and automate the login process")
+    print("   2. Open the browser (KINERJA_BROWSER, default Safari) and automate the login process")
     print("   3. Extract and save cookies for future use")
     print("\n" + "="*60)
     
@@ -36,9 +36,9 @@ def extract_cookies():
     
     driver = None
     try:
-        print("\n🔧 Opening Safari...")
-        driver = webdriver.Safari()
-        driver.maximize_window()
+        print(f"\n🔧 Opening {BROWSER.capitalize()}{' (headless)' if HEADLESS else ''}...")
+        # Login pages may need their images (e.g. captcha), so nothing is blocked here
+        driver = make_driver(block_requests=False)
         
         print("🌐 Navigating to login page...")
         driver.get("https://kinerja.jabarprov.go.id/")
@@ -63,15 +63,10 @@ def extract_cookies():
             (By.XPATH, "//input[@placeholder='Username' or @placeholder='Email']"),
         ]
         
-        for selector_type, selector_value in username_selectors:
-            try:
-                username_field = WebDriverWait(driver, 2).until(
-                    EC.presence_of_element_located((selector_type, selector_value))
-                )
-                print(f"✓ Found username field using {selector_type}={selector_value}")
-                break
-            except TimeoutException:
-                continue
+        # All selectors race in one wait; the one that worked last time wins a tie
+        username_field, locator = REGISTRY.find(driver, "kinerja login: username", username_selectors, timeout=5)
+        if username_field:
+            print(f"✓ Found username field using {locator[0]}={locator[1]}")
         
         if not username_field:
             print("\n⚠️  Could not find username field automatically.")
@@ -147,11 +142,10 @@ def extract_cookies():
         cookies = driver.get_cookies()
         
         if cookies:
-            cookie_file = "cookies.pkl"
-            pickle.dump(cookies, open(cookie_file, "wb"))
             print(f"\n✅ SUCCESS!")
             print(f"   Extracted {len(cookies)} cookies")
-            print(f"   Saved to: {cookie_file}")
+            save_jar(KINERJA_HOST, cookies, account=DEFAULT_ACCOUNT)
+            print(f"   Saved to: {VAULT_PATH}")
             print("\n🎉 Cookies saved! You can now run your automation script:")
             print("   python3 -m pytest '20251003 TESTED autoReview.py' -v -s")
             print("   It will automatically use these cookies and skip login.")
@@ -164,7 +158,7 @@ def extract_cookies():
         else:
             print("\n⚠️  No cookies found!")
             print("\n💡 TROUBLESHOOTING:")
-            print("   - Login might have failed - check the Safari window")
+            print("   - Login might have failed - check the browser window")
             print("   - Make sure credentials are correct")
             print("   - Website might have changed login form structure")
             return False
@@ -172,14 +166,14 @@ def extract_cookies():
     except Exception as e:
         print(f"\n❌ Error: {e}")
         print("\n💡 TROUBLESHOOTING:")
-        print("   - Check if Safari WebDriver is properly set up")
+        print("   - Check if the WebDriver for KINERJA_BROWSER is properly set up")
         print("   - Make sure the website is accessible")
         print("   - Verify your credentials are correct")
         return False
         
     finally:
         if driver:
-            print("\n🔒 Closing Safari...")
+            print("\n🔒 Closing browser...")
             driver.quit()
 
 if __name__ == "__main__":
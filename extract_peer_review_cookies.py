@@ -4,16 +4,17 @@ Helper script to extract cookies for peer-review page.
 Navigates to peer-review page, logs in, and saves cookies separately.
 """
 
-import pickle
 import time
 import os
 import getpass
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 
+from browser_backend import BROWSER, HEADLESS, make_driver
+from cookie_vault import KINERJA_HOST, VAULT_PATH, save_jar
+
 def extract_peer_review_cookies():
     """Automate login on peer-review page and extract cookies"""
     print("\n" + "="*60)
@@ -23,7 +24,7 @@ def extract_peer_review_cookies():
     print("   1. Ask for your username and password in terminal")
     print("   2. Navigate to peer-review page")
     print("   3. Automate the login process")
-    print("   4. Extract and save cookies as peer_review_cookies.pkl")
+    print("   4. Extract and save cookies to the cookie vault")
     print("\n" + "="*60)
     
     # Get credentials from terminal
@@ -37,9 +38,9 @@ def extract_peer_review_cookies():
     
     driver = None
     try:
-        print("\n🔧 Opening Safari...")
-        driver = webdriver.Safari()
-        driver.maximize_window()
+        print(f"\n🔧 Opening {BROWSER.capitalize()}{' (headless)' if HEADLESS else ''}...")
+        # Login pages may need their images (e.g. captcha), so nothing is blocked here
+        driver = make_driver(block_requests=False)
         
         # Navigate directly to peer-review page
         peer_review_url = "https://kinerja.jabarprov.go.id/kuisioner-kinerja/peer-review"
@@ -173,11 +174,10 @@ def extract_peer_review_cookies():
         cookies = driver.get_cookies()
         
         if cookies:
-            cookie_file = "peer_review_cookies.pkl"
-            pickle.dump(cookies, open(cookie_file, "wb"))
             print(f"\n✅ SUCCESS!")
             print(f"   Extracted {len(cookies)} cookies")
-            print(f"   Saved to: {cookie_file}")
+            save_jar(KINERJA_HOST, cookies, account="peer_review")
+            print(f"   Saved to: {VAULT_PATH}")
             print("\n🎉 Peer-review cookies saved!")
             print("   Your kuesioner script will now use these cookies.")
             
@@ -189,7 +189,7 @@ def extract_peer_review_cookies():
         else:
             print("\n⚠️  No cookies found!")
             print("\n💡 TROUBLESHOOTING:")
-            print("   - Login might have failed - check the Safari window")
+            print("   - Login might have failed - check the browser window")
             print("   - Make sure credentials are correct")
             print("   - Website might have changed login form structure")
             return False
@@ -197,14 +197,14 @@ def extract_peer_review_cookies():
     except Exception as e:
         print(f"\n❌ Error: {e}")
         print("\n💡 TROUBLESHOOTING:")
-        print("   - Check if Safari WebDriver is properly set up")
+        print("   - Check if the WebDriver for KINERJA_BROWSER is properly set up")
         print("   - Make sure the website is accessible")
         print("   - Verify your credentials are correct")
         return False
         
     finally:
         if driver:
-            print("\n🔒 Closing Safari...")
+            print("\n🔒 Closing browser...")
             driver.quit()
 
 if __name__ == "__main__":
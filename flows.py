@@ -0,0 +1,30 @@
+"""
+Load the dated flow scripts as modules.
+Their file names contain spaces, so runners cannot import them directly;
+this lets them reuse TestReview / TestKuesioner / TestUsulNIP outside pytest.
+"""
+
+import importlib.util
+import os
+import threading
+
+REVIEW_FLOW = "20251003 TESTED autoReview.py"
+KUESIONER_FLOW = "20251103 NEED FULL TEST autoKuesioner.py"
+USUL_FLOW = "20251126 autoUsulNIP.py"
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_loaded = {}
+_lock = threading.Lock()
+
+
+def load_flow(filename):
+    """Import a flow script by file name (cached) and return the module"""
+    path = os.path.join(_HERE, filename)
+    with _lock:
+        if path not in _loaded:
+            module_name = "flow_" + os.path.splitext(filename)[0].split()[-1]
+            spec = importlib.util.spec_from_file_location(module_name, path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            _loaded[path] = module
+        return _loaded[path]
@@ -0,0 +1,172 @@
+"""
+HAR recorder for the automation browser.
+Set KINERJA_HAR to a file name and every request and response a Chrome
+session makes during a review, kuesioner or usul run is written to that HAR
+1.2 archive when the run ends; har_replay.py serves it back offline.
+
+   KINERJA_HAR=usul.har KINERJA_BROWSER=chrome python3 -m pytest '20251126 autoUsulNIP.py' -v -s
+
+Requests and responses come from the Chrome performance log. Chrome drops
+response bodies once a page navigates away, so while recording the log is
+read after every page wait and the bodies of finished responses are fetched
+right then (CDP Network.getResponseBody). Requests blocked by
+request_blocking.py never reach the archive. Chrome only.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+import urllib.parse
+from datetime import datetime, timezone
+
+from selenium.common.exceptions import WebDriverException
+
+from page_waits import WAIT_HOOKS
+from request_blocking import PERFORMANCE_LISTENERS, drain_performance_log
+
+HAR_PATH = os.environ.get("KINERJA_HAR", "").strip()
+# Keep bodies in Chrome until the recorder has read them
+NETWORK_BUFFERS = {"maxTotalBufferSize": 200 * 1024 * 1024, "maxResourceBufferSize": 50 * 1024 * 1024}
+
+
+def _header_list(headers):
+    """CDP header dict -> HAR name/value list (CDP joins repeated headers with newlines)"""
+    return [{"name": name, "value": value}
+            for name, values in (headers or {}).items() for value in str(values).split("\n")]
+
+
+def _header(headers, name):
+    for key, value in (headers or {}).items():
+        if key.lower() == name:
+            return str(value)
+    return ""
+
+
+class HarRecorder:
+    """Turns performance-log network events into HAR entries"""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = []
+        self.pending = {}  # requestId -> request seen, response not finished yet
+        self.raw_headers = {}  # requestId -> response headers as sent (with Set-Cookie)
+        self.lock = threading.Lock()
+        self.started = False
+
+    def start(self, driver):
+        """Enable network buffering on driver and hook the recorder in (once per process)"""
+        try:
+            driver.execute_cdp_cmd("Network.enable", NETWORK_BUFFERS)
+        except WebDriverException as e:
+            print(f"⚠️  Could not record network traffic: {e.msg}")
+            return False
+        if not self.started:
+            PERFORMANCE_LISTENERS.append(self.record)
+            WAIT_HOOKS.append(drain_performance_log)
+            atexit.register(self.save)
+            self.started = True
+            print(f"🎙️  Recording network traffic to {self.path}")
+        return True
+
+    def record(self, driver, messages):
+        with self.lock:
+            for message in messages:
+                method = message.get("method")
+                params = message.get("params", {})
+                request_id = params.get("requestId")
+                if method == "Network.requestWillBeSent":
+                    if params.get("redirectResponse") and request_id in self.pending:
+                        # A redirect reuses the request id; the previous hop ends here
+                        hop = self.pending.pop(request_id)
+                        self._add(hop, params["redirectResponse"], params.get("timestamp"),
+                                  raw_headers=self.raw_headers.pop(request_id, None))
+                    self.pending[request_id] = {
+                        "request": params.get("request", {}),
+                        "wall_time": params.get("wallTime") or time.time(),
+                        "timestamp": params.get("timestamp"),
+                        "response": None,
+                    }
+                elif method == "Network.responseReceived" and request_id in self.pending:
+                    self.pending[request_id]["response"] = params.get("response")
+                elif method == "Network.responseReceivedExtraInfo":
+                    self.raw_headers[request_id] = params.get("headers")
+                elif method == "Network.loadingFinished" and request_id in self.pending:
+                    entry = self.pending.pop(request_id)
+                    if entry["response"]:
+                        self._add(entry, entry["response"], params.get("timestamp"),
+                                  self._body(driver, request_id), self.raw_headers.pop(request_id, None))
+                elif method == "Network.loadingFailed":
+                    # Blocked or cancelled: there is nothing to replay
+                    self.pending.pop(request_id, None)
+                    self.raw_headers.pop(request_id, None)
+
+    def _body(self, driver, request_id):
+        try:
+            return driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+        except WebDriverException:
+            return None  # evicted, or the request belongs to another tab
+
+    def _add(self, entry, response, finished, body=None, raw_headers=None):
+        request = entry["request"]
+        url = request.get("url", "")
+        if not url.startswith("http"):
+            return  # data: and blob: URLs
+        elapsed = max(0.0, (finished - entry["timestamp"]) * 1000) if finished and entry["timestamp"] else 0.0
+        headers = raw_headers or response.get("headers")
+        content = {"size": len(body["body"]) if body else 0, "mimeType": response.get("mimeType", "")}
+        if body:
+            content["text"] = body["body"]
+            if body.get("base64Encoded"):
+                content["encoding"] = "base64"
+        http_version = response.get("protocol", "http/1.1").upper()
+        har_request = {
+            "method": request.get("method", "GET"),
+            "url": url,
+            "httpVersion": http_version,
+            "headers": _header_list(request.get("headers")),
+            "queryString": [{"name": k, "value": v} for k, v in
+                            urllib.parse.parse_qsl(urllib.parse.urlsplit(url).query, keep_blank_values=True)],
+            "cookies": [],
+            "headersSize": -1,
+            "bodySize": len(request.get("postData") or ""),
+        }
+        if "postData" in request:
+            har_request["postData"] = {"mimeType": _header(request.get("headers"), "content-type"),
+                                       "text": request["postData"]}
+        self.entries.append({
+            "startedDateTime": datetime.fromtimestamp(entry["wall_time"], timezone.utc).isoformat(),
+            "time": round(elapsed, 3),
+            "request": har_request,
+            "response": {
+                "status": response.get("status", 0),
+                "statusText": response.get("statusText", ""),
+                "httpVersion": http_version,
+                "headers": _header_list(headers),
+                "cookies": [],
+                "content": content,
+                "redirectURL": _header(headers, "location"),
+                "headersSize": -1,
+                "bodySize": -1,
+            },
+            "cache": {},
+            "timings": {"send": 0, "wait": round(elapsed, 3), "receive": 0},
+        })
+
+    def save(self):
+        """Write every entry recorded so far to the archive"""
+        with self.lock:
+            entries = sorted(self.entries, key=lambda e: e["startedDateTime"])
+        if not entries:
+            return
+        har = {"log": {"version": "1.2", "creator": {"name": "KinerjaBot", "version": "1.0"},
+                       "pages": [], "entries": entries}}
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(har, fh, ensure_ascii=False)
+        os.replace(tmp, self.path)
+        print(f"🎙️  Saved {len(entries)} request(s) to {self.path}")
+
+
+HAR = HarRecorder(HAR_PATH) if HAR_PATH else None
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Offline replay of a HAR archive recorded with KINERJA_HAR (har_recorder.py).
+Every host in the archive gets its own loopback address (127.0.0.1,
+127.0.0.2, ...) and port. Requests are answered with the recorded responses
+in recorded order, so a flow sees the same pages and API answers as the real
+run, at full speed and without touching the portals or submitting real
+records.
+
+Browsers key cookies by host name but not by port, so the distinct addresses
+keep each portal's cookies apart, as they are on the real hosts. Where only
+127.0.0.1 exists (macOS, unless aliases are added with
+"sudo ifconfig lo0 alias 127.0.0.2 up"), the hosts fall back to ports on
+127.0.0.1 and share one cookie store; a warning says so.
+
+Requests are matched on host, method, path and query. The query is compared
+without the parameters that change on every login (the SSO state, nonce,
+code_challenge, code, session_state). When a request carries different
+values than the recorded one, the served response gets the new values, so
+the SIASN LOGIN_URL redirect keeps working. The portals' absolute URLs
+(plain and URL-encoded) are rewritten to the local addresses. Set-Cookie
+loses Domain and Secure, so the cookies stick on the plain-http replay host.
+
+Usage:
+   python3 har_replay.py usul.har --port 8900
+   # then, with the exports it prints:
+   python3 -m pytest '20251126 autoUsulNIP.py' -v -s
+
+The kinerja flows check the session before starting by loading the page they
+open first, which the archive normally has. If it is missing, the check only
+gives a warning.
+"""
+
+import argparse
+import base64
+import json
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cookie_vault import KINERJA_HOST, SIASN_HOST
+
+# Query parameters that differ on every login; ignored when matching, rewritten when serving
+VOLATILE_PARAMS = ("state", "nonce", "code_challenge", "code", "session_state")
+# Environment variable each flow reads its base URL from -> the host it stands for
+BASE_URL_ENV = {
+    "KINERJA_BASE_URL": KINERJA_HOST,
+    "SIASN_BASE_URL": SIASN_HOST,
+    "SIASN_SSO_BASE_URL": "sso-siasn.bkn.go.id",
+}
+# Recomputed for the replayed body, or only valid for the real origin over HTTPS
+DROPPED_HEADERS = {
+    "content-length", "content-encoding", "transfer-encoding", "connection", "keep-alive",
+    "strict-transport-security", "content-security-policy", "alt-svc",
+}
+
+
+def normalize_query(query):
+    pairs = urllib.parse.parse_qsl(query, keep_blank_values=True)
+    return urllib.parse.urlencode(sorted((k, v) for k, v in pairs if k not in VOLATILE_PARAMS))
+
+
+def local_cookie(value):
+    """Set-Cookie for the real portal -> one the browser keeps on the plain-http replay host"""
+    parts = []
+    for part in value.split(";"):
+        name = part.strip().split("=", 1)[0].lower()
+        if name in ("domain", "secure"):
+            continue
+        if name == "samesite":
+            part = " SameSite=Lax"
+        parts.append(part)
+    return ";".join(parts)
+
+
+class HarArchive:
+    """Recorded responses indexed by request, served in recorded order"""
+
+    def __init__(self, path):
+        with open(path, encoding="utf-8") as fh:
+            entries = json.load(fh)["log"]["entries"]
+        self.hosts = []
+        self.exact = {}  # (host, method, path, normalized query) -> entries
+        self.by_path = {}  # (host, method, path) -> entries, when the query differs
+        self.cursors = {}
+        self.lock = threading.Lock()
+        for entry in entries:
+            if entry["response"].get("status") in (0, 304):
+                continue  # no body to serve (failed, or answered from the browser cache)
+            url = urllib.parse.urlsplit(entry["request"]["url"])
+            host, method = url.netloc, entry["request"]["method"]
+            if host not in self.hosts:
+                self.hosts.append(host)
+            self.exact.setdefault((host, method, url.path, normalize_query(url.query)), []).append(entry)
+            self.by_path.setdefault((host, method, url.path), []).append(entry)
+
+    def next_entry(self, host, method, path, query):
+        """The next recorded entry for this request; the last one repeats once they run out"""
+        for table, key in ((self.exact, (host, method, path, normalize_query(query))),
+                           (self.by_path, (host, method, path))):
+            entries = table.get(key)
+            if entries:
+                with self.lock:
+                    index = self.cursors.get(key, 0)
+                    self.cursors[key] = index + 1
+                return entries[min(index, len(entries) - 1)]
+        return None
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    replay = None
+    host = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _replay(self):
+        replay = self.replay
+        if replay.latency:
+            time.sleep(replay.latency)
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        url = urllib.parse.urlsplit(self.path)
+        entry = replay.archive.next_entry(self.host, self.command, url.path, url.query)
+        if entry is None:
+            replay.miss(f"{self.command} {self.host}{self.path}")
+            body = json.dumps({"message": "not in the HAR archive"}).encode("utf-8")
+            self.send_response(404)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        recorded = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(entry["request"]["url"]).query))
+        sent = dict(urllib.parse.parse_qsl(url.query))
+        response = entry["response"]
+        content = response.get("content", {})
+        if content.get("encoding") == "base64":
+            body = base64.b64decode(content.get("text", ""))
+        else:
+            body = replay.rewrite(content.get("text", ""), recorded, sent).encode("utf-8")
+
+        self.send_response(response.get("status") or 200, response.get("statusText") or None)
+        for header in response.get("headers", []):
+            name, value = header["name"], header["value"]
+            if name.lower() in DROPPED_HEADERS or name.startswith(":"):
+                continue
+            if name.lower() == "location":
+                value = replay.rewrite(value, recorded, sent)
+            elif name.lower() == "set-cookie":
+                value = local_cookie(value)
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        # Counted before the body goes out, so a client that has the response sees it counted
+        with replay.lock:
+            replay.served += 1
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = do_OPTIONS = _replay
+
+
+class HarReplay:
+    """One local server per host in the archive, each on its own loopback address when possible"""
+
+    def __init__(self, har_path, port=0, latency=0.0):
+        self.archive = HarArchive(har_path)
+        self.port = port
+        self.latency = latency
+        self.servers = []
+        self.base_urls = {}  # host -> http://127.0.0.N:port
+        self.served = 0
+        self.misses = {}
+        self.lock = threading.Lock()
+
+    def start(self):
+        """Start the servers; returns {recorded host: local base URL}"""
+        shared = False
+        for offset, host in enumerate(self.archive.hosts):
+            handler = type("Handler", (ReplayHandler,), {"replay": self, "host": host})
+            port = self.port + offset if self.port else 0
+            try:
+                server = ThreadingHTTPServer((f"127.0.0.{offset + 1}", port), handler)
+            except OSError:
+                if offset == 0:
+                    raise
+                server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+                shared = True
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            self.servers.append(server)
+            address, bound_port = server.server_address[:2]
+            self.base_urls[host] = f"http://{address}:{bound_port}"
+        if shared:
+            print("⚠️  Only 127.0.0.1 is available: the replayed hosts differ by port only, "
+                  "so the browser sends each host's cookies to the others too")
+        return self.base_urls
+
+    def shutdown(self):
+        for server in self.servers:
+            server.shutdown()
+
+    def miss(self, request):
+        with self.lock:
+            self.misses[request] = self.misses.get(request, 0) + 1
+
+    def rewrite(self, text, recorded, sent):
+        """Point the portals' URLs at the replay and carry over the client's login parameters"""
+        for host, base_url in self.base_urls.items():
+            for origin in (f"https://{host}", f"http://{host}"):
+                text = text.replace(origin, base_url)
+                text = text.replace(urllib.parse.quote(origin, safe=""), urllib.parse.quote(base_url, safe=""))
+        for name in VOLATILE_PARAMS:
+            old, new = recorded.get(name), sent.get(name)
+            if old and new and old != new:
+                text = text.replace(old, new)
+        return text
+
+    def environment(self):
+        """KINERJA_BASE_URL / SIASN_BASE_URL / SIASN_SSO_BASE_URL for the hosts in the archive"""
+        return {env: self.base_urls[host] for env, host in BASE_URL_ENV.items() if host in self.base_urls}
+
+    def print_summary(self):
+        print(f"\n📼 Replayed {self.served} response(s), {sum(self.misses.values())} request(s) not in the archive")
+        for request, count in sorted(self.misses.items(), key=lambda item: -item[1])[:20]:
+            print(f"   {count:5}x {request}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a recorded HAR archive offline")
+    parser.add_argument("har", help="archive written with KINERJA_HAR")
+    parser.add_argument("--port", type=int, default=8900, help="first port; one per recorded host")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    args = parser.parse_args()
+
+    replay = HarReplay(args.har, args.port, args.latency)
+    for host, base_url in replay.start().items():
+        print(f"📼 {host:35} -> {base_url}")
+    print("\nPoint the flows at the replay:")
+    for env, base_url in replay.environment().items():
+        print(f"   export {env}={base_url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        replay.shutdown()
+        replay.print_summary()
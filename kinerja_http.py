@@ -0,0 +1,82 @@
+"""
+Minimal JSON-over-HTTP session for the browserless backends.
+Reuses the cookies saved by extract_cookies.py / extract_peer_review_cookies.py
+(Selenium cookie dicts in the cookie vault) instead of driving a browser.
+"""
+
+import json
+import os
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from cookie_vault import KINERJA_HOST, load_jar
+
+KINERJA_BASE_URL = os.environ.get("KINERJA_BASE_URL", "https://kinerja.jabarprov.go.id")
+# nuxt/auth keeps the API token in this cookie as "Bearer%20<token>"
+AUTH_TOKEN_COOKIE = "auth._token.local"
+
+
+class HttpBackendError(Exception):
+    """Raised when the portal API answers with an error or unexpected body"""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class HttpSession:
+    """Send JSON requests with a saved browser session's cookies"""
+
+    def __init__(self, cookies, base_url=KINERJA_BASE_URL, timeout=10):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.cookies = {c["name"]: c["value"] for c in cookies if c.get("name")}
+        self.opener = urllib.request.build_opener()
+
+    @classmethod
+    def from_cookie_files(cls, cookie_files, base_url=KINERJA_BASE_URL, timeout=10, domain=KINERJA_HOST,
+                          account=None):
+        """Use the freshest unexpired vault jar for domain (legacy cookie_files are imported first)"""
+        jar = load_jar(domain, account, legacy_files=cookie_files)
+        if jar is None:
+            raise HttpBackendError(f"No unexpired cookies for {domain} (tried the vault and {', '.join(cookie_files)})")
+        print(f"✓ Using cookies for account '{jar[0]}'")
+        return cls(jar[1], base_url, timeout)
+
+    def headers(self):
+        headers = {"Accept": "application/json", "Content-Type": "application/json"}
+        if self.cookies:
+            headers["Cookie"] = "; ".join(f"{k}={v}" for k, v in self.cookies.items())
+        token = self.cookies.get(AUTH_TOKEN_COOKIE)
+        if token:
+            headers["Authorization"] = urllib.parse.unquote(token)
+        return headers
+
+    def request(self, method, path, payload=None):
+        """Send one request and return the decoded JSON body (None for empty bodies)"""
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        req = urllib.request.Request(
+            self.base_url + path, data=data, method=method, headers=self.headers()
+        )
+        try:
+            with self.opener.open(req, timeout=self.timeout) as resp:
+                body = resp.read()
+        except urllib.error.HTTPError as e:
+            raise HttpBackendError(f"{method} {path} failed: HTTP {e.code}", status=e.code)
+        except urllib.error.URLError as e:
+            raise HttpBackendError(f"{method} {path} failed: {e.reason}")
+        except OSError as e:  # read timeouts and dropped connections
+            raise HttpBackendError(f"{method} {path} failed: {e or type(e).__name__}")
+        if not body:
+            return None
+        try:
+            return json.loads(body)
+        except ValueError:
+            raise HttpBackendError(f"{method} {path} did not return JSON (session expired?)")
+
+    def get_json(self, path):
+        return self.request("GET", path)
+
+    def post_json(self, path, payload):
+        return self.request("POST", path, payload)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Browserless peer-review kuesioner backend.
+Builds the whole submission that test_20251103Kuesioner clicks through
+(Kenal/Tidak answers, the score grid, positif-{id} comments and the pairwise
+left/right choices) from the roster and pegawai_scores.txt, and sends it in
+one request with the saved peer-review cookies.
+
+The endpoint paths below mirror what the frontend requests; override them
+with KUESIONER_FORM_PATH / KUESIONER_SUBMIT_PATH if the portal moves them.
+standin_server.py serves the same API locally for testing.
+
+Usage:
+   python3 kuesioner_http.py
+   python3 kuesioner_http.py --base-url http://127.0.0.1:8765
+   python3 kuesioner_http.py --browser-fallback   # run the Selenium flow if HTTP fails
+"""
+
+import argparse
+import os
+import random
+import subprocess
+import sys
+
+from flows import KUESIONER_FLOW
+from kinerja_http import KINERJA_BASE_URL, HttpBackendError, HttpSession
+from peer_review_page import HIGH_SCORE, SCORES_FILE, load_pegawai_scores, positive_comment
+
+KUESIONER_FORM_PATH = os.environ.get("KUESIONER_FORM_PATH", "/api/kuisioner-kinerja/peer-review")
+KUESIONER_SUBMIT_PATH = os.environ.get("KUESIONER_SUBMIT_PATH", "/api/kuisioner-kinerja/peer-review")
+COOKIE_FILES = ["peer_review_cookies.pkl", "cookies.pkl"]
+DEFAULT_SCORE = 8  # same default as TestKuesioner.assign_scores
+
+
+def fetch_form(session):
+    """Return the kuesioner form: {"questions": [...], "pegawai": [...], "pairs": [...]}"""
+    body = session.get_json(KUESIONER_FORM_PATH) or {}
+    form = body.get("data", body) if isinstance(body, dict) else None
+    if not isinstance(form, dict) or "pegawai" not in form:
+        raise HttpBackendError(f"Unexpected kuesioner form response: {str(body)[:200]}")
+    return form
+
+
+def roster_from_form(form):
+    """Roster in the same shape as parse_roster: [{"name", "id", "index"}]"""
+    return [
+        {"name": p.get("nama", ""), "id": str(p["id"]), "index": i}
+        for i, p in enumerate(form.get("pegawai", []), start=1)
+    ]
+
+
+def build_submission(form, pegawai_scores, choose=random.choice):
+    """Build the full kuesioner payload; pegawai_scores is keyed by roster number"""
+    roster = roster_from_form(form)
+    question_ids = [q["id"] for q in form.get("questions", [])]
+
+    perkenalan = []
+    nilai = []
+    komentar = []
+    for num, pegawai in enumerate(roster, start=1):
+        assigned = pegawai_scores.get(num)
+        if assigned is None:
+            print(f"   ⚠️  Pegawai {num} ({pegawai['name']}): No score assigned, using {DEFAULT_SCORE}")
+            score = DEFAULT_SCORE
+        else:
+            expected = (assigned.get("name") or "").strip().lower()
+            if expected and expected != pegawai["name"].strip().lower():
+                raise HttpBackendError(
+                    f"{SCORES_FILE} #{num} is '{assigned['name']}' but the roster has '{pegawai['name']}'"
+                )
+            score = assigned["score"]
+
+        # Question 1: always "Kenal", question 2: always "Tidak"
+        perkenalan.append({"pegawai_id": pegawai["id"], "jawaban": ["Kenal", "Tidak"]})
+        for question_id in question_ids:
+            nilai.append({"question_id": question_id, "pegawai_id": pegawai["id"], "score": score})
+        if score >= HIGH_SCORE:
+            komentar.append({"pegawai_id": pegawai["id"], "positif": positive_comment(pegawai["name"])})
+
+    # Pairwise left/right choices are random, like click_random_buttons_until_done
+    pilihan = [
+        {"pair_id": pair["id"], "pilih": choose([pair["left"]["id"], pair["right"]["id"]])}
+        for pair in form.get("pairs", [])
+    ]
+    return {"perkenalan": perkenalan, "nilai": nilai, "komentar": komentar, "pilihan": pilihan}
+
+
+def run_kuesioner_http(session, scores_path=SCORES_FILE):
+    """Fetch the form, build the payload and submit it; returns the payload sent"""
+    if not os.path.exists(scores_path):
+        raise HttpBackendError(
+            f"{scores_path} not found - assign scores once with the browser flow first"
+        )
+    pegawai_scores = load_pegawai_scores(scores_path)
+    form = fetch_form(session)
+    payload = build_submission(form, pegawai_scores)
+    print(f"📋 Submitting {len(payload['perkenalan'])} pegawai, {len(payload['nilai'])} scores, "
+          f"{len(payload['komentar'])} comments, {len(payload['pilihan'])} pair choices...")
+    session.post_json(KUESIONER_SUBMIT_PATH, payload)
+    return payload
+
+
+def run_browser_flow():
+    """Fallback: run the Selenium kuesioner flow"""
+    print(f"\n🌐 Falling back to the browser flow: {KUESIONER_FLOW}")
+    return subprocess.call([sys.executable, "-m", "pytest", KUESIONER_FLOW, "-v", "-s"])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Submit the peer-review kuesioner over HTTP")
+    parser.add_argument("--base-url", default=KINERJA_BASE_URL)
+    parser.add_argument("--scores", default=SCORES_FILE, help="pegawai_scores.txt to use")
+    parser.add_argument("--browser-fallback", action="store_true",
+                        help="run the Selenium flow if the HTTP submission fails")
+    args = parser.parse_args()
+
+    try:
+        session = HttpSession.from_cookie_files(COOKIE_FILES, base_url=args.base_url)
+        run_kuesioner_http(session, args.scores)
+        print("\n✅ Kuesioner submitted over HTTP")
+    except HttpBackendError as e:
+        print(f"\n❌ {e}")
+        if args.browser_fallback:
+            sys.exit(run_browser_flow())
+        print("💡 If the session expired, re-run 'python3 extract_peer_review_cookies.py'")
+        sys.exit(1)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Self-learning order for the fallback locator lists.
+The flows look several elements up through an ordered list of candidate
+locators (the login username field, the kuesioner Selanjutnya and
+"Selesai dan Kirim" buttons). All candidates are polled together in one wait
+(page_waits.find_any), and when several match the earliest in the list wins.
+The registry remembers, per logical element, which candidate won: that one
+comes first next time, candidates that missed DEMOTE_AFTER times in a row go
+to the back, and the order in the code breaks ties. Only candidates ranked
+before the winner count as misses, so a page that never loaded does not
+demote anything.
+
+Counts live in one SQLite file (WAL mode, like the cookie vault) shared by
+every flow and worker process.
+
+Usage:
+   python3 locator_registry.py           # hit/miss report
+   python3 locator_registry.py --reset   # forget everything learned
+"""
+
+import argparse
+import os
+import sqlite3
+import time
+from contextlib import closing, contextmanager
+
+from selenium.common.exceptions import TimeoutException
+
+from page_waits import find_any
+
+REGISTRY_PATH = os.environ.get("KINERJA_LOCATOR_REGISTRY", "locator_registry.sqlite3")
+# Consecutive misses before a candidate is tried after the ones that have not failed
+DEMOTE_AFTER = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS locators (
+    element TEXT NOT NULL,
+    locator TEXT NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0,
+    miss_streak INTEGER NOT NULL DEFAULT 0,
+    last_hit REAL,
+    PRIMARY KEY (element, locator)
+)
+"""
+
+
+def locator_key(locator):
+    """(By.ID, "username") -> "id=username\""""
+    by, value = locator
+    return f"{by}={value}"
+
+
+class LocatorRegistry:
+    """SQLite-backed hit/miss counts per (logical element, candidate locator)"""
+
+    def __init__(self, path=REGISTRY_PATH):
+        self.path = path
+
+    def _connect(self):
+        # The file is created on the first lookup, not when a flow imports this module
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(SCHEMA)
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """A connection that commits (or rolls back) and is closed afterwards"""
+        with closing(self._connect()) as conn:
+            with conn:
+                yield conn
+
+    def _stats(self, element):
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT locator, hits, miss_streak, last_hit FROM locators WHERE element = ?", (element,)
+            ).fetchall()
+        return {locator: (hits, streak, last_hit) for locator, hits, streak, last_hit in rows}
+
+    def ordered(self, element, candidates):
+        """The candidates best first: not demoted, most recent winner, most hits, code order"""
+        stats = self._stats(element)
+
+        def rank(item):
+            index, locator = item
+            hits, streak, last_hit = stats.get(locator_key(locator), (0, 0, None))
+            return (streak >= DEMOTE_AFTER, -(last_hit or 0), -hits, index)
+
+        return [locator for _, locator in sorted(enumerate(candidates), key=rank)]
+
+    def record(self, element, winner, missed=()):
+        """One lookup: winner found the element after the missed candidates failed"""
+        now = time.time()
+        with self._transaction() as conn:
+            for locator in missed:
+                conn.execute(
+                    "INSERT INTO locators (element, locator, misses, miss_streak) VALUES (?, ?, 1, 1) "
+                    "ON CONFLICT (element, locator) DO UPDATE SET misses = misses + 1, miss_streak = miss_streak + 1",
+                    (element, locator_key(locator)),
+                )
+            conn.execute(
+                "INSERT INTO locators (element, locator, hits, last_hit) VALUES (?, ?, 1, ?) "
+                "ON CONFLICT (element, locator) DO UPDATE SET hits = hits + 1, miss_streak = 0, last_hit = ?",
+                (element, locator_key(winner), now, now),
+            )
+
+    def find(self, driver, element, candidates, timeout=5, clickable=False):
+        """Wait once for whichever candidate matches, best learned first; returns (web element,
+        locator) or (None, None). With clickable, a match that is disabled or hidden does not
+        count and the next candidate can win."""
+        ordered = self.ordered(element, candidates)
+        try:
+            found, locator = find_any(driver, ordered, timeout, clickable, label=f"locate {element}")
+        except TimeoutException:
+            return None, None
+        self.record(element, locator, ordered[:ordered.index(locator)])
+        return found, locator
+
+    def report(self):
+        with self._transaction() as conn:
+            return conn.execute(
+                "SELECT element, locator, hits, misses, miss_streak FROM locators "
+                "ORDER BY element, miss_streak >= ?, last_hit DESC, hits DESC",
+                (DEMOTE_AFTER,),
+            ).fetchall()
+
+    def print_report(self):
+        rows = self.report()
+        if not rows:
+            print("📭 No locator lookups recorded yet")
+            return
+        print(f"🎯 Locator registry ({self.path})")
+        element = None
+        for name, locator, hits, misses, streak in rows:
+            if name != element:
+                element = name
+                print(f"\n   {element}")
+            total = hits + misses
+            flag = "  ⬇️ demoted" if streak >= DEMOTE_AFTER else ""
+            print(f"      {hits:5} hit {misses:5} miss ({hits / max(total, 1):4.0%})  {locator}{flag}")
+
+    def reset(self):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM locators")
+
+
+REGISTRY = LocatorRegistry()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show the learned locator order")
+    parser.add_argument("--reset", action="store_true", help="forget all hits and misses")
+    args = parser.parse_args()
+    if args.reset:
+        REGISTRY.reset()
+        print("🗑️  Locator registry cleared")
+    else:
+        REGISTRY.print_report()
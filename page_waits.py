@@ -0,0 +1,253 @@
+"""
+Event-driven waits shared by the review, kuesioner and usul flows.
+Replaces fixed time.sleep() calls: waits until the Nuxt (#__nuxt) or
+Next.js (#__next) app has hydrated, in-flight XHR/fetch calls are done
+and the DOM has gone quiet, and records how long each wait really took.
+"""
+
+import time
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+NUXT_ROOT = "#__nuxt"  # kinerja.jabarprov.go.id
+NEXT_ROOT = "#__next"  # siasn-instansi.bkn.go.id
+
+# Installs XHR/fetch counters and a MutationObserver once per document,
+# then reports hydration, in-flight requests and idle/quiet durations (ms).
+PROBE_JS = """
+const root = arguments[0];
+if (!window.__kbWaits) {
+  const s = window.__kbWaits = {inflight: 0, lastNetwork: performance.now(), lastMutation: performance.now()};
+  const done = () => { s.inflight = Math.max(0, s.inflight - 1); s.lastNetwork = performance.now(); };
+  const origSend = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    s.inflight++; s.lastNetwork = performance.now();
+    this.addEventListener("loadend", done, {once: true});
+    try {
+      return origSend.apply(this, arguments);
+    } catch (e) {
+      // Thrown before the request started (e.g. send() on an unopened XHR): no loadend follows
+      this.removeEventListener("loadend", done);
+      done();
+      throw e;
+    }
+  };
+  if (window.fetch) {
+    const origFetch = window.fetch;
+    window.fetch = function () {
+      s.inflight++; s.lastNetwork = performance.now();
+      let request;
+      try {
+        request = origFetch.apply(this, arguments);
+      } catch (e) {
+        done();
+        throw e;
+      }
+      return Promise.resolve(request).finally(done);
+    };
+  }
+  // Catches requests made through a fetch reference captured before we patched it
+  if (window.PerformanceObserver) {
+    new PerformanceObserver(() => { s.lastNetwork = performance.now(); }).observe({type: "resource"});
+  }
+  new MutationObserver(() => { s.lastMutation = performance.now(); })
+    .observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+const s = window.__kbWaits;
+const now = performance.now();
+let hydrated = document.readyState === "complete";
+if (root) {
+  const el = document.querySelector(root);
+  hydrated = hydrated && !!el && el.children.length > 0;
+  if (root === "#__nuxt") {
+    hydrated = hydrated && (!!window.$nuxt || el.hasAttribute("data-v-app") || !window.__NUXT__);
+  } else if (root === "#__next") {
+    hydrated = hydrated && (!!window.next || !window.__NEXT_DATA__);
+  }
+}
+return {
+  hydrated: hydrated,
+  inflight: s.inflight,
+  network_idle_ms: s.inflight ? 0 : now - s.lastNetwork,
+  dom_quiet_ms: now - s.lastMutation
+};
+"""
+
+# Checks a list of [kind, expression] candidates in order and returns
+# [index, element] for the first one in the page (visible and enabled when
+# arguments[1] is true), or null. A selector the page rejects is skipped.
+FIND_ANY_JS = """
+const [candidates, clickable] = arguments;
+for (let i = 0; i < candidates.length; i++) {
+  const [kind, expr] = candidates[i];
+  let el = null;
+  try {
+    el = kind === "xpath"
+      ? document.evaluate(expr, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+      : document.querySelector(expr);
+  } catch (e) {
+    continue;
+  }
+  if (!el) continue;
+  if (clickable) {
+    const style = getComputedStyle(el);
+    const box = el.getBoundingClientRect();
+    if (el.disabled || style.visibility === "hidden" || style.display === "none" || (!box.width && !box.height)) continue;
+  }
+  return [i, el];
+}
+return null;
+"""
+
+
+class WaitTimings:
+    """Collects how long each wait took so runs can report it"""
+
+    def __init__(self):
+        self.records = []
+
+    def add(self, label, seconds, ok):
+        self.records.append({"label": label, "seconds": seconds, "ok": ok})
+        status = "✓" if ok else "⚠️  timed out"
+        print(f"   ⏱️  {label}: {seconds:.2f}s {status}")
+
+    def total(self):
+        return sum(r["seconds"] for r in self.records)
+
+    def print_summary(self):
+        if not self.records:
+            return
+        timeouts = sum(1 for r in self.records if not r["ok"])
+        print(f"\n⏱️  {len(self.records)} waits took {self.total():.2f}s in total ({timeouts} timed out)")
+
+
+TIMINGS = WaitTimings()
+# Callables (driver) run after every wait, e.g. the HAR recorder reading response bodies
+WAIT_HOOKS = []
+
+
+def _probe(driver, root):
+    try:
+        return driver.execute_script(PROBE_JS, root) or {}
+    except WebDriverException:
+        # Page is navigating; the next poll runs against the new document
+        return {}
+
+
+def watch_page(driver):
+    """Install the request/mutation probes now, so requests fired by the next
+    action (e.g. a submit click) are counted by the following wait"""
+    _probe(driver, None)
+
+
+def wait_until_settled(driver, root=None, network_idle=0.5, dom_quiet=0.3,
+                       timeout=15, label="page settled"):
+    """Wait until the app under root (if any) has hydrated, the network is idle
+    and the DOM is quiet. Returns True when settled, False on timeout."""
+    def settled(d):
+        state = _probe(d, root)
+        return (
+            state.get("hydrated", False)
+            and state.get("inflight", 1) == 0
+            and state.get("network_idle_ms", 0) >= network_idle * 1000
+            and state.get("dom_quiet_ms", 0) >= dom_quiet * 1000
+        )
+
+    return _timed_wait(driver, settled, timeout, label)
+
+
+def wait_for_hydration(driver, root=NUXT_ROOT, timeout=15, label=None):
+    """Wait until the Nuxt/Next app mounted under root has hydrated"""
+    return _timed_wait(
+        driver, lambda d: _probe(d, root).get("hydrated", False),
+        timeout, label or f"{root} hydrated",
+    )
+
+
+def wait_for_network_idle(driver, idle=0.5, timeout=15, label="network idle"):
+    """Wait until no XHR/fetch call has been in flight for `idle` seconds"""
+    def idle_for(d):
+        state = _probe(d, None)
+        return state.get("inflight", 1) == 0 and state.get("network_idle_ms", 0) >= idle * 1000
+
+    return _timed_wait(driver, idle_for, timeout, label)
+
+
+def wait_for_dom_quiet(driver, quiet=0.3, timeout=10, label="DOM quiet"):
+    """Wait until the DOM has not changed for `quiet` seconds (animations, re-renders)"""
+    return _timed_wait(
+        driver, lambda d: _probe(d, None).get("dom_quiet_ms", 0) >= quiet * 1000,
+        timeout, label,
+    )
+
+
+def _xpath_literal(text):
+    """XPath 1.0 string literal for text; XPath has no escapes, so text with both quote
+    kinds is built with concat()"""
+    if '"' not in text:
+        return f'"{text}"'
+    if "'" not in text:
+        return f"'{text}'"
+    parts = text.split('"')
+    return "concat(" + ", '\"', ".join(f'"{part}"' for part in parts) + ")"
+
+
+def _query(locator):
+    """Selenium locator -> [kind, expression] for FIND_ANY_JS"""
+    by, value = locator
+    quoted = value.replace("\\", "\\\\").replace('"', '\\"')
+    if by == By.ID:
+        return ["css", f'[id="{quoted}"]']
+    if by == By.NAME:
+        return ["css", f'[name="{quoted}"]']
+    if by == By.CLASS_NAME:
+        return ["css", f'[class~="{quoted}"]']
+    if by in (By.CSS_SELECTOR, By.TAG_NAME):
+        return ["css", value]
+    literal = _xpath_literal(value)
+    if by == By.LINK_TEXT:
+        return ["xpath", f"//a[normalize-space(.)={literal}]"]
+    if by == By.PARTIAL_LINK_TEXT:
+        return ["xpath", f"//a[contains(., {literal})]"]
+    return ["xpath", value]
+
+
+def find_any(driver, candidates, timeout=5, clickable=False, label="find any"):
+    """Wait for whichever candidate locator shows up first, checking all of them in
+    one in-page query per poll; the earliest in the list wins a tie.
+    Returns (element, locator); raises TimeoutException after one timeout, not one per candidate."""
+    queries = [_query(locator) for locator in candidates]
+    found = []
+
+    def any_match(d):
+        try:
+            match = d.execute_script(FIND_ANY_JS, queries, clickable)
+        except WebDriverException:
+            return False  # page is navigating
+        if match:
+            found.append(match)
+        return bool(match)
+
+    if not _timed_wait(driver, any_match, timeout, label):
+        raise TimeoutException(f"None of {len(candidates)} locators matched within {timeout}s ({label})")
+    index, element = found[-1]
+    return element, candidates[index]
+
+
+def _timed_wait(driver, condition, timeout, label):
+    start = time.perf_counter()
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(condition)
+        ok = True
+    except TimeoutException:
+        ok = False
+    TIMINGS.add(label, time.perf_counter() - start, ok)
+    for hook in WAIT_HOOKS:
+        # A failing hook (e.g. the HAR recorder) must not break the flow it observes
+        try:
+            hook(driver)
+        except Exception as e:
+            print(f"   ⚠️  Wait hook {getattr(hook, '__name__', hook)} failed: {e}")
+    return ok
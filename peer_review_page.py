@@ -0,0 +1,235 @@
+"""
+Page helpers for the peer-review kuesioner (kuisioner-kinerja/peer-review).
+Parses the score grid radio IDs and the roster from one snapshot so later
+lookups need no DOM queries.
+"""
+
+from html.parser import HTMLParser
+
+from selenium.webdriver.common.by import By
+
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "source", "track", "wbr",
+}
+# Tags that break a line when rendered; their text never runs into the neighbouring text
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt", "fieldset",
+    "figcaption", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li",
+    "main", "nav", "ol", "p", "pre", "section", "table", "td", "th", "tr", "ul",
+}
+NAME_CONTAINER_CLASSES = {"flex", "flex-col", "gap-4", "items-center"}
+# Pegawai rows start at div:nth-child(3) of the first form section
+FIRST_PEGAWAI_INDEX = 3
+# Written by TestKuesioner.assign_scores, one "1. Name: 8" line per pegawai
+SCORES_FILE = "pegawai_scores.txt"
+# Pegawai scored this high (9 or 10) get a positif-{id} comment
+HIGH_SCORE = 9
+
+# Returns the id of every radio button on the page in document order
+RADIO_IDS_JS = """
+return Array.from(document.querySelectorAll("input[type='radio']"), el => el.id || "");
+"""
+
+
+def unescape_radio_id(radio_id):
+    """Turn a CSS-escaped radio ID (\\31 435-...) back into the real ID (1435-...)"""
+    radio_id = (radio_id or "").strip()
+    # "\31 " is the CSS escape for a leading "1" (IDs may not start with a digit in CSS)
+    if radio_id.startswith("\\3") and " " in radio_id[:5]:
+        escape, rest = radio_id[1:].split(" ", 1)
+        try:
+            return chr(int(escape, 16)) + rest
+        except ValueError:
+            return radio_id
+    return radio_id
+
+
+def parse_radio_id(radio_id):
+    """Split a radio ID into (question_id, pegawai_id, score), or None if it does not match"""
+    parts = unescape_radio_id(radio_id).split("-")
+    if len(parts) != 3:
+        return None
+    question_id, pegawai_id, score = parts
+    if not (question_id.isdigit() and score.isdigit() and pegawai_id):
+        return None
+    return int(question_id), pegawai_id, int(score)
+
+
+def build_radio_index(radio_ids):
+    """Index radio IDs as {(question_id, pegawai_id, score): (By.ID, radio_id)}"""
+    index = {}
+    for raw_id in radio_ids:
+        key = parse_radio_id(raw_id)
+        if key and key not in index:
+            index[key] = (By.ID, unescape_radio_id(raw_id))
+    return index
+
+
+def question_ids_from_index(index):
+    """Sorted question IDs present in a radio index"""
+    return sorted({question_id for question_id, _, _ in index})
+
+
+def pegawai_ids_from_index(index):
+    """Pegawai IDs present in a radio index, in first-seen (page) order"""
+    seen = {}
+    for _, pegawai_id, _ in index:
+        seen.setdefault(pegawai_id, None)
+    return list(seen)
+
+
+def load_pegawai_scores(path=SCORES_FILE):
+    """Read pegawai_scores.txt into {number: {"name": name, "score": score}}"""
+    pegawai_scores = {}
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            # Format: "1. Name: 8"
+            parts = line.strip().split(": ")
+            if len(parts) == 2:
+                num_part = parts[0].split(". ")[0]
+                if num_part.isdigit():
+                    num = int(num_part)
+                    name = parts[0].split(". ", 1)[1] if ". " in parts[0] else ""
+                    score = int(parts[1]) if parts[1].isdigit() else 8
+                    pegawai_scores[num] = {"name": name, "score": score}
+    return pegawai_scores
+
+
+def positive_comment(name):
+    """Comment text written into positif-{id} for high-score pegawai"""
+    return f"{name} sangat baik"
+
+
+class Node:
+    """Minimal element node produced by RosterParser"""
+
+    __slots__ = ("tag", "attrs", "content")
+
+    def __init__(self, tag, attrs):
+        self.tag = tag
+        self.attrs = attrs
+        # Text strings and child Nodes, in document order
+        self.content = []
+
+    @property
+    def children(self):
+        """Child elements (no text)"""
+        return [part for part in self.content if isinstance(part, Node)]
+
+    @property
+    def classes(self):
+        return set((self.attrs.get("class") or "").split())
+
+    def iter(self):
+        """This node and all descendant elements in document order"""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def find(self, predicate):
+        for node in self.iter():
+            if predicate(node):
+                return node
+        return None
+
+    def _texts(self):
+        for part in self.content:
+            if isinstance(part, str):
+                yield part
+            elif part.tag in BLOCK_TAGS:
+                yield " "
+                yield from part._texts()
+                yield " "
+            else:
+                yield from part._texts()
+
+    def text_content(self):
+        """Rendered text with whitespace collapsed; <br> and block tags separate words"""
+        return " ".join("".join(self._texts()).split())
+
+
+class RosterParser(HTMLParser):
+    """Build a light element tree from one page_source snapshot"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node("#document", {})
+        self.stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        node = Node(tag, {k: (v if v is not None else "") for k, v in attrs})
+        self.stack[-1].content.append(node)
+        if tag not in VOID_TAGS:
+            self.stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        self.stack[-1].content.append(Node(tag, {k: (v if v is not None else "") for k, v in attrs}))
+
+    def handle_endtag(self, tag):
+        # Pop back to the matching open tag; ignore stray end tags
+        for depth in range(len(self.stack) - 1, 0, -1):
+            if self.stack[depth].tag == tag:
+                del self.stack[depth:]
+                return
+
+    def handle_data(self, data):
+        self.stack[-1].content.append(data)
+
+
+def parse_html(html):
+    """Parse HTML into a Node tree"""
+    parser = RosterParser()
+    parser.feed(html or "")
+    parser.close()
+    return parser.root
+
+
+def _is_radio(node):
+    return node.tag == "input" and node.attrs.get("type", "").lower() == "radio"
+
+
+def parse_roster(html):
+    """Parse the second-page roster into [{"name", "id", "index"}] from one HTML snapshot"""
+    root = parse_html(html)
+    form = root.find(lambda n: n.tag == "form")
+    if form is None:
+        return []
+    sections = [child for child in form.children if child.tag == "div"]
+    if not sections:
+        return []
+
+    # Fallback IDs: pegawai order on the first question, same as the page shows them
+    radio_index = build_radio_index(
+        node.attrs.get("id", "") for node in form.iter() if _is_radio(node)
+    )
+    question_ids = question_ids_from_index(radio_index)
+    first_question_order = pegawai_ids_from_index(
+        {key: loc for key, loc in radio_index.items() if question_ids and key[0] == question_ids[0]}
+    )
+
+    roster = []
+    for index, row in enumerate(sections[0].children, start=1):
+        if index < FIRST_PEGAWAI_INDEX:
+            continue
+        container = row.find(
+            lambda n: n.tag == "div" and NAME_CONTAINER_CLASSES <= n.classes
+        )
+        heading = container.find(lambda n: n.tag == "h6") if container else None
+        name = heading.text_content() if heading else ""
+        if not name:
+            continue
+
+        pegawai_id = None
+        radio = row.find(_is_radio)
+        if radio is not None:
+            parsed = parse_radio_id(radio.attrs.get("id", ""))
+            if parsed:
+                pegawai_id = parsed[1]
+        if not pegawai_id and len(roster) < len(first_question_order):
+            pegawai_id = first_question_order[len(roster)]
+
+        roster.append({"name": name, "id": pegawai_id, "index": index})
+    return roster
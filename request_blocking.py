@@ -0,0 +1,204 @@
+"""
+Request filter for the automation browser.
+Blocks images, web fonts, media and third-party analytics, which the review,
+kuesioner and usul flows never look at but reload on every iteration.
+On by default; turn it off with KINERJA_BLOCK_REQUESTS=0.
+
+   KINERJA_BLOCK_TYPES=image,font,media,analytics  categories to block (default: all)
+   KINERJA_BLOCK_URLS=*/banner/*,*.pdf            extra URL patterns ("*" is the only wildcard)
+
+Chrome blocks by URL pattern (CDP Network.setBlockedURLs) and reports the
+requests saved. The bytes saved come from a baseline: run a flow once on
+Chrome with KINERJA_BLOCK_REQUESTS=0 KINERJA_BLOCK_RECORD_SIZES=1 and the
+transfer size (Network.loadingFinished encodedDataLength) of every asset that
+would have been blocked is saved to KINERJA_BLOCK_SIZES (default
+blocked_sizes.json). Blocked runs then add "~N KiB saved" for the URLs the
+baseline has seen; other blocked URLs count as 0, so the figure is a lower
+bound, and without a baseline only the request counts are shown. Firefox
+blocks images, fonts and autoplay media by resource type through
+preferences, without a report. Safari cannot block.
+"""
+
+import json
+import os
+import threading
+from fnmatch import fnmatchcase
+
+from selenium.common.exceptions import WebDriverException
+
+BLOCK_REQUESTS = os.environ.get("KINERJA_BLOCK_REQUESTS", "1").strip().lower() not in ("0", "false", "no", "off")
+# An unblocked run records the transfer size of the assets blocking would drop, for the estimate
+RECORD_SIZES = os.environ.get("KINERJA_BLOCK_RECORD_SIZES", "").strip().lower() in ("1", "true", "yes", "on")
+SIZES_PATH = os.environ.get("KINERJA_BLOCK_SIZES", "blocked_sizes.json")
+
+
+def extension_patterns(*extensions):
+    """URL patterns for paths ending in one of the extensions, with or without a query string"""
+    return [pattern for ext in extensions for pattern in (f"*.{ext}", f"*.{ext}?*")]
+
+
+BLOCK_CATEGORIES = {
+    "image": extension_patterns("png", "jpg", "jpeg", "gif", "webp", "svg", "ico", "avif"),
+    "font": extension_patterns("woff", "woff2", "ttf", "otf", "eot")
+    + ["*fonts.googleapis.com*", "*fonts.gstatic.com*"],
+    "media": extension_patterns("mp4", "webm", "mp3", "ogg", "m4a"),
+    "analytics": [
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*hotjar.com*",
+        "*clarity.ms*", "*connect.facebook.net*", "*analytics.tiktok.com*", "*sentry.io*",
+    ],
+}
+BLOCK_TYPES = [t.strip() for t in os.environ.get("KINERJA_BLOCK_TYPES", ",".join(BLOCK_CATEGORIES)).split(",")
+               if t.strip() in BLOCK_CATEGORIES]
+EXTRA_PATTERNS = [p.strip() for p in os.environ.get("KINERJA_BLOCK_URLS", "").split(",") if p.strip()]
+# Firefox cannot block by URL; these preferences block by resource type instead
+FIREFOX_PREFS = {
+    "image": {"permissions.default.image": 2},
+    "font": {"browser.display.use_document_fonts": 0},
+    "media": {"media.autoplay.default": 5},
+}
+
+
+# Callables (driver, messages) fed by drain_performance_log, e.g. BLOCKED and the HAR recorder
+PERFORMANCE_LISTENERS = []
+
+
+def drain_performance_log(driver):
+    """Read the Chrome performance log once and hand its messages to every listener.
+    Reading empties the log, so every consumer goes through here."""
+    try:
+        entries = driver.get_log("performance")
+    except Exception:
+        return []  # not Chrome, or performance logging is off
+    messages = [json.loads(entry["message"])["message"] for entry in entries]
+    for listener in PERFORMANCE_LISTENERS:
+        listener(driver, messages)
+    return messages
+
+
+def blocked_patterns(types=None, extra=None):
+    """URL patterns to block, as (category, pattern) pairs"""
+    pairs = [(t, p) for t in (BLOCK_TYPES if types is None else types) for p in BLOCK_CATEGORIES[t]]
+    return pairs + [("custom", p) for p in (EXTRA_PATTERNS if extra is None else extra)]
+
+
+def url_matches(url, pattern):
+    """CDP blocking semantics: "*" is the only wildcard, "?" and "[" are literal"""
+    return fnmatchcase(url, pattern.replace("[", "[[]").replace("?", "[?]"))
+
+
+def category_of(url, patterns):
+    for category, pattern in patterns:
+        if url_matches(url, pattern):
+            return category
+    return "custom"
+
+
+def configure_chrome(options):
+    """Enable the network performance log, which is how blocked requests are counted"""
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+
+def configure_firefox(options, types=None):
+    for category in BLOCK_TYPES if types is None else types:
+        for name, value in FIREFOX_PREFS.get(category, {}).items():
+            options.set_preference(name, value)
+
+
+def apply_blocking(driver, patterns=None, verbose=True):
+    """Install the URL filter on a Chromium session's current tab; returns False if the driver can't block"""
+    if not hasattr(driver, "execute_cdp_cmd"):
+        return False
+    patterns = blocked_patterns() if patterns is None else patterns
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": [p for _, p in patterns]})
+    except WebDriverException as e:
+        print(f"⚠️  Could not enable request blocking: {e.msg}")
+        return False
+    if verbose:
+        print(f"🚫 Blocking {len(patterns)} URL pattern(s): {', '.join(sorted({c for c, _ in patterns}))}")
+    return True
+
+
+class BlockReport:
+    """Counts blocked requests per category; estimates the bytes saved from a baseline run"""
+
+    def __init__(self, patterns=None, sizes_path=SIZES_PATH):
+        self.patterns = blocked_patterns() if patterns is None else patterns
+        self.sizes_path = sizes_path
+        self.blocked = {}  # url -> times blocked
+        self.sizes = {}  # url -> bytes transferred, for blockable URLs that were loaded
+        self.urls = {}  # requestId -> url, kept across drains
+        self.lock = threading.Lock()  # run_review_accounts collects from several threads
+
+    def collect(self, driver):
+        """Drain the Chrome performance log and record the requests it shows as blocked"""
+        drain_performance_log(driver)
+
+    def blockable(self, url):
+        return any(url_matches(url, pattern) for _, pattern in self.patterns)
+
+    def record(self, driver, messages):
+        with self.lock:
+            for message in messages:
+                params = message.get("params", {})
+                if message.get("method") == "Network.requestWillBeSent":
+                    self.urls[params.get("requestId")] = params.get("request", {}).get("url")
+                elif message.get("method") == "Network.loadingFailed":
+                    url = self.urls.pop(params.get("requestId"), None)
+                    if url and params.get("blockedReason"):
+                        self.blocked[url] = self.blocked.get(url, 0) + 1
+                elif message.get("method") == "Network.loadingFinished":
+                    url = self.urls.pop(params.get("requestId"), None)
+                    # Only an unblocked run gets here for these URLs: that is the baseline
+                    if url and self.blockable(url):
+                        self.sizes[url] = int(params.get("encodedDataLength") or 0)
+
+    def load_sizes(self):
+        """Baseline {url: bytes} recorded by an unblocked run, or {} without one"""
+        try:
+            with open(self.sizes_path, encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return {}
+
+    def save_sizes(self):
+        """Merge the sizes seen in this run into the baseline file"""
+        sizes = self.load_sizes()
+        sizes.update(self.sizes)
+        with open(self.sizes_path, "w", encoding="utf-8") as fh:
+            json.dump(sizes, fh, indent=1, sort_keys=True)
+        print(f"\n📏 Recorded the size of {len(self.sizes)} blockable asset(s) "
+              f"(~{sum(self.sizes.values()) / 1024:.0f} KiB) in {self.sizes_path}")
+
+    def print_summary(self, record_sizes=None):
+        """Blocked requests per category, with the bytes saved when a baseline exists.
+        With record_sizes (default KINERJA_BLOCK_RECORD_SIZES) an unblocked run saves the baseline."""
+        if (RECORD_SIZES if record_sizes is None else record_sizes) and self.sizes:
+            self.save_sizes()
+        if not self.blocked:
+            return
+        sizes = self.load_sizes()
+        per_category = {}
+        for url, count in self.blocked.items():
+            category = category_of(url, self.patterns)
+            requests, size = per_category.get(category, (0, 0))
+            per_category[category] = (requests + count, size + count * sizes.get(url, 0))
+        total_requests = sum(r for r, _ in per_category.values())
+        total_bytes = sum(b for _, b in per_category.values())
+        if not sizes:
+            print(f"\n🚫 Blocked {total_requests} request(s) (no size baseline in {self.sizes_path}; "
+                  f"see request_blocking.py)")
+            for category, (requests, _) in sorted(per_category.items()):
+                print(f"   {category:10} {requests:5} request(s)")
+            return
+        known = sum(1 for url in self.blocked if url in sizes)
+        print(f"\n🚫 Blocked {total_requests} request(s), ~{total_bytes / 1024:.0f} KiB saved "
+              f"({known}/{len(self.blocked)} blocked URL(s) sized by {self.sizes_path})")
+        for category, (requests, size) in sorted(per_category.items()):
+            print(f"   {category:10} {requests:5} request(s)  ~{size / 1024:.0f} KiB")
+
+
+BLOCKED = BlockReport()
+PERFORMANCE_LISTENERS.append(BLOCKED.record)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Browserless review-perilaku backend.
+Lists pending reviews and posts the ratings straight to the JSON API the
+Nuxt frontend calls, using the saved cookies.pkl / peer_review_cookies.pkl
+session. Same result as TestReview.run_review_loop without rendering pages.
+
+The endpoint paths below mirror what the frontend requests; override them
+with REVIEW_LIST_PATH / REVIEW_SUBMIT_PATH if the portal moves them.
+standin_server.py serves the same API locally for testing.
+
+Usage:
+   python3 review_http.py
+   python3 review_http.py --base-url http://127.0.0.1:8765
+"""
+
+import argparse
+import os
+import time
+
+from kinerja_http import KINERJA_BASE_URL, HttpBackendError, HttpSession
+
+REVIEW_LIST_PATH = os.environ.get("REVIEW_LIST_PATH", "/api/kinerjajabar/review-perilaku?status=pending")
+REVIEW_SUBMIT_PATH = os.environ.get("REVIEW_SUBMIT_PATH", "/api/kinerjajabar/review-perilaku/{review_id}")
+COOKIE_FILES = ["peer_review_cookies.pkl", "cookies.pkl"]
+# The browser flow clicks .bg-white:nth-child(6) for each of the 7 indicators
+RATING_OPTION_POSITION = 6
+
+
+def list_pending_reviews(session):
+    """Return the pending reviews as a list of dicts"""
+    body = session.get_json(REVIEW_LIST_PATH) or {}
+    reviews = body.get("data", body) if isinstance(body, dict) else body
+    if not isinstance(reviews, list):
+        raise HttpBackendError(f"Unexpected review list response: {str(body)[:200]}")
+    return reviews
+
+
+def build_answers(review, option_position=RATING_OPTION_POSITION):
+    """Pick the option at option_position (1-based) for every indicator"""
+    answers = []
+    for indicator in review.get("indicators", []):
+        options = indicator.get("options") or []
+        if not options:
+            continue
+        option = options[min(option_position, len(options)) - 1]
+        answers.append({"indicator_id": indicator["id"], "value": option["value"]})
+    return answers
+
+
+def submit_review(session, review, option_position=RATING_OPTION_POSITION):
+    """Post the ratings for one review"""
+    path = REVIEW_SUBMIT_PATH.format(review_id=review["id"])
+    return session.post_json(path, {"answers": build_answers(review, option_position)})
+
+
+def run_review_http(session, max_iterations=100):
+    """Submit every pending review, return how many were submitted.
+    Each review is submitted at most once per run: one the server keeps listing (a
+    rejected payload, a stale cache) is skipped, and a pass with nothing new ends the run."""
+    submitted_ids = set()
+    while len(submitted_ids) < max_iterations:
+        pending = list_pending_reviews(session)
+        reviews = [r for r in pending if r["id"] not in submitted_ids]
+        if not reviews:
+            if pending:
+                print(f"   ⚠️  {len(pending)} submitted review(s) are still listed as pending; not resubmitting")
+            break
+        for review in reviews[: max_iterations - len(submitted_ids)]:
+            start = time.perf_counter()
+            submit_review(session, review)
+            submitted_ids.add(review["id"])
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            print(f"   ✓ Reviewed {review.get('nama', review['id'])} ({elapsed_ms:.0f} ms)")
+    return len(submitted_ids)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Submit review-perilaku over HTTP, without a browser")
+    parser.add_argument("--base-url", default=KINERJA_BASE_URL)
+    parser.add_argument("--max-iterations", type=int, default=100, help="safety limit")
+    args = parser.parse_args()
+
+    try:
+        session = HttpSession.from_cookie_files(COOKIE_FILES, base_url=args.base_url)
+        done = run_review_http(session, args.max_iterations)
+        print(f"\n✅ Submitted {done} review(s) over HTTP")
+    except HttpBackendError as e:
+        print(f"\n❌ {e}")
+        print("💡 If the session expired, re-run 'python3 extract_cookies.py'")
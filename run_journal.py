@@ -0,0 +1,143 @@
+"""
+Buffered run journal written from a background thread.
+Events are queued by the flow and written in batches, as JSON lines with
+every field plus a CSV file with a fixed set of columns (e.g. the legacy
+testUsul_log.csv layout), or JSON lines only when csv_path is None.
+checkpoint() flushes and fsyncs both files and
+returns once everything queued before it is on disk. If the writer thread
+fails (e.g. the disk is full), checkpoint() and close() raise JournalError
+instead of waiting for it.
+"""
+
+import atexit
+import csv
+import json
+import os
+import queue
+import threading
+import time
+
+_STOP = object()
+# Longest a checkpoint waits for the writer; a healthy writer needs well under a second
+CHECKPOINT_TIMEOUT = 30
+
+
+class JournalError(Exception):
+    """Raised when the writer thread failed or stopped answering"""
+
+
+class RunJournal:
+    """Append events to a JSONL file and a CSV file without blocking the caller"""
+
+    def __init__(self, csv_path, jsonl_path, csv_columns=(), batch_size=50, flush_interval=0.5):
+        self.csv_path = csv_path
+        self.jsonl_path = jsonl_path
+        self.csv_columns = csv_columns
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.events = queue.Queue()
+        self.written = 0
+        self.error = None  # exception that stopped the writer thread
+
+        self.csv_fh = self.csv_writer = None
+        if csv_path:
+            need_header = not os.path.exists(csv_path) or os.path.getsize(csv_path) == 0
+            self.csv_fh = open(csv_path, mode="a", newline="", encoding="utf-8")
+            self.csv_writer = csv.writer(self.csv_fh)
+            if need_header:
+                self.csv_writer.writerow(csv_columns)
+        self.jsonl_fh = open(jsonl_path, mode="a", encoding="utf-8")
+
+        self.thread = threading.Thread(target=self._run, name="run-journal", daemon=True)
+        self.thread.start()
+        # Events still queued when the interpreter exits are written out first
+        atexit.register(self.close)
+
+    def write(self, event):
+        """Queue one event (a dict); returns immediately"""
+        self.events.put(event)
+
+    def _check_writer(self):
+        if self.error is not None:
+            raise JournalError(f"Journal writer for {self.jsonl_path} failed: {self.error}") from self.error
+        if not self.thread.is_alive():
+            raise JournalError(f"Journal writer for {self.jsonl_path} is not running")
+
+    def checkpoint(self, timeout=CHECKPOINT_TIMEOUT):
+        """Block until every queued event is written and fsynced.
+        Raises JournalError if the writer failed, stopped or did not answer within timeout."""
+        self._check_writer()
+        done = threading.Event()
+        self.events.put(done)
+        deadline = time.monotonic() + timeout
+        while not done.wait(0.2):
+            self._check_writer()
+            if time.monotonic() > deadline:
+                raise JournalError(f"Journal checkpoint for {self.jsonl_path} timed out after {timeout}s")
+
+    def close(self):
+        """Write out everything queued and close the files; the files are closed even if that fails"""
+        atexit.unregister(self.close)
+        try:
+            if self.thread.is_alive():
+                self.checkpoint()
+                self.events.put(_STOP)
+                self.thread.join(CHECKPOINT_TIMEOUT)
+            elif self.error is not None:
+                self._check_writer()
+        finally:
+            for fh in (self.csv_fh, self.jsonl_fh):
+                if fh:
+                    fh.close()
+
+    def _run(self):
+        try:
+            self._write_batches()
+        except BaseException as exc:
+            self.error = exc
+            print(f"❌ Journal writer for {self.jsonl_path} stopped: {exc}")
+
+    def _write_batches(self):
+        while True:
+            try:
+                batch = [self.events.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.events.get_nowait())
+                except queue.Empty:
+                    break
+
+            checkpoints = []
+            stop = False
+            for item in batch:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    checkpoints.append(item)
+                else:
+                    self._write_event(item)
+            files = [fh for fh in (self.csv_fh, self.jsonl_fh) if fh]
+            for fh in files:
+                fh.flush()
+            if checkpoints:
+                for fh in files:
+                    os.fsync(fh.fileno())
+                for done in checkpoints:
+                    done.set()
+            if stop:
+                return
+
+    def _write_event(self, event):
+        # Only an event that cannot be serialised is skipped; write errors (OSError, e.g. a
+        # full disk) stop the writer, so checkpoint() and close() raise JournalError
+        try:
+            line = json.dumps(event, ensure_ascii=False) + "\n"
+        except (TypeError, ValueError) as exc:
+            print(f"⚠️ Could not write journal event: {exc}")
+            return
+        if self.csv_writer:
+            self.csv_writer.writerow([event.get(column, "") for column in self.csv_columns])
+        self.jsonl_fh.write(line)
+        self.written += 1
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Run the review-perilaku loop for many accounts in parallel.
+Each *.pkl cookie jar in the accounts directory is one account; every account
+gets its own browser session (and therefore its own cookie jar), driven from a
+worker pool. Prints and saves a per-account summary at the end.
+
+Usage:
+   python3 run_review_accounts.py accounts/ --workers 4 --browser chrome --headless
+"""
+
+import argparse
+import csv
+import glob
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from browser_backend import BROWSER_NAMES, HEADLESS, make_driver
+from cookie_vault import KINERJA_HOST
+from flows import REVIEW_FLOW, load_flow
+from page_waits import NUXT_ROOT, wait_until_settled
+from request_blocking import BLOCKED
+from session_preflight import check_session
+
+SUMMARY_FILE = "review_accounts_summary.csv"
+
+
+def find_accounts(accounts_dir):
+    """Map account name (file stem) to cookie jar path"""
+    jars = sorted(glob.glob(os.path.join(accounts_dir, "*.pkl")))
+    return {os.path.splitext(os.path.basename(jar))[0]: jar for jar in jars}
+
+
+def run_account(account, cookie_jar, browser="chrome", max_iterations=100, headless=HEADLESS):
+    """Run the review loop for one account in its own browser session"""
+    review_flow = load_flow(REVIEW_FLOW)
+    result = {"account": account, "status": "ok", "reviews": 0, "seconds": 0.0, "error": ""}
+    start = time.perf_counter()
+    driver = None
+    try:
+        # Expired or rejected sessions are skipped before a browser is launched
+        ok, reason = check_session(KINERJA_HOST, account, legacy_files=[cookie_jar])
+        if ok is None:
+            print(f"⚠️  [{account}] Preflight: {reason} - continuing with the stored cookies")
+        elif not ok:
+            result["status"] = "no session"
+            result["error"] = reason
+            return result
+        driver = make_driver(browser, headless)
+        flow = review_flow.TestReview()
+        flow.driver = driver
+        if not flow.load_cookies(review_flow.REVIEW_URL, cookie_files=[cookie_jar], account=account):
+            result["status"] = "no cookies"
+            return result
+        wait_until_settled(driver, NUXT_ROOT, label=f"[{account}] review page after cookies")
+        result["reviews"] = flow.run_review_loop(max_iterations=max_iterations, page_loaded=True)
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = str(e).splitlines()[0] if str(e) else type(e).__name__
+    finally:
+        if driver:
+            BLOCKED.collect(driver)
+            driver.quit()
+        result["seconds"] = round(time.perf_counter() - start, 1)
+    return result
+
+
+def print_summary(results):
+    print("\n" + "="*60)
+    print("=== REVIEW SUMMARY PER ACCOUNT ===")
+    print("="*60)
+    for r in results:
+        icon = "✓" if r["status"] == "ok" else "⚠️ "
+        line = f"   {icon} {r['account']}: {r['reviews']} review(s) in {r['seconds']}s [{r['status']}]"
+        if r["error"]:
+            line += f" - {r['error']}"
+        print(line)
+    total = sum(r["reviews"] for r in results)
+    failed = sum(1 for r in results if r["status"] != "ok")
+    print(f"\n✅ {total} review(s) across {len(results)} account(s), {failed} account(s) with problems")
+
+
+def save_summary(results, path=SUMMARY_FILE):
+    try:
+        with open(path, "w", newline="", encoding="utf-8") as fh:
+            writer = csv.DictWriter(fh, fieldnames=["account", "status", "reviews", "seconds", "error"])
+            writer.writeheader()
+            writer.writerows(results)
+        print(f"💾 Saved summary to: {path}")
+    except Exception as e:
+        print(f"⚠️  Could not save summary: {e}")
+
+
+def run_accounts(accounts_dir, workers=4, browser="chrome", max_iterations=100, headless=HEADLESS):
+    accounts = find_accounts(accounts_dir)
+    if not accounts:
+        print(f"❌ No *.pkl cookie jars found in {accounts_dir}")
+        return []
+    # Safari only allows one WebDriver session at a time
+    if browser == "safari" and workers > 1:
+        print("ℹ️ Safari supports a single WebDriver session; using 1 worker")
+        workers = 1
+
+    # Import the flow once up front so workers don't race on it
+    load_flow(REVIEW_FLOW)
+    print(f"🚀 Running review loop for {len(accounts)} account(s) with {workers} worker(s)...")
+
+    results = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(run_account, name, jar, browser, max_iterations, headless): name
+            for name, jar in accounts.items()
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            print(f"   ✓ Finished {result['account']}: {result['reviews']} review(s) [{result['status']}]")
+            results.append(result)
+
+    results.sort(key=lambda r: r["account"])
+    print_summary(results)
+    BLOCKED.print_summary()
+    save_summary(results)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run review-perilaku for many accounts in parallel")
+    parser.add_argument("accounts_dir", help="directory with one <account>.pkl cookie jar per account")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent browser sessions (default 4)")
+    parser.add_argument("--browser", choices=BROWSER_NAMES, default="chrome")
+    parser.add_argument("--headless", action="store_true", default=HEADLESS,
+                        help="run without windows (default: KINERJA_HEADLESS)")
+    parser.add_argument("--max-iterations", type=int, default=100, help="safety limit per account")
+    args = parser.parse_args()
+    run_accounts(args.accounts_dir, args.workers, args.browser, args.max_iterations, args.headless)
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Process testUsul.csv in N parallel shards.
+The rows are validated and de-duplicated on (no_urut, no_peserta) by
+UsulCsvReader, rows already logged as SUCCESS are dropped, and the rest are
+dealt round-robin into N shard files, so every pair belongs to exactly one
+worker. Each worker process drives its own
+authenticated session (a browser with the saved SIASN cookies, or the HTTP
+backend) and logs to its own shard log. Afterwards the shard logs are merged
+into testUsul_log.csv / testUsul_log.jsonl in CSV row order, and the shard
+step timings into testUsul_log_metrics.jsonl.
+
+Log in once with the normal flow first, so siasn_cookies are in the vault.
+
+Usage:
+   python3 run_usul_shards.py testUsul.csv --shards 4 --browser chrome --headless
+   python3 run_usul_shards.py testUsul.csv --shards 8 --backend http
+"""
+
+import argparse
+import csv
+import glob
+import json
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from browser_backend import BROWSER, BROWSER_NAMES, HEADLESS
+from cookie_vault import SIASN_HOST
+from run_journal import RunJournal
+from session_preflight import require_session
+from step_metrics import metrics_path_for, print_step_table, read_metrics
+from usul_records import (
+    LOG_HEADER, USUL_CSV, USUL_LOG, UsulCsvReader, journal_path_for, load_done_index, load_draft_index,
+    load_unconfirmed_index,
+)
+
+SHARD_DIR = "usul_shards"
+
+
+def shard_paths(shard, shard_dir=SHARD_DIR):
+    """(input CSV, log CSV) for one shard"""
+    return (os.path.join(shard_dir, f"testUsul.shard{shard}.csv"),
+            os.path.join(shard_dir, f"testUsul_log.shard{shard}.csv"))
+
+
+def plan_shards(rows, shards, done=()):
+    """Drop already-submitted (and any repeated) pairs, then deal the rows round-robin"""
+    seen = set(done)
+    unique = []
+    for row in rows:
+        key = (row["no_urut"], row["no_peserta"])
+        if key not in seen:
+            seen.add(key)
+            unique.append({"no_urut": key[0], "no_peserta": key[1]})
+    return [unique[k::shards] for k in range(shards)]
+
+
+def write_shard(rows, path):
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.DictWriter(fh, fieldnames=["no_urut", "no_peserta"], delimiter=";")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def run_shard(shard, csv_path, log_path, backend="browser", browser="chrome", headless=True, drafts=None):
+    """Worker process: run one shard with its own session, return (shard, seconds, error).
+    drafts are the unsent usul from the main log, for the HTTP backend."""
+    start = time.perf_counter()
+    try:
+        if backend == "http":
+            from kinerja_http import HttpSession
+            from usul_http import COOKIE_FILE, SIASN_BASE_URL, process_usul_records_http
+
+            session = HttpSession.from_cookie_files([COOKIE_FILE], base_url=SIASN_BASE_URL, domain=SIASN_HOST)
+            process_usul_records_http(session, csv_path, log_path, drafts=drafts)
+        else:
+            from browser_backend import make_driver
+            from flows import USUL_FLOW, load_flow
+
+            flow = load_flow(USUL_FLOW).TestUsulNIP()
+            flow.driver = make_driver(browser, headless)
+            try:
+                if not flow.load_cookies():
+                    raise RuntimeError("no unexpired SIASN cookies")
+                flow.open_filter_dialog()
+                flow.process_usul_records_from_csv(csv_path, log_path=log_path)
+            finally:
+                flow.driver.quit()
+        return shard, time.perf_counter() - start, ""
+    except Exception as e:
+        return shard, time.perf_counter() - start, str(e).splitlines()[0] if str(e) else type(e).__name__
+
+
+def merge_shard_metrics(log_path=USUL_LOG, shard_dir=SHARD_DIR):
+    """Append every shard's step timings to the main metrics file; returns the merged events"""
+    events = []
+    for path in sorted(glob.glob(os.path.join(shard_dir, "testUsul_log.shard*_metrics.jsonl"))):
+        events.extend(read_metrics(path))
+    if events:
+        journal = RunJournal(None, metrics_path_for(log_path))
+        for event in events:
+            journal.write(event)
+        journal.close()
+    return events
+
+
+def merge_shard_logs(order, log_path=USUL_LOG, shard_dir=SHARD_DIR):
+    """Append every shard's events to the main log in CSV row order, then remove the shard files.
+    Returns the shard step timings that were merged."""
+    events = []
+    for jsonl in sorted(glob.glob(os.path.join(shard_dir, "testUsul_log.shard*.jsonl"))):
+        if jsonl.endswith("_metrics.jsonl"):
+            continue
+        with open(jsonl, encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    continue  # blank, or cut short when the worker was killed
+    if events:
+        # Stable sort keeps each record's own events in the order they happened
+        events.sort(key=lambda e: order.get((e.get("no_urut"), e.get("no_peserta")), len(order)))
+        journal = RunJournal(log_path, journal_path_for(log_path), LOG_HEADER)
+        for event in events:
+            journal.write(event)
+        journal.close()
+        print(f"🧩 Merged {len(events)} shard log event(s) into {log_path}")
+    metrics = merge_shard_metrics(log_path, shard_dir)
+    for path in glob.glob(os.path.join(shard_dir, "testUsul*.shard*")):
+        os.remove(path)
+    return metrics
+
+
+def run_shards(csv_path=USUL_CSV, shards=4, backend="browser", browser="chrome", headless=True,
+               log_path=USUL_LOG):
+    os.makedirs(SHARD_DIR, exist_ok=True)
+    reader = UsulCsvReader(csv_path)
+    rows = list(reader)
+    reader.print_summary()
+    order = {(r["no_urut"], r["no_peserta"]): i for i, r in enumerate(rows)}
+    # Logs left behind by an interrupted sharded run count as done before re-planning
+    merge_shard_logs(order, log_path)
+
+    if backend == "http":
+        # Only the HTTP backend needs the API endpoint; an expired or rejected session raises,
+        # an inconclusive check warns and the shards go ahead
+        require_session(SIASN_HOST)
+    if backend == "browser" and browser == "safari" and shards > 1:
+        print("ℹ️ Safari supports a single WebDriver session; using 1 shard")
+        shards = 1
+
+    done = load_done_index(log_path)
+    # Submitted but unconfirmed records are left for a manual check, like in a single run
+    unconfirmed = load_unconfirmed_index(log_path) - done
+    if unconfirmed:
+        print(f"⚠️  {len(unconfirmed)} record(s) were submitted but not confirmed; they are skipped")
+    # A shard logs to its own file, so it gets the main log's unsent usul handed over
+    drafts = load_draft_index(log_path)
+    plan = plan_shards(rows, shards, done | unconfirmed)
+    total = sum(len(p) for p in plan)
+    print(f"📄 {total} row(s) to process, {len(rows) - total} already submitted or awaiting a check")
+    if not total:
+        return []
+
+    jobs = []
+    for shard, shard_rows in enumerate(plan, start=1):
+        if shard_rows:
+            shard_csv, shard_log = shard_paths(shard)
+            write_shard(shard_rows, shard_csv)
+            jobs.append((shard, shard_csv, shard_log, len(shard_rows)))
+
+    # Ctrl+C reaches the workers too; they finish their current record and checkpoint,
+    # so the parent keeps waiting and merges whatever they logged
+    previous = signal.signal(signal.SIGINT, lambda *_: print("\n⏸️  Waiting for shards to checkpoint..."))
+    results = []
+    start = time.perf_counter()
+    try:
+        print(f"🚀 Running {len(jobs)} shard(s) ({backend})...")
+        with ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+            futures = [pool.submit(run_shard, shard, shard_csv, shard_log, backend, browser, headless, drafts)
+                       for shard, shard_csv, shard_log, _ in jobs]
+            for future in as_completed(futures):
+                shard, seconds, error = future.result()
+                print(f"   {'⚠️ ' if error else '✓'} Shard {shard} finished in {seconds:.1f}s"
+                      + (f" - {error}" if error else ""))
+                results.append((shard, seconds, error))
+    finally:
+        signal.signal(signal.SIGINT, previous)
+        metrics = merge_shard_logs(order, log_path)
+
+    elapsed = max(time.perf_counter() - start, 1e-6)
+    submitted = len(load_done_index(log_path)) - len(done)
+    print(f"\n✅ {submitted}/{total} usul record(s) submitted by {len(jobs)} shard(s) in {elapsed:.1f}s "
+          f"({submitted / elapsed * 60:.0f} records/min)")
+    print_step_table(metrics)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Process the usul CSV in parallel shards")
+    parser.add_argument("csv_path", nargs="?", default=USUL_CSV)
+    parser.add_argument("--shards", type=int, default=4, help="parallel sessions (default 4)")
+    parser.add_argument("--backend", choices=["browser", "http"], default="browser")
+    parser.add_argument("--browser", choices=BROWSER_NAMES, default=BROWSER)
+    parser.add_argument("--headless", action="store_true", default=HEADLESS)
+    parser.add_argument("--log", default=USUL_LOG)
+    args = parser.parse_args()
+    run_shards(args.csv_path, max(1, args.shards), args.backend, args.browser, args.headless, args.log)
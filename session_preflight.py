@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Session preflight: check that the stored cookies are still logged in before
+any browser is launched.
+Reads the jar from the cookie vault (expired jars fail without a request) and
+loads the first page the flow opens (the review-perilaku page, SIASN's
+tampilanData) once, with a sub-second timeout and without following
+redirects. A redirect to a login/SSO page, a page with a password field and
+401/403 fail; a plain 200 passes. Anything else (another redirect, 404, a
+timeout, no network) is inconclusive: the jar may well still work, so the
+flows warn and carry on.
+
+Limitation: a portal that serves its single-page app to anyone and only
+redirects to the login page in the browser answers 200 either way, so for it
+the check only catches expired jars and server-side rejections. Point
+KINERJA_PREFLIGHT_PATH / SIASN_PREFLIGHT_PATH at an API endpoint seen in the
+browser's network tab (one that answers 401 when logged out) to make it
+strict.
+
+Usage:
+   python3 session_preflight.py              # kinerja.jabarprov.go.id
+   python3 session_preflight.py siasn-instansi.bkn.go.id --account default
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+import urllib.error
+import urllib.request
+
+from cookie_vault import KINERJA_HOST, SIASN_HOST, domain_key, load_jar
+from kinerja_http import KINERJA_BASE_URL, HttpSession
+from usul_http import SIASN_BASE_URL
+
+# The pages the review/kuesioner and usul flows load first
+KINERJA_PREFLIGHT_PATH = os.environ.get("KINERJA_PREFLIGHT_PATH", "/kinerjajabar/review-perilaku")
+SIASN_PREFLIGHT_PATH = os.environ.get("SIASN_PREFLIGHT_PATH", "/tampilanData")
+PREFLIGHT_TIMEOUT = 0.8
+# A redirect here means the session is gone (nuxt/auth login page, Keycloak SSO)
+LOGIN_REDIRECT = re.compile(r"login|signin|sso|openid-connect|/auth/realms", re.IGNORECASE)
+PASSWORD_FIELD = re.compile(rb"<input[^>]+type=[\"']?password", re.IGNORECASE)
+# domain -> (base URL, check path, legacy cookie files, how to log in again)
+SITES = {
+    KINERJA_HOST: (KINERJA_BASE_URL, KINERJA_PREFLIGHT_PATH, ["peer_review_cookies.pkl", "cookies.pkl"],
+                   "python3 extract_cookies.py"),
+    SIASN_HOST: (SIASN_BASE_URL, SIASN_PREFLIGHT_PATH, ["siasn_cookies.pkl"],
+                 "the SSO login in '20251126 autoUsulNIP.py'"),
+}
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None  # surface the 3xx as an HTTPError with its Location
+
+
+def probe(session, path):
+    """GET path once without following redirects; returns (status, Location header, body)"""
+    headers = dict(session.headers(), Accept="text/html,application/json")
+    req = urllib.request.Request(session.base_url + path, headers=headers)
+    try:
+        with urllib.request.build_opener(_NoRedirect).open(req, timeout=session.timeout) as resp:
+            return resp.status, "", resp.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers.get("Location") or "", b""
+
+
+def check_session(domain=KINERJA_HOST, account=None, base_url=None, timeout=PREFLIGHT_TIMEOUT,
+                  legacy_files=None):
+    """Return (ok, reason): True when the stored session for domain is authenticated, False when
+    it has expired or was rejected, None when the check could not tell"""
+    domain = domain_key(domain)
+    default_url, path, default_files, login_hint = SITES[domain]
+    start = time.perf_counter()
+
+    jar = load_jar(domain, account, legacy_files=default_files if legacy_files is None else legacy_files)
+    if jar is None:
+        return False, f"no unexpired cookies for {domain} - log in again with {login_hint}"
+
+    session = HttpSession(jar[1], base_url or default_url, timeout=timeout)
+    name = f"{domain}/{jar[0]}"
+    try:
+        status, location, body = probe(session, path)
+    except OSError as e:  # timeouts, refused connections, no network
+        return None, f"could not confirm the session for {name}: {getattr(e, 'reason', e)}"
+    if status in (401, 403):
+        return False, f"session for {name} was rejected (HTTP {status}) - log in again with {login_hint}"
+    if 300 <= status < 400 and LOGIN_REDIRECT.search(location):
+        return False, f"session for {name} is redirected to the login page - log in again with {login_hint}"
+    if status == 200 and PASSWORD_FIELD.search(body):
+        return False, f"{path} shows a login form for {name} - log in again with {login_hint}"
+    if status != 200:
+        return None, f"could not confirm the session for {name}: GET {path} answered HTTP {status}" + (
+            f" -> {location}" if location else "")
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    return True, f"session for {name} loaded {path} without a login redirect ({elapsed_ms:.0f} ms)"
+
+
+def require_session(domain=KINERJA_HOST, account=None):
+    """Raise before the browser starts if the stored session has expired or was rejected"""
+    ok, reason = check_session(domain, account)
+    if ok is False:
+        print(f"❌ Preflight: {reason}")
+        raise Exception(f"Session preflight failed: {reason}")
+    if ok is None:
+        print(f"⚠️  Preflight: {reason} - continuing with the stored cookies")
+        return
+    print(f"✓ Preflight: {reason}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check a stored session without opening a browser")
+    parser.add_argument("domain", nargs="?", default=KINERJA_HOST, choices=sorted(SITES))
+    parser.add_argument("--account")
+    parser.add_argument("--base-url")
+    parser.add_argument("--timeout", type=float, default=PREFLIGHT_TIMEOUT)
+    args = parser.parse_args()
+
+    ok, reason = check_session(args.domain, args.account, args.base_url, args.timeout)
+    print(f"{'✅' if ok else '⚠️ ' if ok is None else '❌'} {reason}")
+    sys.exit({True: 0, False: 1, None: 2}[ok])
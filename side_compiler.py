@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Compile a Selenium IDE recording (.side) into a Python flow module.
+"Kuisioner Kinerja.side" replays one command per WebDriver round trip, and
+the IDE records a lot of noise along the way. The compiler:
+
+- drops commands that do nothing on replay: the doubleClick the IDE logs
+  after the two clicks it is made of, window.scrollTo scripts (WebDriver
+  scrolls elements into view itself), a click right before typing into the
+  same element, clicks on layout containers that hold most of the recorded
+  targets, and the final close (the caller owns the browser)
+- picks the cheapest stable locator from each command's targets list: a
+  non-generated id or name, link text, the text of a step button, then the
+  IDE's CSS path, and only then index- or position-based XPath
+- sends consecutive clicks inside the same <form> to the page as one batch
+  (one script call); a target clicked twice ends the batch, since the page
+  changed in between (e.g. the next pair on the comparison step)
+
+and writes a module with one run_<test>(driver) function per test, plus a
+runner that loads the kinerja cookies from the vault. It prints how many
+WebDriver round trips that saves (a command costs a find and an action).
+
+Usage:
+   python3 side_compiler.py "Kuisioner Kinerja.side" -o kuisioner_side.py
+   python3 kuisioner_side.py "20250603 Kuisioner" --browser chrome
+"""
+
+import argparse
+import json
+import keyword
+import os
+import re
+
+from selenium.common.exceptions import ElementClickInterceptedException
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from cookie_vault import KINERJA_HOST
+from page_waits import wait_until_settled
+
+# Ids generated per render (headlessui, Vue/React counters, UUIDs) do not survive a reload
+GENERATED_ID = re.compile(r"headlessui|^v-\d|^:r|^react-|^ember\d|[0-9a-f]{8}-[0-9a-f]{4}-")
+INTERACTIVE_TAGS = {"a", "button", "input", "label", "option", "select", "textarea"}
+# Buttons whose click loads a new step or page; the compiled flow waits for it to settle
+NAVIGATION_TEXTS = ("Selanjutnya", "Sebelumnya", "Selesai", "Kirim", "Simpan", "Tutup", "Lakukan Review")
+# WebDriver round trips per command when replayed as recorded: find the element, then act
+RECORDED_COST = {"open": 1, "setWindowSize": 1, "runScript": 1, "executeScript": 1, "close": 1}
+
+BATCH_CLICK_JS = """
+const missing = [];
+arguments[0].forEach(([kind, expr], i) => {
+    const el = kind === "css"
+        ? document.querySelector(expr)
+        : document.evaluate(expr, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    if (el) {
+        el.scrollIntoView({block: "center"});
+        el.click();
+    } else {
+        missing.push(i);
+    }
+});
+return missing;
+"""
+
+
+# ---- runtime used by the compiled modules -------------------------------------------------
+
+def find(driver, locator, timeout=10):
+    return WebDriverWait(driver, timeout).until(EC.element_to_be_clickable(locator))
+
+
+def click(driver, locator, settle=False):
+    element = find(driver, locator)
+    try:
+        element.click()
+    except ElementClickInterceptedException:
+        driver.execute_script("arguments[0].click();", element)
+    if settle:
+        wait_until_settled(driver, label="side step")
+
+
+def double_click(driver, locator):
+    ActionChains(driver).double_click(find(driver, locator)).perform()
+
+
+def type_text(driver, locator, text):
+    element = find(driver, locator)
+    element.clear()
+    element.send_keys(text)
+
+
+def click_batch(driver, steps, timeout=10):
+    """Click [(kind, expr), ...] in one script call; anything not found is clicked one by one"""
+    kind, expr = steps[0]
+    WebDriverWait(driver, timeout).until(
+        EC.presence_of_element_located((By.CSS_SELECTOR if kind == "css" else By.XPATH, expr)))
+    for i in driver.execute_script(BATCH_CLICK_JS, steps) or []:
+        kind, expr = steps[i]
+        click(driver, (By.CSS_SELECTOR if kind == "css" else By.XPATH, expr))
+
+
+# ---- compiler -----------------------------------------------------------------------------
+
+def _segments(xpath):
+    """//div[@id='x']/div/div[2] -> ["div[@id='x']", "div[1]", "div[2]"]"""
+    parts = xpath.lstrip("/").split("/")
+    return [p if "[" in p else f"{p}[1]" for p in parts]
+
+
+def _tag(xpath):
+    return _segments(xpath)[-1].split("[")[0] if xpath else ""
+
+
+def _is_ancestor(outer, inner):
+    a, b = _segments(outer), _segments(inner)
+    return len(a) < len(b) and b[:len(a)] == a
+
+
+def choose_locator(command):
+    """(strategy, By, value) of the cheapest stable locator in a command's targets"""
+    candidates = [value for value, _ in command.get("targets") or []] or [command.get("target", "")]
+    ranked = []
+    for value in candidates:
+        prefix, _, expr = value.partition("=")
+        if prefix == "id" and not GENERATED_ID.search(expr):
+            ranked.append((0, "id", By.ID, expr))
+        elif prefix == "name":
+            ranked.append((1, "name", By.NAME, expr))
+        elif prefix == "linkText":
+            ranked.append((2, "linkText", By.LINK_TEXT, expr))
+        elif prefix == "css" and not GENERATED_ID.search(expr):
+            # The IDE's CSS path is unique when recorded; without positions it also survives reordering
+            ranked.append((4 if "nth-child" in expr else 3, "css", By.CSS_SELECTOR, expr))
+        elif prefix == "xpath":
+            kind = next((k for v, k in command.get("targets") or [] if v == value), "xpath")
+            if kind == "xpath:innerText" and any(word in expr for word in NAVIGATION_TEXTS):
+                # Step buttons share their CSS path (Selanjutnya / Selesai dan Kirim); the text tells them apart
+                ranked.append((3, "text", By.XPATH, expr))
+            elif kind == "xpath:innerText":
+                ranked.append((5, "text", By.XPATH, expr))  # other texts may match several elements
+            elif kind == "xpath:position" or "@id=''" in expr or GENERATED_ID.search(expr):
+                ranked.append((9, "xpath", By.XPATH, expr))
+            elif re.search(r"\)\[\d+\]$", expr):
+                ranked.append((7, "xpath", By.XPATH, expr))  # n-th match of an attribute query
+            else:
+                ranked.append((6, "xpath", By.XPATH, expr))
+    if not ranked:
+        raise ValueError(f"No usable locator for {command.get('command')} {command.get('target')!r}")
+    # Stable sort: the IDE's own order breaks ties
+    _, strategy, by, value = min(ranked, key=lambda r: r[0])
+    return strategy, by, value
+
+
+def batch_locator(by, value):
+    """Locator as (kind, expr) for BATCH_CLICK_JS"""
+    if by == By.ID:
+        return "css", f'[id="{value}"]'
+    if by == By.NAME:
+        return "css", f'[name="{value}"]'
+    if by == By.LINK_TEXT:
+        return "xpath", f'//a[normalize-space(.)="{value}"]'
+    return ("css" if by == By.CSS_SELECTOR else "xpath"), value
+
+
+def _xpath(command):
+    return next((v.partition("=")[2] for v, k in command.get("targets") or [] if k == "xpath:idRelative"), "")
+
+
+def _form_of(command):
+    """The <form> a command's element sits in (from the IDE's id-relative XPath), if any"""
+    segments = _segments(_xpath(command)) if _xpath(command) else []
+    forms = [i for i, s in enumerate(segments) if s.startswith("form")]
+    return "/".join(segments[:forms[-1] + 1]) if forms else None
+
+
+def _is_navigation(command):
+    text = " ".join(v for v, k in command.get("targets") or [] if k in ("xpath:innerText", "linkText"))
+    return any(word in text for word in NAVIGATION_TEXTS)
+
+
+def drop_noise(commands):
+    """Commands that do something on replay, and {reason: count} for the rest"""
+    dropped = {}
+    kept = []
+
+    def drop(reason):
+        dropped[reason] = dropped.get(reason, 0) + 1
+
+    for i, command in enumerate(commands):
+        name, target = command["command"], command.get("target", "")
+        following = commands[i + 1] if i + 1 < len(commands) else None
+        if name in ("runScript", "executeScript") and re.fullmatch(r"\s*window\.scrollTo\([^)]*\);?\s*", target):
+            drop("window.scrollTo")
+        elif name == "doubleClick" and len(kept) >= 2 and all(
+                c["command"] == "click" and c.get("target") == target for c in kept[-2:]):
+            drop("doubleClick echo of two clicks")
+        elif name == "click" and following and following["command"] == "type" and following.get("target") == target:
+            drop("click before type")
+        elif name == "close":
+            drop("close")
+        else:
+            kept.append(command)
+
+    # Clicks on layout containers (an ancestor of most recorded targets) only move focus
+    paths = [_xpath(c) for c in kept if c["command"] in ("click", "doubleClick") and _xpath(c)]
+    result = []
+    for command in kept:
+        xpath = _xpath(command)
+        if (command["command"] == "click" and xpath and _tag(xpath) not in INTERACTIVE_TAGS
+                and sum(_is_ancestor(xpath, p) for p in paths) * 2 >= len(paths)):
+            drop("click on a layout container")
+            continue
+        result.append(command)
+    return result, dropped
+
+
+def plan_steps(commands):
+    """Group the kept commands into steps: ("batch", [...]) or (command name, locator, value, settle)"""
+    steps = []
+    batch, batch_form = [], None
+
+    def flush():
+        nonlocal batch, batch_form
+        if len(batch) == 1:
+            steps.append(("click", batch[0][0], "", False))
+        elif batch:
+            steps.append(("batch", batch, "", False))
+        batch, batch_form = [], None
+
+    for command in commands:
+        name = command["command"]
+        if name in ("open", "setWindowSize") or name in ("runScript", "executeScript"):
+            flush()
+            steps.append((name, None, command.get("target", ""), name == "open"))
+            continue
+        locator = choose_locator(command)
+        form = _form_of(command)
+        if name == "click" and form and not _is_navigation(command):
+            if form != batch_form or any(locator == queued for queued, _ in batch):
+                flush()
+            batch.append((locator, command))
+            batch_form = form
+            continue
+        flush()
+        steps.append((name, locator, command.get("value", ""), name == "click" and _is_navigation(command)))
+    flush()
+    return steps
+
+
+def round_trips(steps):
+    trips = 0
+    for name, *_ in steps:
+        # A batch waits for its first element, then runs one script
+        trips += RECORDED_COST.get(name, 2)
+    return trips
+
+
+def compile_test(test):
+    """(function name, steps, report) for one .side test"""
+    commands = test["commands"]
+    kept, dropped = drop_noise(commands)
+    steps = plan_steps(kept)
+    strategies = {}
+    for name, locator, *_ in steps:
+        for loc in ([l for l, _ in locator] if name == "batch" else [locator] if locator else []):
+            strategies[loc[0]] = strategies.get(loc[0], 0) + 1
+    report = {
+        "test": test["name"],
+        "commands": len(commands),
+        "steps": len(steps),
+        "dropped": dropped,
+        "locators": strategies,
+        "batches": [len(locator) for name, locator, *_ in steps if name == "batch"],
+        "round_trips_before": sum(RECORDED_COST.get(c["command"], 2) for c in commands),
+        "round_trips_after": round_trips(steps),
+    }
+    slug = re.sub(r"\W+", "_", test["name"]).strip("_").lower()
+    function = f"run_{slug}" if not keyword.iskeyword(slug) else f"run_{slug}_"
+    return function, steps, report
+
+
+def _by_name(by):
+    return {By.ID: "By.ID", By.NAME: "By.NAME", By.LINK_TEXT: "By.LINK_TEXT",
+            By.CSS_SELECTOR: "By.CSS_SELECTOR", By.XPATH: "By.XPATH"}[by]
+
+
+def render_steps(steps):
+    lines = []
+    for name, locator, value, settle in steps:
+        if name == "batch":
+            lines.append(f"    # {len(locator)} clicks in one round trip")
+            lines.append("    click_batch(driver, [")
+            for (_, by, expr), command in locator:
+                lines.append(f"        {batch_locator(by, expr)!r},")
+            lines.append("    ])")
+            continue
+        if name == "open":
+            lines.append(f"    driver.get(base_url + {value!r})")
+            lines.append("    wait_until_settled(driver, label=\"side open\")")
+        elif name == "setWindowSize":
+            width, _, height = value.partition("x")
+            lines.append(f"    if not HEADLESS:\n        driver.set_window_size({int(width)}, {int(height)})")
+        elif name in ("runScript", "executeScript"):
+            lines.append(f"    driver.execute_script({value!r})")
+        else:
+            target = f"({_by_name(locator[1])}, {locator[2]!r})"
+            if name == "click":
+                lines.append(f"    click(driver, {target}{', settle=True' if settle else ''})")
+            elif name == "doubleClick":
+                lines.append(f"    double_click(driver, {target})")
+            elif name == "type":
+                lines.append(f"    type_text(driver, {target}, {value!r})")
+            else:
+                lines.append(f"    # unsupported IDE command {name!r} {target}")
+    return lines
+
+
+def render_module(side, side_path, out_path, compiled):
+    base_url = side.get("url", "")
+    kinerja = base_url.rstrip("/").endswith(KINERJA_HOST)
+    lines = [
+        '"""',
+        f"Compiled from {os.path.basename(side_path)!r} by side_compiler.py; regenerate instead of editing.",
+        "",
+        f'   python3 {os.path.basename(out_path)} "{compiled[0][2]["test"]}" --browser chrome',
+        '"""',
+        "",
+        "import argparse",
+        "",
+        "from selenium.webdriver.common.by import By",
+        "",
+        "from browser_backend import BROWSER, BROWSER_NAMES, HEADLESS, make_driver",
+        "from browser_pool import inject_cookies",
+        f"from cookie_vault import {'KINERJA_HOST, ' if kinerja else ''}load_jar",
+    ]
+    if kinerja:
+        lines.append("from kinerja_http import KINERJA_BASE_URL")
+    used = {name for _, steps, _ in compiled for name, *_ in steps}
+    helpers = [helper for step, helper in (("click", "click"), ("batch", "click_batch"),
+                                           ("doubleClick", "double_click"), ("type", "type_text"))
+               if step in used]
+    if "open" in used:
+        lines.append("from page_waits import wait_until_settled")
+    if helpers:
+        lines.append(f"from side_compiler import {', '.join(helpers)}")
+    if kinerja:
+        lines += ["", "BASE_URL = KINERJA_BASE_URL", "HOST = KINERJA_HOST"]
+    else:
+        host = base_url.split("//")[-1].split("/")[0]
+        lines += ["", f"BASE_URL = {base_url.rstrip('/')!r}", f"HOST = {host!r}"]
+    for function, steps, report in compiled:
+        lines += ["", "", f"def {function}(driver, base_url=BASE_URL):",
+                  f'    """{report["test"]}: {report["commands"]} recorded commands, {report["steps"]} steps"""']
+        lines += render_steps(steps) or ["    pass"]
+    lines += ["", "", "TESTS = {"]
+    lines += [f"    {report['test']!r}: {function}," for function, _, report in compiled]
+    lines += [
+        "}",
+        "",
+        "",
+        'if __name__ == "__main__":',
+        '    parser = argparse.ArgumentParser(description="Run a compiled Selenium IDE test")',
+        "    parser.add_argument(\"test\", choices=sorted(TESTS))",
+        "    parser.add_argument(\"--browser\", choices=BROWSER_NAMES, default=BROWSER)",
+        "    parser.add_argument(\"--headless\", action=\"store_true\", default=HEADLESS)",
+        "    args = parser.parse_args()",
+        "",
+        "    driver = make_driver(args.browser, args.headless)",
+        "    try:",
+        "        jar = load_jar(HOST)",
+        "        if jar:",
+        "            inject_cookies(driver, BASE_URL + \"/\", jar[1])",
+        "        TESTS[args.test](driver)",
+        "        print(f\"✅ {args.test} finished\")",
+        "    finally:",
+        "        driver.quit()",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def print_report(report):
+    before, after = report["round_trips_before"], report["round_trips_after"]
+    print(f"📦 {report['test']}: {report['commands']} command(s) -> {report['steps']} step(s)")
+    for reason, count in sorted(report["dropped"].items(), key=lambda item: -item[1]):
+        print(f"   dropped {count:4} {reason}")
+    print("   locators: " + ", ".join(f"{k} {v}" for k, v in sorted(report["locators"].items(), key=lambda i: -i[1])))
+    if report["batches"]:
+        print(f"   batches: {len(report['batches'])} ({sum(report['batches'])} clicks)")
+    print(f"   round trips: {before} -> {after} (saved {before - after}, {(before - after) / max(before, 1):.0%})")
+
+
+def compile_side(side_path, out_path=None):
+    with open(side_path, encoding="utf-8") as fh:
+        side = json.load(fh)
+    compiled = [compile_test(test) for test in side["tests"]]
+    for _, _, report in compiled:
+        print_report(report)
+    if out_path:
+        with open(out_path, "w", encoding="utf-8") as fh:
+            fh.write(render_module(side, side_path, out_path, compiled))
+        print(f"💾 Wrote {out_path}")
+    return [report for _, _, report in compiled]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile a Selenium IDE .side recording into a Python flow")
+    parser.add_argument("side", nargs="?", default="Kuisioner Kinerja.side")
+    parser.add_argument("-o", "--out", help="module to write (default: only print the report)")
+    args = parser.parse_args()
+    compile_side(args.side, args.out)
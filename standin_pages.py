@@ -0,0 +1,359 @@
+"""
+HTML stand-ins for the portal pages the Selenium flows drive.
+Each page reproduces the DOM paths the flows locate elements by (the
+review-perilaku "Lakukan Review" list and rating rows, the peer-review
+kuesioner form > div rows, \\31 1435-... radio IDs and positif-{id}
+textareas, and the SIASN tampilanData filter, ant-table, usul form and
+confirmation modals) and talks to the stand-in JSON API with fetch(), so
+page_waits sees real requests. Served by standin_server.py.
+"""
+
+BASE_CSS = """
+body { font-family: sans-serif; margin: 0; }
+button, a, label, input, select, textarea { font-size: 14px; margin: 2px; }
+button { padding: 4px 10px; cursor: pointer; }
+.bg-green-700, [aria-pressed="true"] { background: #15803d; color: #fff; }
+.message { color: #b91c1c; }
+"""
+
+# Shared by every page: a tiny HTML escaper and the JSON fetch wrapper
+BASE_JS = """
+const esc = s => String(s).replace(/[&<>"']/g, c => ({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;"}[c]));
+async function api(path, method, body) {
+  const res = await fetch(path, {
+    method: method || "GET",
+    headers: body ? {"Content-Type": "application/json"} : {},
+    body: body ? JSON.stringify(body) : undefined,
+  });
+  const data = await res.json().catch(() => ({}));
+  return {ok: res.ok, status: res.status, data: data.data, message: data.message};
+}
+"""
+
+
+def html_page(title, body, script, css=""):
+    return f"""<!DOCTYPE html>
+<html lang="id">
+<head><meta charset="utf-8"><title>{title}</title><style>{BASE_CSS}{css}</style></head>
+<body>
+{body}
+<script>{BASE_JS}{script}</script>
+</body>
+</html>
+"""
+
+
+# kinerja.jabarprov.go.id/kinerjajabar/review-perilaku: the list of pending reviews,
+# and per review 7 indicator rows of 6 options matched by
+# .flex:nth-child(i) > .flex > .flex > .hidden > .bg-white:nth-child(6)
+REVIEW_BODY = """
+<div id="__nuxt" data-v-app=""><div class="page"><h1>Review Perilaku</h1><div id="app"></div></div></div>
+"""
+
+REVIEW_JS = """
+window.__NUXT__ = {};
+const LIST = "/api/kinerjajabar/review-perilaku";
+const app = document.getElementById("app");
+
+async function showList() {
+  const res = await api(LIST);
+  const reviews = res.data || [];
+  app.innerHTML = reviews.length
+    ? reviews.map((r, i) => `<div class="review-row"><span>${esc(r.nama)} (${esc(r.nip)})</span>
+        <a href="#" data-index="${i}">Lakukan Review</a></div>`).join("")
+    : "<p>Tidak ada pegawai yang perlu direview.</p>";
+  app.querySelectorAll("a[data-index]").forEach(a => a.addEventListener("click", e => {
+    e.preventDefault();
+    showForm(reviews[Number(a.dataset.index)]);
+  }));
+  window.$nuxt = window.$nuxt || {};
+}
+
+function showForm(review) {
+  const rows = review.indicators.map(ind => `<div class="flex indicator" data-id="${esc(ind.id)}">
+      <div class="flex"><div class="flex"><div class="hidden lg:flex">${ind.options.map(o =>
+        `<button type="button" class="bg-white option" aria-pressed="false" data-value="${o.value}">${esc(o.label)}</button>`
+      ).join("")}</div></div></div></div>`).join("");
+  app.innerHTML = `<h2>${esc(review.nama)}</h2><div class="indicators">${rows}</div>
+    <button type="button" class="button-green"><span>Simpan Review</span></button><p class="message"></p>`;
+  app.querySelectorAll(".option").forEach(button => button.addEventListener("click", () => {
+    button.parentElement.querySelectorAll(".option").forEach(o => o.setAttribute("aria-pressed", "false"));
+    button.setAttribute("aria-pressed", "true");
+  }));
+  app.querySelector(".button-green").addEventListener("click", async () => {
+    const answers = Array.from(app.querySelectorAll(".indicator"), ind => {
+      const chosen = ind.querySelector('.option[aria-pressed="true"]');
+      return chosen && {indicator_id: ind.dataset.id, value: Number(chosen.dataset.value)};
+    }).filter(Boolean);
+    const res = await api(`${LIST}/${encodeURIComponent(review.id)}`, "POST", {answers});
+    if (res.ok) { showList(); } else { app.querySelector(".message").textContent = res.message; }
+  });
+}
+
+showList();
+"""
+
+# kinerja.jabarprov.go.id/kuisioner-kinerja/peer-review: Kenal/Tidak rows, the score
+# grid, positif-{id} comments and the left/right pairs, with the Selanjutnya /
+# "Selesai dan Kirim" button at section > section > div.mt-8... > button:nth-child(2)
+KUESIONER_BODY = """
+<div id="__nuxt" data-v-app=""><div class="layout"><div class="main"><div class="page">
+  <section class="card">
+    <h1>Kuisioner Kinerja - Peer Review</h1>
+    <section class="kuesioner">
+      <div id="content"></div>
+      <div class="mt-8 lg:w-8/12 pr-2 flex justify-between" id="nav">
+        <button type="button" class="bg-white">Sebelumnya</button>
+        <button type="button" id="next" class="bg-green-700 text-white">Selanjutnya</button>
+      </div>
+    </section>
+  </section>
+</div></div></div></div>
+"""
+
+KUESIONER_CSS = """
+.grid.grid-cols-2 { display: grid; grid-template-columns: 1fr 1fr; gap: 24px; }
+.grid.grid-cols-2 > div { border: 1px solid #ccc; padding: 24px; cursor: pointer; }
+"""
+
+KUESIONER_JS = """
+window.__NUXT__ = {};
+const FORM = "/api/kuisioner-kinerja/peer-review";
+const content = document.getElementById("content");
+const nav = document.getElementById("nav");
+const next = document.getElementById("next");
+const UNSELECTED = "px-4 py-2 border bg-white text-gray-700";
+const SELECTED = "px-4 py-2 border bg-green-700 text-white";
+let form = null, stage = 0, pair = 0, nilai = [];
+const perkenalan = {}, komentar = {}, pilihan = [];
+
+function choiceButtons(pid, q, labels) {
+  return `<div><div class="choices">${labels.map(label =>
+    `<button type="button" class="${UNSELECTED}" aria-pressed="false" data-pid="${esc(pid)}" data-q="${q}" data-v="${label}">${label}</button>`
+  ).join("")}</div></div>`;
+}
+
+function renderPerkenalan() {
+  content.innerHTML = `<form>${form.pegawai.map(p => `<div class="row"><div>
+      <h6>${esc(p.nama)}</h6><p>Apakah Anda mengenal pegawai ini?</p>${choiceButtons(p.id, 0, ["Kenal", "Tidak Kenal"])}
+      <p>Apakah pegawai ini atasan langsung Anda?</p>${choiceButtons(p.id, 1, ["Ya", "Tidak"])}
+    </div></div>`).join("")}</form>`;
+  content.querySelectorAll("button[data-pid]").forEach(button => button.addEventListener("click", () => {
+    button.parentElement.querySelectorAll("button").forEach(b => { b.className = UNSELECTED; b.setAttribute("aria-pressed", "false"); });
+    button.className = SELECTED;
+    button.setAttribute("aria-pressed", "true");
+    (perkenalan[button.dataset.pid] = perkenalan[button.dataset.pid] || ["", ""])[Number(button.dataset.q)] = button.dataset.v;
+  }));
+}
+
+function renderNilai() {
+  const scale = (q, p) => Array.from({length: 10}, (_, i) => i + 1).map(s =>
+    `<label><input type="radio" id="${q.id}-${esc(p.id)}-${s}" name="${q.id}-${esc(p.id)}" value="${s}">${s}</label>`
+  ).join("");
+  content.innerHTML = `<form>${form.questions.map(q => `<div class="question">
+      <h5>${esc(q.teks)}</h5><div class="legend">1 = sangat kurang, 10 = sangat baik</div>
+      ${form.pegawai.map(p => `<div class="pegawai-row">
+        <div class="flex flex-col gap-4 items-center"><h6>${esc(p.nama)}</h6><span>${esc(p.id)}</span></div>
+        <div class="scale">${scale(q, p)}</div></div>`).join("")}
+    </div>`).join("")}</form>`;
+}
+
+function renderKomentar() {
+  content.innerHTML = `<form>${form.pegawai.map(p => `<div class="komentar">
+      <h6>${esc(p.nama)}</h6>
+      <textarea id="positif-${esc(p.id)}" placeholder="Hal positif"></textarea>
+      <textarea id="negatif-${esc(p.id)}" placeholder="Hal yang perlu ditingkatkan"></textarea>
+    </div>`).join("")}</form>`;
+  next.textContent = "Selesai dan Kirim";
+}
+
+function renderPair() {
+  if (pair >= form.pairs.length) { return submit(); }
+  const current = form.pairs[pair];
+  content.innerHTML = `<p>Pilih pegawai dengan kinerja lebih baik (${pair + 1}/${form.pairs.length})</p>
+    <div class="grid grid-cols-2 gap-6"><div data-pid="${esc(current.left.id)}">${esc(current.left.nama)}</div>
+    <div data-pid="${esc(current.right.id)}">${esc(current.right.nama)}</div></div>`;
+  content.querySelectorAll("[data-pid]").forEach(div => div.addEventListener("click", () => {
+    pilihan.push({pair_id: current.id, pilih: div.dataset.pid});
+    pair++;
+    renderPair();
+  }));
+}
+
+function readNilai() {
+  const cells = [];
+  for (const q of form.questions) {
+    for (const p of form.pegawai) {
+      const checked = document.querySelector(`input[name="${q.id}-${CSS.escape(p.id)}"]:checked`);
+      if (checked) { cells.push({question_id: q.id, pegawai_id: p.id, score: Number(checked.value)}); }
+    }
+  }
+  return cells;
+}
+
+async function submit() {
+  const res = await api(FORM, "POST", {
+    perkenalan: form.pegawai.filter(p => perkenalan[p.id]).map(p => ({pegawai_id: p.id, jawaban: perkenalan[p.id]})),
+    nilai,
+    komentar: Object.entries(komentar).map(([pegawai_id, positif]) => ({pegawai_id, positif})),
+    pilihan,
+  });
+  content.innerHTML = res.ok ? "<h2>Terima kasih, kuesioner sudah terkirim.</h2>" : `<p class="message">${esc(res.message)}</p>`;
+}
+
+next.addEventListener("click", () => {
+  if (stage === 0) { renderNilai(); }
+  else if (stage === 1) {
+    nilai = readNilai();  // the grid is gone once the comments page is shown
+    renderKomentar();
+  } else if (stage === 2) {
+    form.pegawai.forEach(p => {
+      const text = document.getElementById(`positif-${p.id}`).value.trim();
+      if (text) { komentar[p.id] = text; }
+    });
+    nav.hidden = true;
+    renderPair();
+  }
+  stage++;
+});
+
+api(FORM).then(res => {
+  form = res.data;
+  renderPerkenalan();
+  window.$nuxt = window.$nuxt || {};
+});
+"""
+
+# siasn-instansi.bkn.go.id/tampilanData: the filter dialog (noPeserta, Cari), the
+# ant-table result row, the usul form tab and the three confirmations, at the
+# //*[@id="__next"]/div/div[4]/... and /html/body/div[3]/... paths the flow uses
+USUL_BODY = """
+<div id="__next"><div class="app">
+  <div class="header">SIASN Instansi</div>
+  <div class="breadcrumb">Layanan Instansi / Tampilan Data</div>
+  <div class="banner"></div>
+  <div class="container">
+    <div class="title"><h1>Tampilan Data</h1></div>
+    <div class="toolbar"></div>
+    <div class="filter-area"><div>
+      <div class="filter" id="filter">
+        <div class="filter-label">Filter</div>
+        <div class="filter-panel" hidden><div>
+          <div class="field"><label for="noPeserta">No Peserta</label><input id="noPeserta" type="text"></div>
+          <div class="field"><label>Status</label><select><option>Semua</option></select></div>
+          <div class="field-actions"><button type="button" id="cari">Cari</button><button type="button" id="reset">Reset</button></div>
+        </div></div>
+      </div>
+    </div></div>
+    <div class="content">
+      <div class="ant-table-wrapper"><div><div><div><div><div>
+        <table><thead><tr><th></th><th>Nama</th><th>No Peserta</th></tr></thead><tbody id="rows"></tbody></table>
+      </div></div></div></div></div></div>
+      <div class="tab-panel" hidden><div><div><div><div>
+        <form id="usul-form"><div>
+          <div><div><input type="text" name="no_urut" placeholder="No Urut"></div></div>
+          <div><div><input type="text" name="nama" readonly></div></div>
+          <div><div><input type="date" name="tanggal"></div></div>
+          <div><div><select name="jenis"><option value="">Pilih jenis usul</option></select></div></div>
+        </div><button type="submit">Simpan</button></form>
+        <p class="message" id="form-message"></p>
+      </div></div></div></div></div>
+    </div>
+    <div class="actions"><div>
+      <button type="button" id="proses">Proses</button>
+      <button type="button">Simpan Draft</button>
+      <button type="button" id="kirim">Kirim Usul</button>
+    </div></div>
+    <nav><a href="#" data-tab="0">Pencarian</a> | <a href="#" data-tab="1">Form Usul</a></nav>
+  </div>
+</div></div>
+<div id="toast"></div>
+<div id="modal-root"></div>
+"""
+
+USUL_CSS = """
+.filter { position: relative; display: inline-block; border: 1px solid #ccc; padding: 6px 16px; cursor: pointer; }
+.filter-panel { position: absolute; top: 100%; left: 0; z-index: 10; background: #fff; border: 1px solid #ccc; padding: 12px; width: 360px; }
+#modal-root > div { position: fixed; inset: 0; background: rgba(0, 0, 0, .3); display: flex; align-items: center; justify-content: center; }
+#modal-root > div > div { background: #fff; padding: 24px; }
+"""
+
+USUL_JS = """
+const $ = s => document.querySelector(s);
+const panel = $(".filter-panel"), tabs = [$(".ant-table-wrapper"), $(".tab-panel")];
+const modalRoot = $("#modal-root"), usulForm = $("#usul-form");
+let selected = null, usulId = null;
+
+function showTab(i) { tabs.forEach((tab, k) => { tab.hidden = k !== i; }); }
+
+$("#filter").addEventListener("click", e => { if (!panel.contains(e.target)) { panel.hidden = false; } });
+document.querySelectorAll("nav a").forEach(a => a.addEventListener("click", e => {
+  e.preventDefault();
+  showTab(Number(a.dataset.tab));
+}));
+
+$("#cari").addEventListener("click", async () => {
+  const no = $("#noPeserta").value.trim();
+  panel.hidden = true;
+  showTab(0);
+  const res = await api(`/api/usul/peserta?noPeserta=${encodeURIComponent(no)}`);
+  const peserta = res.data || [];
+  $("#rows").innerHTML = peserta.map((p, i) => `<tr>
+      <td class="ant-table-cell ant-table-selection-column"><label><input type="checkbox" data-index="${i}"></label></td>
+      <td class="ant-table-cell">Peserta ${esc(p.noPeserta)}</td><td class="ant-table-cell">${esc(p.noPeserta)}</td></tr>`).join("");
+  $("#rows").querySelectorAll("input[type=checkbox]").forEach(box => box.addEventListener("change", () => {
+    selected = box.checked ? peserta[Number(box.dataset.index)] : null;
+  }));
+});
+
+$("#proses").addEventListener("click", () => {
+  if (!selected) { return; }
+  usulForm.reset();
+  usulForm.nama.value = `Peserta ${selected.noPeserta}`;
+  $("#form-message").textContent = "";
+});
+
+usulForm.addEventListener("submit", async e => {
+  e.preventDefault();
+  const res = await api("/api/usul", "POST", {
+    peserta_id: selected && selected.id, no_urut: usulForm.no_urut.value.trim(),
+    tanggal: usulForm.tanggal.value, jenis_id: usulForm.jenis.value,
+  });
+  usulId = res.ok ? res.data.id : null;
+  $("#form-message").textContent = res.ok ? "Usul tersimpan" : res.message;
+});
+
+function modal(html) { modalRoot.innerHTML = html; }
+
+$("#kirim").addEventListener("click", () => {
+  if (!usulId) { return; }
+  modal(`<div class="ant-modal-wrap"><div class="ant-modal-content">
+      <div class="ant-modal-header">Konfirmasi</div><div class="ant-modal-body">Kirim usul ini?</div>
+      <div class="ant-modal-footer"><button type="button" id="batal">Batal</button><button type="button" id="ya">Ya, kirim</button></div>
+    </div></div>`);
+  $("#batal").addEventListener("click", () => modal(""));
+  $("#ya").addEventListener("click", async () => {
+    const res = await api(`/api/usul/${encodeURIComponent(usulId)}/kirim`, "POST", {konfirmasi: true});
+    modal(`<div class="swal2-popup"><div class="swal2-icon">${res.ok ? "✓" : "!"}</div>
+        <div class="swal2-title">${res.ok ? "Usul berhasil dikirim" : esc(res.message)}</div>
+        <div class="swal2-actions"><button type="button" id="ok">OK</button><button type="button">Tutup</button></div></div>`);
+    $("#ok").addEventListener("click", () => {
+      modal("");
+      $("#rows").innerHTML = "";
+      selected = usulId = null;
+      showTab(0);
+    });
+  });
+});
+
+api("/api/usul/referensi").then(res => {
+  usulForm.jenis.insertAdjacentHTML("beforeend", (res.data || []).map(o =>
+    `<option value="${esc(o.id)}">${esc(o.nama)}</option>`).join(""));
+  window.next = window.next || {};
+});
+window.__NEXT_DATA__ = {};
+"""
+
+REVIEW_PAGE = html_page("Review Perilaku", REVIEW_BODY, REVIEW_JS)
+KUESIONER_PAGE = html_page("Kuisioner Kinerja", KUESIONER_BODY, KUESIONER_JS, KUESIONER_CSS)
+USUL_PAGE = html_page("Tampilan Data", USUL_BODY, USUL_JS, USUL_CSS)
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the portal JSON APIs used by the browserless backends.
+Serves the review-perilaku, peer-review kuesioner and SIASN usul endpoints
+with in-memory data so review_http.py, kuesioner_http.py and usul_http.py
+can be exercised without touching kinerja.jabarprov.go.id or
+siasn-instansi.bkn.go.id. The pages the Selenium flows drive are served too
+(standin_pages.py), on the same paths as the portals; see bench_flows.py.
+
+Usage:
+   python3 standin_server.py --port 8765 --reviews 40
+   python3 review_http.py --base-url http://127.0.0.1:8765
+   python3 kuesioner_http.py --base-url http://127.0.0.1:8765
+   python3 usul_http.py testUsul.csv --base-url http://127.0.0.1:8765
+
+From Python: server, base_url = start_standin(); ...; server.shutdown()
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from standin_pages import KUESIONER_PAGE, REVIEW_PAGE, USUL_PAGE
+
+INDICATORS_PER_REVIEW = 7
+OPTIONS_PER_INDICATOR = 6
+FIRST_QUESTION_ID = 1435
+
+
+class StandinState:
+    """In-memory data behind the stand-in endpoints"""
+
+    def __init__(self, reviews=5, pegawai=30, questions=10, pairs=20):
+        self.lock = threading.Lock()
+        self.reviews = {
+            str(1000 + i): {
+                "id": str(1000 + i),
+                "nama": f"Pegawai Review {i + 1}",
+                "nip": f"1990010120200{i:05d}",
+                "indicators": [
+                    {
+                        "id": f"ind-{n}",
+                        "options": [{"value": v, "label": f"Opsi {v}"} for v in range(1, OPTIONS_PER_INDICATOR + 1)],
+                    }
+                    for n in range(1, INDICATORS_PER_REVIEW + 1)
+                ],
+            }
+            for i in range(reviews)
+        }
+        self.submitted_reviews = {}
+
+        self.pegawai = [
+            {"id": f"19{80 + i % 20:02d}0101201001{i:04d}", "nama": f"Pegawai Kuesioner {i + 1}"}
+            for i in range(pegawai)
+        ]
+        self.questions = [
+            {"id": FIRST_QUESTION_ID + q, "teks": f"Pertanyaan {q + 1}"} for q in range(questions)
+        ]
+        self.pairs = [
+            {
+                "id": f"pair-{k + 1}",
+                "left": self.pegawai[k % pegawai],
+                "right": self.pegawai[(k + 1) % pegawai],
+            }
+            for k in range(pairs if pegawai > 1 else 0)
+        ]
+        self.kuesioner_submissions = []
+
+        # SIASN usul: any all-digit nomor peserta exists; each may be sent once
+        self.usul_options = [{"id": f"jenis-{n}", "nama": f"Jenis Usul {n}"} for n in range(1, 7)]
+        self.usul = {}
+        self.usul_sent = {}
+
+
+def list_reviews(state, match, query, body):
+    with state.lock:
+        pending = [r for rid, r in state.reviews.items() if rid not in state.submitted_reviews]
+    return 200, {"data": pending}
+
+
+def submit_review(state, match, query, body):
+    review_id = match.group("review_id")
+    with state.lock:
+        review = state.reviews.get(review_id)
+        if review is None:
+            return 404, {"message": "review not found"}
+        answers = (body or {}).get("answers") or []
+        expected = {ind["id"] for ind in review["indicators"]}
+        if {a.get("indicator_id") for a in answers} != expected:
+            return 422, {"message": "every indicator needs an answer"}
+        state.submitted_reviews[review_id] = answers
+    return 200, {"message": "ok"}
+
+
+def kuesioner_form(state, match, query, body):
+    return 200, {"data": {"questions": state.questions, "pegawai": state.pegawai, "pairs": state.pairs}}
+
+
+def submit_kuesioner(state, match, query, body):
+    body = body or {}
+    pegawai_ids = {p["id"] for p in state.pegawai}
+    if {a.get("pegawai_id") for a in body.get("perkenalan", [])} != pegawai_ids:
+        return 422, {"message": "perkenalan must cover every pegawai"}
+    cells = {(n.get("question_id"), n.get("pegawai_id")) for n in body.get("nilai", [])
+             if n.get("score") in range(1, 11)}
+    if cells != {(q["id"], p) for q in state.questions for p in pegawai_ids}:
+        return 422, {"message": "every question needs a valid score for every pegawai"}
+    chosen = {c.get("pair_id"): c.get("pilih") for c in body.get("pilihan", [])}
+    for pair in state.pairs:
+        if chosen.get(pair["id"]) not in (pair["left"]["id"], pair["right"]["id"]):
+            return 422, {"message": f"missing or invalid choice for {pair['id']}"}
+    with state.lock:
+        state.kuesioner_submissions.append(body)
+    return 200, {"message": "ok"}
+
+
+def search_peserta(state, match, query, body):
+    no_peserta = (query.get("noPeserta") or [""])[0]
+    if not no_peserta.isdigit():
+        return 200, {"data": []}
+    return 200, {"data": [{"id": f"peserta-{no_peserta}", "noPeserta": no_peserta}]}
+
+
+def usul_options(state, match, query, body):
+    return 200, {"data": state.usul_options}
+
+
+def create_usul(state, match, query, body):
+    body = body or {}
+    if not all(body.get(k) for k in ("peserta_id", "no_urut", "tanggal", "jenis_id")):
+        return 422, {"message": "peserta_id, no_urut, tanggal and jenis_id are required"}
+    if body["jenis_id"] not in {o["id"] for o in state.usul_options}:
+        return 422, {"message": "unknown jenis_id"}
+    with state.lock:
+        usul_id = f"usul-{len(state.usul) + 1}"
+        state.usul[usul_id] = body
+    return 201, {"data": {"id": usul_id}}
+
+
+def send_usul(state, match, query, body):
+    usul_id = match.group("usul_id")
+    with state.lock:
+        usul = state.usul.get(usul_id)
+        if usul is None:
+            return 404, {"message": "usul not found"}
+        key = (usul["no_urut"], usul["peserta_id"])
+        if key in state.usul_sent:
+            return 409, {"message": "usul already sent"}
+        state.usul_sent[key] = usul_id
+    return 200, {"message": "ok"}
+
+
+def page(html):
+    """Route handler serving a static stand-in page"""
+    return lambda state, match, query, body: (200, html)
+
+
+ROUTES = [
+    ("GET", re.compile(r"^/kinerjajabar/review-perilaku/?$"), page(REVIEW_PAGE)),
+    ("GET", re.compile(r"^/kuisioner-kinerja/peer-review/?$"), page(KUESIONER_PAGE)),
+    ("GET", re.compile(r"^/tampilanData/?$"), page(USUL_PAGE)),
+    ("GET", re.compile(r"^/api/kinerjajabar/review-perilaku$"), list_reviews),
+    ("POST", re.compile(r"^/api/kinerjajabar/review-perilaku/(?P<review_id>[^/]+)$"), submit_review),
+    ("GET", re.compile(r"^/api/kuisioner-kinerja/peer-review$"), kuesioner_form),
+    ("POST", re.compile(r"^/api/kuisioner-kinerja/peer-review$"), submit_kuesioner),
+    ("GET", re.compile(r"^/api/usul/peserta$"), search_peserta),
+    ("GET", re.compile(r"^/api/usul/referensi$"), usul_options),
+    ("POST", re.compile(r"^/api/usul$"), create_usul),
+    ("POST", re.compile(r"^/api/usul/(?P<usul_id>[^/]+)/kirim$"), send_usul),
+]
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    state = None
+    latency = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, obj):
+        # Pages are served as HTML, everything else as JSON
+        if isinstance(obj, str):
+            body, content_type = obj.encode("utf-8"), "text/html; charset=utf-8"
+        else:
+            body, content_type = json.dumps(obj).encode("utf-8"), "application/json"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _dispatch(self, method):
+        if self.latency:
+            time.sleep(self.latency)  # simulated network/server latency
+        parsed = urllib.parse.urlsplit(self.path)
+        query = urllib.parse.parse_qs(parsed.query)
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            body = json.loads(raw) if raw else None
+        except ValueError:
+            return self._send_json(400, {"message": "invalid JSON"})
+
+        for route_method, pattern, handler in ROUTES:
+            match = pattern.match(parsed.path)
+            if match and route_method == method:
+                # Any saved session cookie counts as logged in
+                if not self.headers.get("Cookie"):
+                    return self._send_json(401, {"message": "unauthenticated"})
+                status, obj = handler(self.state, match, query, body)
+                return self._send_json(status, obj)
+        self._send_json(404, {"message": "not found"})
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+
+def start_standin(port=0, state=None, latency=0.0):
+    """Start the stand-in in a background thread, return (server, base_url)"""
+    handler = type("Handler", (StandinHandler,), {
+        "state": state or StandinState(),
+        "latency": latency,
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.state = handler.state
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the portal JSON APIs")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--reviews", type=int, default=5, help="pending review-perilaku reviews")
+    parser.add_argument("--pegawai", type=int, default=30, help="colleagues on the peer-review kuesioner")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    args = parser.parse_args()
+
+    server, base_url = start_standin(args.port, StandinState(reviews=args.reviews, pegawai=args.pegawai), args.latency)
+    print(f"🧪 Stand-in portal API running at {base_url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,147 @@
+"""
+Per-step timings for the usul pipeline.
+Every record passes through the numbered steps of the usul form (noPeserta,
+Cari, result row, proceed, tab, no_urut, date, select, submit, the three
+confirmations and re-opening the filter). StepMetrics times each step as a
+lap from the previous one and streams one JSON line per step and per record
+total to testUsul_log_metrics.jsonl; print_summary() shows p50/p95/max per
+step at the end of the run.
+
+   python3 step_metrics.py testUsul_log_metrics.jsonl   # table for an earlier run
+"""
+
+import json
+import math
+import os
+import time
+from datetime import datetime
+
+from run_journal import RunJournal
+
+# Step names as the usul log writes them ("Step 3: ...") -> what the step does
+STEP_LABELS = {
+    "Step 1": "noPeserta",
+    "Step 2": "Cari",
+    "Step 3": "result row + checkbox",
+    "Step 4": "proceed",
+    "Step 5": "tab",
+    "Step 6": "no_urut",
+    "Step 7": "date",
+    "Step 8": "select",
+    "Step 9": "submit",
+    "Step 10": "confirm + send",
+    "Step 10.1": "confirm 1",
+    "Step 10.2": "confirm 2",
+    "Step 10.3": "confirm 3",
+    "Step 10.4": "filter reopen",
+}
+RECORD_STEP = "record"
+
+
+def metrics_path_for(log_path):
+    """testUsul_log.csv -> testUsul_log_metrics.jsonl"""
+    return os.path.splitext(log_path)[0] + "_metrics.jsonl"
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def _step_order(step):
+    if step == RECORD_STEP:
+        return (1, ())
+    return (0, tuple(int(n) for n in step.split()[-1].split(".") if n.isdigit()))
+
+
+def print_step_table(events):
+    """p50/p95/max per step (and per record) for a list of metric events"""
+    per_step = {}
+    failed = {}
+    for event in events:
+        per_step.setdefault(event["step"], []).append(event["seconds"])
+        if not event.get("ok", True):
+            failed[event["step"]] = failed.get(event["step"], 0) + 1
+    if not per_step:
+        return
+    print(f"\n⏱️  Step timings (s) over {len(per_step.get(RECORD_STEP, []))} record(s)")
+    print(f"   {'step':34} {'n':>5} {'p50':>7} {'p95':>7} {'max':>7} {'failed':>6}")
+    for step in sorted(per_step, key=_step_order):
+        values = per_step[step]
+        name = f"{step} {STEP_LABELS[step]}" if step in STEP_LABELS else step
+        if step == RECORD_STEP:
+            name = "per record (total)"
+        print(f"   {name:34} {len(values):5} {percentile(values, 50):7.3f} {percentile(values, 95):7.3f} "
+              f"{max(values):7.3f} {failed.get(step, 0):6}")
+
+
+def read_metrics(path):
+    """Metric events of a metrics file; a line cut short by a crash is skipped"""
+    events = []
+    if not os.path.exists(path):
+        return events
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue
+    return events
+
+
+class StepMetrics:
+    """Lap timer for the steps of one record at a time, streamed to a JSONL file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.journal = RunJournal(None, path)
+        self.events = []
+        self.record = None
+        self.record_started = self.lap_started = time.perf_counter()
+
+    def _emit(self, step, seconds, ok):
+        event = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "record": self.record,
+            "step": step,
+            "seconds": round(seconds, 3),
+            "ok": ok,
+        }
+        self.events.append(event)
+        self.journal.write(event)
+
+    def start_record(self, record):
+        self.record = record
+        self.record_started = self.lap_started = time.perf_counter()
+
+    def lap(self, step, ok=True):
+        """Record the time since the previous lap (or the record start) as step"""
+        if self.record is None:
+            return
+        now = time.perf_counter()
+        self._emit(step, now - self.lap_started, ok)
+        self.lap_started = now
+
+    def end_record(self, ok=True, failed_step=None):
+        """Close the current record; failed_step gets the time spent since the last lap"""
+        if self.record is None:
+            return
+        if failed_step:
+            self.lap(failed_step, ok=False)
+        self._emit(RECORD_STEP, time.perf_counter() - self.record_started, ok)
+        self.record = None
+
+    def print_summary(self):
+        print_step_table(self.events)
+
+    def close(self):
+        self.journal.close()
+
+
+if __name__ == "__main__":
+    import sys
+
+    from usul_records import USUL_LOG
+
+    print_step_table(read_metrics(sys.argv[1] if len(sys.argv) > 1 else metrics_path_for(USUL_LOG)))
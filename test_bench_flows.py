@@ -0,0 +1,26 @@
+import os
+
+from bench_flows import count_records, write_inputs
+from peer_review_page import HIGH_SCORE, SCORES_FILE, load_pegawai_scores
+from standin_server import StandinState
+from usul_records import USUL_CSV, UsulCsvReader
+
+
+def test_inputs_are_what_the_flows_read(tmp_path):
+    state = StandinState(reviews=2, pegawai=6)
+    write_inputs(str(tmp_path), state, usul_rows=4)
+    scores = load_pegawai_scores(os.path.join(tmp_path, SCORES_FILE))
+    assert [scores[n]["name"] for n in sorted(scores)] == [p["nama"] for p in state.pegawai]
+    assert [n for n in sorted(scores) if scores[n]["score"] == HIGH_SCORE] == [3, 6]
+    reader = UsulCsvReader(os.path.join(tmp_path, USUL_CSV), reject_path=str(tmp_path / "rejects.csv"))
+    assert [row["no_urut"] for row in reader] == ["1", "2", "3", "4"]
+    assert reader.rejected == 0
+
+
+def test_records_are_what_the_standin_accepted():
+    state = StandinState(reviews=3, pegawai=5)
+    assert [count_records(state, name) for name in ("review", "kuesioner", "usul")] == [0, 0, 0]
+    state.submitted_reviews["1000"] = {}
+    state.kuesioner_submissions.append({})
+    state.usul_sent[("1", "2025")] = "u-1"
+    assert [count_records(state, name) for name in ("review", "kuesioner", "usul")] == [1, 5, 1]
@@ -0,0 +1,127 @@
+from selenium.common.exceptions import WebDriverException
+
+from browser_pool import BrowserPool, for_target, inject_cookies
+
+JAR = [
+    {"name": "auth._token.local", "value": "Bearer%20t", "domain": "kinerja.jabarprov.go.id", "path": "/",
+     "secure": True, "sameSite": "None"},
+    {"name": "SESSION", "value": "s", "domain": ".jabarprov.go.id", "secure": True, "sameSite": "Lax"},
+]
+
+
+class FakeDriver:
+    """Records the CDP calls, cookies and page loads of inject_cookies"""
+
+    def __init__(self):
+        self.cdp_calls = []
+        self.cookies = []
+        self.visited = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp_calls.append((cmd, params))
+
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+
+    def get(self, url):
+        self.visited.append(url)
+
+
+class NoCdpDriver(FakeDriver):
+    """Network.setCookies fails, so the bootstrap page is used"""
+
+    def execute_cdp_cmd(self, cmd, params):
+        raise WebDriverException("not supported")
+
+
+def test_cookies_on_their_own_domain_are_unchanged():
+    for url in ("https://kinerja.jabarprov.go.id/kinerjajabar/review-perilaku", "https://jabarprov.go.id/"):
+        assert for_target(JAR[1], url) is JAR[1]
+    assert for_target(JAR[0], "https://kinerja.jabarprov.go.id/") is JAR[0]
+
+
+def test_cookies_for_another_host_become_host_only():
+    cookie = for_target(JAR[0], "http://127.0.0.1:8765/kinerjajabar/review-perilaku")
+    assert "domain" not in cookie
+    assert cookie["secure"] is False
+    assert "sameSite" not in cookie
+    assert for_target(JAR[1], "https://replay.test/")["secure"] is True
+
+
+def test_cdp_injection_targets_the_stand_in_host():
+    driver = FakeDriver()
+    url = "http://127.0.0.1:8765/kinerjajabar/review-perilaku"
+    assert inject_cookies(driver, url, JAR) == "cdp"
+    [(cmd, params)] = driver.cdp_calls
+    assert cmd == "Network.setCookies"
+    assert [c.get("domain") for c in params["cookies"]] == [None, None]
+    assert {c["url"] for c in params["cookies"]} == {url}
+    assert driver.visited == [url]
+
+
+def test_bootstrap_injection_leaves_the_domain_to_the_current_page():
+    driver = NoCdpDriver()
+    url = "http://127.0.0.1:8765/tampilanData"
+    assert inject_cookies(driver, url, JAR) == "bootstrap"
+    assert driver.visited == ["http://127.0.0.1:8765/favicon.ico", url]
+    assert all("domain" not in c for c in driver.cookies)
+
+
+class FakeSwitch:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def new_window(self, kind):
+        self.driver.opened += 1
+        handle = f"tab-{self.driver.opened}"
+        self.driver.window_handles.append(handle)
+        self.driver.current_window_handle = handle
+
+    def window(self, handle):
+        self.driver.current_window_handle = handle
+
+
+class TabDriver:
+    """A browser with one window that opens and closes tabs"""
+
+    def __init__(self):
+        self.window_handles = ["base"]
+        self.current_window_handle = "base"
+        self.opened = 0
+        self.quits = 0
+        self.switch_to = FakeSwitch(self)
+
+    def close(self):
+        self.window_handles.remove(self.current_window_handle)
+
+    def quit(self):
+        self.quits += 1
+
+
+def test_pool_launches_once_and_closes_each_tab():
+    drivers, prepared = [], []
+    pool = BrowserPool(driver_factory=lambda: drivers.append(TabDriver()) or drivers[-1],
+                       tab_setup=lambda driver, verbose: prepared.append(driver.current_window_handle))
+    for _ in range(2):
+        with pool.tab() as driver:
+            assert driver.current_window_handle != "base"
+    assert len(drivers) == 1
+    assert prepared == ["tab-1", "tab-2"]
+    assert driver.window_handles == ["base"]
+    assert driver.current_window_handle == "base"
+
+
+def test_tab_is_closed_when_the_flow_fails_and_quit_forgets_warm_domains():
+    driver = TabDriver()
+    pool = BrowserPool(driver_factory=lambda: driver, tab_setup=None)
+    try:
+        with pool.tab():
+            pool.mark_warm("https://kinerja.jabarprov.go.id/kinerjajabar/review-perilaku")
+            raise RuntimeError("flow failed")
+    except RuntimeError:
+        pass
+    assert driver.window_handles == ["base"]
+    assert pool.is_warm("https://kinerja.jabarprov.go.id/")
+    pool.quit()
+    assert driver.quits == 1
+    assert not pool.is_warm("https://kinerja.jabarprov.go.id/")
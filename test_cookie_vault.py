@@ -0,0 +1,95 @@
+import os
+import pickle
+import time
+
+from cookie_vault import (
+    EXPIRY_MARGIN, KINERJA_HOST, CookieVault, candidate_accounts, is_stale, jar_expiry, load_jar,
+)
+
+HOUR = 3600
+
+
+def auth_cookie(value="token", expires_in=HOUR):
+    return {"name": "auth._token.local", "value": value, "expiry": time.time() + expires_in}
+
+
+def test_jar_expiry_ignores_analytics_and_csrf_cookies():
+    now = time.time()
+    jar = [
+        {"name": "_ga", "value": "x", "expiry": now + 30},
+        {"name": "XSRF-TOKEN", "value": "x", "expiry": now + 10},
+        {"name": "auth._token.local", "value": "t", "expiry": now + HOUR},
+    ]
+    assert jar_expiry(jar) == now + HOUR
+    assert jar_expiry(jar[:2]) is None
+
+
+def test_jar_expiry_reads_the_nuxt_token_expiration():
+    now = time.time()
+    jar = [auth_cookie(expires_in=2 * HOUR),
+           {"name": "auth._token_expiration.local", "value": str((now + HOUR) * 1000)}]
+    assert abs(jar_expiry(jar) - (now + HOUR)) < 1
+
+
+def test_is_stale_applies_the_margin():
+    now = time.time()
+    assert is_stale(now + EXPIRY_MARGIN - 1, now)
+    assert not is_stale(now + EXPIRY_MARGIN + 1, now)
+    assert not is_stale(None, now)
+
+
+def test_candidate_accounts_follow_the_legacy_file_order():
+    assert candidate_accounts(None, ["peer_review_cookies.pkl", "cookies.pkl"]) == ["peer_review", "default"]
+    assert candidate_accounts(None, ["siasn_cookies.pkl"]) == ["default"]
+    assert candidate_accounts("ani", ["cookies.pkl"]) == ["ani"]
+
+
+def test_load_jar_never_picks_another_account(tmp_path):
+    vault = CookieVault(str(tmp_path / "vault.sqlite3"))
+    vault.put(KINERJA_HOST, "default", [auth_cookie("mine")])
+    vault.put(KINERJA_HOST, "colleague", [auth_cookie("theirs")])  # saved last
+    account, cookies = load_jar(KINERJA_HOST, vault=vault)
+    assert account == "default"
+    assert cookies[0]["value"] == "mine"
+
+
+def test_load_jar_refuses_to_guess_without_an_own_jar(tmp_path, capsys):
+    vault = CookieVault(str(tmp_path / "vault.sqlite3"))
+    vault.put(KINERJA_HOST, "ani", [auth_cookie()])
+    vault.put(KINERJA_HOST, "budi", [auth_cookie()])
+    assert load_jar(KINERJA_HOST, vault=vault) is None
+    assert "Not guessing" in capsys.readouterr().out
+    assert load_jar(KINERJA_HOST, "budi", vault=vault)[0] == "budi"
+
+
+def test_load_jar_prefers_peer_review_cookies_for_the_kuesioner(tmp_path):
+    vault = CookieVault(str(tmp_path / "vault.sqlite3"))
+    vault.put(KINERJA_HOST, "default", [auth_cookie("regular")])
+    vault.put(KINERJA_HOST, "peer_review", [auth_cookie("peer")])
+    files = ["peer_review_cookies.pkl", "cookies.pkl"]
+    assert load_jar(KINERJA_HOST, legacy_files=files, vault=vault)[0] == "peer_review"
+    vault.put(KINERJA_HOST, "peer_review", [auth_cookie("peer", expires_in=-HOUR)])
+    assert load_jar(KINERJA_HOST, legacy_files=files, vault=vault)[0] == "default"
+
+
+def test_load_jar_skips_expired_jars(tmp_path):
+    vault = CookieVault(str(tmp_path / "vault.sqlite3"))
+    vault.put(KINERJA_HOST, "default", [auth_cookie(expires_in=EXPIRY_MARGIN // 2)])
+    assert load_jar(KINERJA_HOST, vault=vault) is None
+
+
+def test_load_jar_imports_newer_legacy_pickles(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    vault = CookieVault(str(tmp_path / "vault.sqlite3"))
+    vault.put(KINERJA_HOST, "default", [auth_cookie("old")])
+    with open("cookies.pkl", "wb") as fh:
+        pickle.dump([auth_cookie("new")], fh)
+    future = time.time() + 10
+    os.utime("cookies.pkl", (future, future))
+
+    account, cookies = load_jar(KINERJA_HOST, legacy_files=["cookies.pkl"], vault=vault)
+    assert (account, cookies[0]["value"]) == ("default", "new")
+    # Not imported again while the vault copy is newer
+    vault.put(KINERJA_HOST, "default", [auth_cookie("newest")])
+    os.utime("cookies.pkl", (0, 0))
+    assert load_jar(KINERJA_HOST, legacy_files=["cookies.pkl"], vault=vault)[1][0]["value"] == "newest"
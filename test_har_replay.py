@@ -0,0 +1,46 @@
+import json
+import urllib.parse
+import urllib.request
+
+from har_replay import HarReplay
+
+
+def entry(url, text, headers=()):
+    return {
+        "request": {"method": "GET", "url": url},
+        "response": {"status": 200, "headers": [{"name": n, "value": v} for n, v in headers],
+                     "content": {"mimeType": "text/html", "text": text}},
+    }
+
+
+def write_har(path, entries):
+    path.write_text(json.dumps({"log": {"entries": entries}}), encoding="utf-8")
+    return str(path)
+
+
+def test_each_host_gets_its_own_address_and_responses_repeat_in_order(tmp_path, capsys):
+    har = write_har(tmp_path / "run.har", [
+        entry("https://kinerja.jabarprov.go.id/kinerjajabar/review-perilaku", "first",
+              [("Set-Cookie", "auth._token.local=t; Domain=.jabarprov.go.id; Secure; SameSite=None")]),
+        entry("https://kinerja.jabarprov.go.id/kinerjajabar/review-perilaku", "second"),
+        entry("https://siasn-instansi.bkn.go.id/tampilanData", '<a href="https://kinerja.jabarprov.go.id/x">'),
+    ])
+    replay = HarReplay(har)
+    try:
+        base_urls = replay.start()
+        kinerja, siasn = base_urls["kinerja.jabarprov.go.id"], base_urls["siasn-instansi.bkn.go.id"]
+        # Cookies are kept per host name, so the hosts must differ by more than the port
+        if "differ by port only" not in capsys.readouterr().out:  # 127.0.0.2 exists (not macOS)
+            assert urllib.parse.urlsplit(kinerja).hostname != urllib.parse.urlsplit(siasn).hostname
+
+        with urllib.request.urlopen(kinerja + "/kinerjajabar/review-perilaku") as resp:
+            assert resp.read() == b"first"
+            assert resp.headers["Set-Cookie"] == "auth._token.local=t; SameSite=Lax"
+        for _ in range(2):  # the last recorded response repeats
+            with urllib.request.urlopen(kinerja + "/kinerjajabar/review-perilaku") as resp:
+                assert resp.read() == b"second"
+        with urllib.request.urlopen(siasn + "/tampilanData") as resp:
+            assert resp.read().decode() == f'<a href="{kinerja}/x">'
+        assert replay.served == 4
+    finally:
+        replay.shutdown()
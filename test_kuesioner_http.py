@@ -0,0 +1,63 @@
+import pytest
+
+from kinerja_http import HttpBackendError, HttpSession
+from kuesioner_http import DEFAULT_SCORE, run_kuesioner_http
+from peer_review_page import positive_comment
+from standin_server import StandinState
+
+COOKIES = [{"name": "auth._token.local", "value": "Bearer%20standin"}]
+
+
+def write_scores(path, scores):
+    """pegawai_scores.txt lines "1. Name: 8" for {number: (name, score)}"""
+    path.write_text("".join(f"{num}. {name}: {score}\n" for num, (name, score) in scores.items()),
+                    encoding="utf-8")
+    return str(path)
+
+
+def test_scores_and_yes_no_answers_reach_the_portal(standin, tmp_path):
+    state = StandinState(pegawai=4, questions=3, pairs=5)
+    server, base_url = standin(state)
+    scores = write_scores(tmp_path / "scores.txt", {
+        1: ("Pegawai Kuesioner 1", 10),
+        2: ("Pegawai Kuesioner 2", 7),
+        3: ("Pegawai Kuesioner 3", 9),
+    })  # pegawai 4 has no score
+
+    run_kuesioner_http(HttpSession(COOKIES, base_url), scores)
+
+    [sent] = state.kuesioner_submissions
+    ids = [p["id"] for p in state.pegawai]
+    assert sent["perkenalan"] == [{"pegawai_id": i, "jawaban": ["Kenal", "Tidak"]} for i in ids]
+    expected = dict(zip(ids, [10, 7, 9, DEFAULT_SCORE]))
+    assert {(n["question_id"], n["pegawai_id"]): n["score"] for n in sent["nilai"]} == {
+        (q["id"], i): expected[i] for q in state.questions for i in ids
+    }
+    assert sent["komentar"] == [
+        {"pegawai_id": ids[0], "positif": positive_comment("Pegawai Kuesioner 1")},
+        {"pegawai_id": ids[2], "positif": positive_comment("Pegawai Kuesioner 3")},
+    ]
+    assert [c["pair_id"] for c in sent["pilihan"]] == [p["id"] for p in state.pairs]
+
+
+def test_a_roster_mismatch_sends_nothing(standin, tmp_path):
+    state = StandinState(pegawai=3)
+    server, base_url = standin(state)
+    scores = write_scores(tmp_path / "scores.txt", {1: ("Pegawai Kuesioner 1", 8), 2: ("Someone Else", 8)})
+    with pytest.raises(HttpBackendError, match="Someone Else"):
+        run_kuesioner_http(HttpSession(COOKIES, base_url), scores)
+    assert state.kuesioner_submissions == []
+
+
+def test_a_missing_scores_file_is_reported_before_any_request(standin, tmp_path):
+    server, base_url = standin(StandinState())
+    with pytest.raises(HttpBackendError, match="browser flow first"):
+        run_kuesioner_http(HttpSession(COOKIES, base_url), str(tmp_path / "missing.txt"))
+
+
+def test_the_portal_rejects_a_session_without_cookies(standin, tmp_path):
+    server, base_url = standin(StandinState())
+    scores = write_scores(tmp_path / "scores.txt", {1: ("Pegawai Kuesioner 1", 8)})
+    with pytest.raises(HttpBackendError) as failure:
+        run_kuesioner_http(HttpSession([], base_url), scores)
+    assert failure.value.status == 401
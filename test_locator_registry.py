@@ -0,0 +1,45 @@
+from selenium.webdriver.common.by import By
+
+from locator_registry import DEMOTE_AFTER, LocatorRegistry
+
+ID = (By.ID, "username")
+NAME = (By.NAME, "username")
+CSS = (By.CSS_SELECTOR, "input[type=text]")
+CANDIDATES = [ID, NAME, CSS]
+
+
+def test_unknown_element_keeps_the_code_order(tmp_path):
+    registry = LocatorRegistry(str(tmp_path / "registry.sqlite3"))
+    assert registry.ordered("login username", CANDIDATES) == CANDIDATES
+
+
+def test_the_last_winner_comes_first(tmp_path):
+    registry = LocatorRegistry(str(tmp_path / "registry.sqlite3"))
+    registry.record("login username", CSS, missed=[ID, NAME])
+    assert registry.ordered("login username", CANDIDATES)[0] == CSS
+    registry.record("login username", NAME)
+    assert registry.ordered("login username", CANDIDATES)[0] == NAME
+    # Other elements learn nothing from it
+    assert registry.ordered("selanjutnya", CANDIDATES) == CANDIDATES
+
+
+def test_repeated_misses_demote_and_a_hit_restores(tmp_path):
+    registry = LocatorRegistry(str(tmp_path / "registry.sqlite3"))
+    for _ in range(DEMOTE_AFTER):
+        registry.record("login username", NAME, missed=[ID])
+    # ID is tried last; one hit clears its streak and, as the latest winner, puts it first
+    assert registry.ordered("login username", CANDIDATES) == [NAME, CSS, ID]
+    registry.record("login username", ID)
+    assert registry.ordered("login username", CANDIDATES) == [ID, NAME, CSS]
+
+
+def test_report_counts_and_reset(tmp_path):
+    registry = LocatorRegistry(str(tmp_path / "registry.sqlite3"))
+    registry.record("login username", NAME, missed=[ID])
+    registry.record("login username", NAME, missed=[ID])
+    assert registry.report() == [
+        ("login username", "name=username", 2, 0, 0),
+        ("login username", "id=username", 0, 2, 2),
+    ]
+    registry.reset()
+    assert registry.report() == []
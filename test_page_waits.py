@@ -0,0 +1,37 @@
+from selenium.webdriver.common.by import By
+
+import page_waits
+from page_waits import _query, wait_for_dom_quiet
+
+
+class FakeDriver:
+    """Answers the probe script with a page that is already quiet"""
+
+    def execute_script(self, script, *args):
+        return {"hydrated": True, "inflight": 0, "network_idle_ms": 10000, "dom_quiet_ms": 10000}
+
+
+def test_link_text_quotes_become_xpath_literals():
+    assert _query((By.LINK_TEXT, "Simpan")) == ["xpath", '//a[normalize-space(.)="Simpan"]']
+    assert _query((By.LINK_TEXT, 'Klik "Simpan"')) == ["xpath", """//a[normalize-space(.)='Klik "Simpan"']"""]
+    assert _query((By.PARTIAL_LINK_TEXT, """Jum'at "libur\"""")) == [
+        "xpath", """//a[contains(., concat("Jum'at ", '"', "libur", '"', ""))]""",
+    ]
+
+
+def test_attribute_locators_are_escaped_css():
+    assert _query((By.ID, 'a"b')) == ["css", '[id="a\\"b"]']
+    assert _query((By.CLASS_NAME, "btn")) == ["css", '[class~="btn"]']
+
+
+def test_a_failing_wait_hook_does_not_break_the_wait(monkeypatch, capsys):
+    calls = []
+
+    def broken_hook(driver):
+        raise RuntimeError("performance log gone")
+
+    monkeypatch.setattr(page_waits, "WAIT_HOOKS", [broken_hook, calls.append])
+    driver = FakeDriver()
+    assert wait_for_dom_quiet(driver, timeout=1) is True
+    assert calls == [driver]
+    assert "Wait hook broken_hook failed: performance log gone" in capsys.readouterr().out
@@ -0,0 +1,35 @@
+from peer_review_page import parse_html, parse_roster
+
+
+def roster_page(*headings):
+    """Second-page form with one pegawai row per h6 heading (rows start at div:nth-child(3))"""
+    rows = "".join(
+        f'<div><div class="flex flex-col gap-4 items-center"><h6>{heading}</h6></div>'
+        f'<input type="radio" id="1-{pegawai_id}-8"></div>'
+        for pegawai_id, heading in enumerate(headings, start=100)
+    )
+    return f"<form><div><div>Header</div><div>Legend</div>{rows}</div></form>"
+
+
+def test_text_content_keeps_inline_markup_in_document_order():
+    heading = parse_html("<h6>Ani <span>Dr.</span> Susanti, S.T.</h6>").find(lambda n: n.tag == "h6")
+    assert heading.text_content() == "Ani Dr. Susanti, S.T."
+
+
+def test_text_content_separates_br_and_block_tags():
+    root = parse_html("<h6>Budi<br>Santoso</h6><div>Citra<p>Dewi</p>Lestari</div>")
+    assert root.find(lambda n: n.tag == "h6").text_content() == "Budi Santoso"
+    assert root.find(lambda n: n.tag == "div").text_content() == "Citra Dewi Lestari"
+
+
+def test_text_content_joins_inline_tags_without_spaces():
+    root = parse_html("<h6>Ani<b>ta</b> Rahma<i>wati</i></h6>")
+    assert root.text_content() == "Anita Rahmawati"
+
+
+def test_parse_roster_names_with_inline_markup_and_br():
+    roster = parse_roster(roster_page("Ani <span>Dr.</span> Susanti, S.T.", "Budi<br>Santoso"))
+    assert roster == [
+        {"name": "Ani Dr. Susanti, S.T.", "id": "100", "index": 3},
+        {"name": "Budi Santoso", "id": "101", "index": 4},
+    ]
@@ -0,0 +1,53 @@
+from request_blocking import BlockReport, blocked_patterns, category_of, url_matches
+
+PATTERNS = blocked_patterns(["image", "analytics"], extra=[])
+LOGO = "https://kinerja.jabarprov.go.id/_nuxt/img/logo.png?v=3"
+GA = "https://www.google-analytics.com/analytics.js"
+
+
+def request(request_id, url):
+    return {"method": "Network.requestWillBeSent", "params": {"requestId": request_id, "request": {"url": url}}}
+
+
+def finished(request_id, size):
+    return {"method": "Network.loadingFinished", "params": {"requestId": request_id, "encodedDataLength": size}}
+
+
+def blocked(request_id):
+    return {"method": "Network.loadingFailed", "params": {"requestId": request_id, "blockedReason": "inspector"}}
+
+
+def test_patterns_treat_question_marks_and_brackets_literally():
+    assert url_matches(LOGO, "*.png?*")
+    assert not url_matches("https://host/logo.pngx", "*.png?*")
+    assert not url_matches("https://host/a.png", "*[.]png")
+    assert category_of(GA, PATTERNS) == "analytics"
+    assert category_of("https://host/app.js", PATTERNS) == "custom"
+
+
+def test_an_unblocked_run_records_the_baseline_sizes(tmp_path, capsys):
+    report = BlockReport(PATTERNS, str(tmp_path / "sizes.json"))
+    report.record(None, [request("1", LOGO), request("2", "https://host/app.js"), request("3", GA),
+                         finished("1", 2048), finished("2", 99999), finished("3", 1024)])
+    report.print_summary(record_sizes=True)
+    assert report.load_sizes() == {LOGO: 2048, GA: 1024}
+    assert "Recorded the size of 2 blockable asset(s)" in capsys.readouterr().out
+
+
+def test_a_blocked_run_estimates_from_the_baseline_only(tmp_path, capsys):
+    sizes_path = str(tmp_path / "sizes.json")
+    report = BlockReport(PATTERNS, sizes_path)
+    report.print_summary()
+    assert capsys.readouterr().out == ""  # nothing blocked, nothing to say
+
+    report.record(None, [request("1", LOGO), blocked("1"), request("2", LOGO), blocked("2"), request("3", GA),
+                         blocked("3")])
+    report.print_summary()
+    assert "no size baseline" in capsys.readouterr().out
+
+    baseline = BlockReport(PATTERNS, sizes_path)
+    baseline.sizes = {LOGO: 4096}
+    baseline.save_sizes()
+    report.print_summary()
+    out = capsys.readouterr().out
+    assert "Blocked 3 request(s), ~8 KiB saved (1/2 blocked URL(s) sized" in out
@@ -0,0 +1,87 @@
+import pytest
+
+from kinerja_http import HttpBackendError, HttpSession
+from review_http import REVIEW_LIST_PATH, build_answers, run_review_http
+from standin_server import OPTIONS_PER_INDICATOR, StandinState
+
+COOKIES = [{"name": "auth._token.local", "value": "Bearer%20standin"}]
+
+
+class RecordingSession(HttpSession):
+    """HttpSession that remembers every POST path"""
+
+    def __init__(self, base_url):
+        super().__init__(COOKIES, base_url)
+        self.posted = []
+
+    def post_json(self, path, payload):
+        self.posted.append(path)
+        return super().post_json(path, payload)
+
+
+class StaleListSession(RecordingSession):
+    """Keeps answering the review list with the first listing, like a stale cache"""
+
+    first_listing = None
+
+    def get_json(self, path):
+        if path == REVIEW_LIST_PATH:
+            if self.first_listing is None:
+                self.first_listing = super().get_json(path)
+            return self.first_listing
+        return super().get_json(path)
+
+
+def indicator(n, values):
+    return {"id": f"ind-{n}", "options": [{"value": v} for v in values]}
+
+
+def test_build_answers_picks_the_option_at_the_position():
+    review = {"indicators": [indicator(1, [10, 20, 30, 40, 50, 60]), indicator(2, [1, 2, 3])]}
+    assert build_answers(review, option_position=2) == [
+        {"indicator_id": "ind-1", "value": 20},
+        {"indicator_id": "ind-2", "value": 2},
+    ]
+    # Past the end picks the last option; indicators without options are left out
+    review["indicators"].append(indicator(3, []))
+    assert build_answers(review, option_position=6) == [
+        {"indicator_id": "ind-1", "value": 60},
+        {"indicator_id": "ind-2", "value": 3},
+    ]
+
+
+def test_every_pending_review_is_submitted_exactly_once(standin):
+    server, base_url = standin(StandinState(reviews=4))
+    session = RecordingSession(base_url)
+    assert run_review_http(session) == 4
+    assert sorted(session.posted) == sorted(f"/api/kinerjajabar/review-perilaku/{rid}" for rid in server.state.reviews)
+    for answers in server.state.submitted_reviews.values():
+        assert {a["value"] for a in answers} == {OPTIONS_PER_INDICATOR}
+
+
+def test_reviews_still_listed_after_submitting_are_not_resubmitted(standin, capsys):
+    server, base_url = standin(StandinState(reviews=3))
+    session = StaleListSession(base_url)
+    assert run_review_http(session) == 3
+    assert len(session.posted) == 3
+    assert "still listed as pending; not resubmitting" in capsys.readouterr().out
+
+
+def test_max_iterations_caps_the_submissions(standin):
+    server, base_url = standin(StandinState(reviews=5))
+    session = RecordingSession(base_url)
+    assert run_review_http(session, max_iterations=2) == 2
+    assert len(server.state.submitted_reviews) == 2
+
+
+def test_the_run_stops_at_the_first_failed_submit(standin):
+    state = StandinState(reviews=4)
+    broken = list(state.reviews)[1]
+    state.reviews[broken]["indicators"][0]["options"] = []  # no answer for it: the stand-in answers 422
+    server, base_url = standin(state)
+    session = RecordingSession(base_url)
+    with pytest.raises(HttpBackendError) as failure:
+        run_review_http(session)
+    assert failure.value.status == 422
+    assert len(session.posted) == 2
+    assert list(state.submitted_reviews) == [list(state.reviews)[0]]
@@ -0,0 +1,86 @@
+import csv
+import errno
+import json
+
+import pytest
+
+from run_journal import JournalError, RunJournal
+
+COLUMNS = ["no_urut", "status"]
+
+
+class FullDisk:
+    """File wrapper whose writes fail like on a full disk"""
+
+    def __init__(self, fh):
+        self.fh = fh
+
+    def write(self, text):
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    def __getattr__(self, name):
+        return getattr(self.fh, name)
+
+
+def read_jsonl(path):
+    with open(path, encoding="utf-8") as fh:
+        return [json.loads(line) for line in fh]
+
+
+def test_checkpoint_puts_every_queued_event_on_disk(tmp_path):
+    csv_path, jsonl_path = tmp_path / "log.csv", tmp_path / "log.jsonl"
+    journal = RunJournal(str(csv_path), str(jsonl_path), COLUMNS, flush_interval=30)
+    for n in range(120):
+        journal.write({"no_urut": str(n), "status": "SUCCESS", "seconds": n / 10})
+    journal.checkpoint()
+    # flush_interval is far away: the checkpoint itself got the events written
+    assert len(read_jsonl(jsonl_path)) == 120
+    with open(csv_path, newline="", encoding="utf-8") as fh:
+        rows = list(csv.reader(fh))
+    assert rows[0] == COLUMNS
+    assert rows[1:3] == [["0", "SUCCESS"], ["1", "SUCCESS"]]
+    journal.close()
+
+
+def test_reopening_appends_without_a_second_header(tmp_path):
+    csv_path, jsonl_path = str(tmp_path / "log.csv"), str(tmp_path / "log.jsonl")
+    for status in ("ERROR", "SUCCESS"):
+        journal = RunJournal(csv_path, jsonl_path, COLUMNS)
+        journal.write({"no_urut": "1", "status": status})
+        journal.close()
+    with open(csv_path, newline="", encoding="utf-8") as fh:
+        assert list(csv.reader(fh)) == [COLUMNS, ["1", "ERROR"], ["1", "SUCCESS"]]
+
+
+def test_an_event_that_cannot_be_serialised_is_skipped(tmp_path, capsys):
+    csv_path, jsonl_path = tmp_path / "log.csv", tmp_path / "log.jsonl"
+    journal = RunJournal(str(csv_path), str(jsonl_path), COLUMNS)
+    journal.write({"no_urut": "1", "status": "SUCCESS"})
+    journal.write({"no_urut": "2", "status": "ERROR", "error": object()})
+    journal.write({"no_urut": "3", "status": "SUCCESS"})
+    journal.close()
+    assert [e["no_urut"] for e in read_jsonl(jsonl_path)] == ["1", "3"]
+    assert "Could not write journal event" in capsys.readouterr().out
+    assert csv_path.read_text(encoding="utf-8").splitlines()[1:] == ["1,SUCCESS", "3,SUCCESS"]
+
+
+def test_a_write_error_fails_checkpoint_and_close(tmp_path):
+    journal = RunJournal(None, str(tmp_path / "log.jsonl"))
+    journal.jsonl_fh = FullDisk(journal.jsonl_fh)
+    journal.write({"no_urut": "1", "status": "SUCCESS"})
+    with pytest.raises(JournalError, match="No space left"):
+        journal.checkpoint(timeout=5)
+    assert isinstance(journal.error, OSError)
+    with pytest.raises(JournalError):
+        journal.close()
+    assert journal.jsonl_fh.closed
+
+
+def test_checkpoint_times_out_when_the_writer_does_not_answer(tmp_path):
+    journal = RunJournal(None, str(tmp_path / "log.jsonl"))
+    journal.checkpoint()
+    journal.events.put = lambda item: None  # the checkpoint request never reaches the writer
+    with pytest.raises(JournalError, match="timed out"):
+        journal.checkpoint(timeout=0.3)
+    del journal.events.put
+    journal.close()
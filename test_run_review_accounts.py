@@ -0,0 +1,27 @@
+import csv
+
+from run_review_accounts import find_accounts, save_summary
+
+
+def test_every_pickle_is_one_account(tmp_path):
+    for name in ("budi.pkl", "ani.pkl", "notes.txt"):
+        (tmp_path / name).write_bytes(b"")
+    assert find_accounts(str(tmp_path)) == {
+        "ani": str(tmp_path / "ani.pkl"),
+        "budi": str(tmp_path / "budi.pkl"),
+    }
+    assert find_accounts(str(tmp_path / "missing")) == {}
+
+
+def test_summary_has_one_row_per_account(tmp_path):
+    results = [
+        {"account": "ani", "status": "ok", "reviews": 4, "seconds": 12.5, "error": ""},
+        {"account": "budi", "status": "no session", "reviews": 0, "seconds": 0.3, "error": "login redirect"},
+    ]
+    path = tmp_path / "summary.csv"
+    save_summary(results, str(path))
+    with open(path, newline="", encoding="utf-8") as fh:
+        rows = list(csv.DictReader(fh))
+    assert [(r["account"], r["status"], r["reviews"], r["error"]) for r in rows] == [
+        ("ani", "ok", "4", ""), ("budi", "no session", "0", "login redirect"),
+    ]
@@ -0,0 +1,69 @@
+import csv
+import json
+import os
+
+from run_usul_shards import merge_shard_logs, plan_shards, shard_paths
+from usul_records import journal_path_for
+
+
+def row(no_urut, no_peserta):
+    return {"no_urut": no_urut, "no_peserta": no_peserta, "line": 0}
+
+
+def event(no_urut, no_peserta, status, details=""):
+    return {"timestamp": "2025-11-17T10:00:00", "no_urut": no_urut, "no_peserta": no_peserta,
+            "status": status, "details": details}
+
+
+def write_jsonl(path, events, tail=""):
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.writelines(json.dumps(e) + "\n" for e in events)
+        fh.write(tail)
+
+
+def test_plan_shards_drops_done_and_repeated_pairs_and_deals_round_robin():
+    rows = [row(str(n), f"1000{n}") for n in range(1, 8)] + [row("2", "10002")]
+    plan = plan_shards(rows, 3, done={("4", "10004")})
+    assert [[r["no_urut"] for r in shard] for shard in plan] == [["1", "5"], ["2", "6"], ["3", "7"]]
+    assert plan[0][0] == {"no_urut": "1", "no_peserta": "10001"}
+
+
+def test_plan_shards_with_more_shards_than_rows_leaves_some_empty():
+    assert plan_shards([row("1", "10001")], 3) == [[{"no_urut": "1", "no_peserta": "10001"}], [], []]
+
+
+def test_merge_shard_logs_appends_in_csv_row_order(tmp_path):
+    shard_dir = str(tmp_path / "shards")
+    os.makedirs(shard_dir)
+    log_path = str(tmp_path / "log.csv")
+    order = {("1", "10001"): 0, ("2", "10002"): 1, ("3", "10003"): 2}
+    # Shard 1 had rows 1 and 3, shard 2 row 2; shard 2's worker was killed mid-line
+    write_jsonl(shard_paths(1, shard_dir)[1].replace(".csv", ".jsonl"), [
+        event("3", "10003", "SUCCESS"),
+        event("1", "10001", "DRAFT", "Step 9: usul usul-1 created, not sent yet"),
+        event("1", "10001", "SUCCESS"),
+    ])
+    write_jsonl(shard_paths(2, shard_dir)[1].replace(".csv", ".jsonl"), [event("2", "10002", "ERROR")],
+                tail='{"no_urut": "2", "stat')
+    write_jsonl(os.path.join(shard_dir, "testUsul_log.shard2_metrics.jsonl"),
+                [{"record": "2/10002", "step": "record", "seconds": 1.5, "ok": False}])
+    open(shard_paths(1, shard_dir)[0], "w").close()
+
+    metrics = merge_shard_logs(order, log_path, shard_dir)
+
+    with open(log_path, newline="", encoding="utf-8") as fh:
+        merged = [(r["no_urut"], r["status"]) for r in csv.DictReader(fh)]
+    # Row order across shards, each record's own events in the order they happened
+    assert merged == [("1", "DRAFT"), ("1", "SUCCESS"), ("2", "ERROR"), ("3", "SUCCESS")]
+    with open(journal_path_for(log_path), encoding="utf-8") as fh:
+        assert len(fh.readlines()) == 4
+    assert metrics == [{"record": "2/10002", "step": "record", "seconds": 1.5, "ok": False}]
+    assert os.listdir(shard_dir) == []
+
+
+def test_merge_shard_logs_without_shard_files_changes_nothing(tmp_path):
+    shard_dir = str(tmp_path / "shards")
+    os.makedirs(shard_dir)
+    log_path = str(tmp_path / "log.csv")
+    assert merge_shard_logs({}, log_path, shard_dir) == []
+    assert not os.path.exists(log_path)
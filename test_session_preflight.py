@@ -0,0 +1,98 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from cookie_vault import KINERJA_HOST, CookieVault
+from session_preflight import check_session
+from standin_server import StandinState
+
+HOUR = 3600
+
+
+@pytest.fixture
+def vault(tmp_path, monkeypatch):
+    """An empty cookie vault in the test's own directory (the default vault path is relative)"""
+    monkeypatch.chdir(tmp_path)
+    return CookieVault()
+
+
+def save_session(vault, expires_in=HOUR):
+    vault.put(KINERJA_HOST, "default", [
+        {"name": "auth._token.local", "value": "Bearer%20standin", "expiry": time.time() + expires_in},
+    ])
+
+
+def serve(status, headers=(), body=b""):
+    """One-route server answering every GET with status, headers and body; returns (server, base_url)"""
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            self.send_response(status)
+            for name, value in headers:
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def check(base_url):
+    return check_session(KINERJA_HOST, base_url=base_url, legacy_files=[])
+
+
+def test_a_session_that_loads_the_review_page_passes(vault, standin):
+    save_session(vault)
+    server, base_url = standin(StandinState())
+    ok, reason = check(base_url)
+    assert ok is True, reason
+
+
+def test_an_expired_jar_fails_without_a_request(vault):
+    save_session(vault, expires_in=-HOUR)
+    ok, reason = check("http://127.0.0.1:9")
+    assert ok is False
+    assert "no unexpired cookies" in reason
+
+
+@pytest.mark.parametrize("location", [
+    "/login?redirect=%2Fkinerjajabar%2Freview-perilaku",
+    "https://sso-siasn.bkn.go.id/auth/realms/public-siasn/protocol/openid-connect/auth?client_id=x",
+])
+def test_a_redirect_to_the_login_page_fails(vault, location):
+    save_session(vault)
+    server, base_url = serve(302, [("Location", location)])
+    try:
+        assert check(base_url)[0] is False
+    finally:
+        server.shutdown()
+
+
+def test_a_login_form_served_in_place_fails(vault):
+    save_session(vault)
+    server, base_url = serve(200, body=b'<form><input name="password" type="password"></form>')
+    try:
+        assert check(base_url)[0] is False
+    finally:
+        server.shutdown()
+
+
+@pytest.mark.parametrize("status, headers", [(404, []), (302, [("Location", "/maintenance")]), (500, [])])
+def test_other_answers_are_inconclusive(vault, status, headers):
+    save_session(vault)
+    server, base_url = serve(status, headers)
+    try:
+        assert check(base_url)[0] is None
+    finally:
+        server.shutdown()
+
+
+def test_no_network_is_inconclusive(vault):
+    save_session(vault)
+    assert check("http://127.0.0.1:9")[0] is None
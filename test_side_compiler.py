@@ -0,0 +1,84 @@
+import os
+
+from selenium.webdriver.common.by import By
+
+from side_compiler import choose_locator, compile_side, compile_test, drop_noise, plan_steps
+
+SIDE = os.path.join(os.path.dirname(__file__), "Kuisioner Kinerja.side")
+FORM = "//div[@id='__nuxt']/div/section/form"
+
+
+def command(name, target="", targets=(), value=""):
+    return {"command": name, "target": target, "targets": [list(t) for t in targets], "value": value}
+
+
+def radio(n):
+    """Click on the n-th radio of the recorded form"""
+    return command("click", f"css=label:nth-child({n}) > input", [
+        (f"css=label:nth-child({n}) > input", "css:finder"),
+        (f"xpath={FORM}/div/label[{n}]/input", "xpath:idRelative"),
+    ])
+
+
+def test_choose_locator_prefers_stable_ids_and_names_over_paths():
+    generated = command("click", targets=[("id=headlessui-radio-7", "id:attributes"),
+                                          ("css=#headlessui-radio-7", "css:finder"),
+                                          ("name=nilai", "name"),
+                                          ("xpath=//label[6]/input", "xpath:position")])
+    assert choose_locator(generated) == ("name", By.NAME, "nilai")
+    assert choose_locator(command("click", targets=[("css=.w-4", "css:finder"), ("id=positif-12", "id")])) == (
+        "id", By.ID, "positif-12")
+
+
+def test_choose_locator_tells_step_buttons_apart_by_text():
+    button = command("click", targets=[
+        ("css=.mt-8 > button:nth-child(2)", "css:finder"),
+        ("xpath=//button[contains(.,'Selanjutnya')]", "xpath:innerText"),
+    ])
+    assert choose_locator(button) == ("text", By.XPATH, "//button[contains(.,'Selanjutnya')]")
+
+
+def test_drop_noise_removes_replay_no_ops():
+    field = "id=positif-1"
+    kept, dropped = drop_noise([
+        command("runScript", "window.scrollTo(0,480)"),
+        command("click", field, [(field, "id")]),
+        command("type", field, [(field, "id")], "baik"),
+        radio(1), radio(1), command("doubleClick", radio(1)["target"], radio(1)["targets"]),
+        command("close"),
+    ])
+    assert [c["command"] for c in kept] == ["type", "click", "click"]
+    assert dropped == {"window.scrollTo": 1, "click before type": 1, "doubleClick echo of two clicks": 1,
+                       "close": 1}
+
+
+def test_clicks_in_one_form_are_batched_until_a_target_repeats():
+    next_button = command("click", targets=[
+        ("css=.mt-8 > button", "css:finder"),
+        ("xpath=//button[contains(.,'Selanjutnya')]", "xpath:innerText"),
+        (f"xpath={FORM}/div[9]/button", "xpath:idRelative"),
+    ])
+    steps = plan_steps([radio(1), radio(2), radio(3), radio(1), radio(2), next_button])
+    assert [(name, len(loc) if name == "batch" else None) for name, loc, *_ in steps] == [
+        ("batch", 3), ("batch", 2), ("click", None),
+    ]
+    assert steps[-1][3] is True  # the step button waits for the page to settle
+
+
+def test_the_kuesioner_recording_compiles_to_fewer_round_trips(tmp_path):
+    out = tmp_path / "kuisioner_side.py"
+    reports = compile_side(SIDE, str(out))
+    assert [r["test"] for r in reports] == ["20250603 Kuisioner", "20250803 Review"]
+    for report in reports:
+        assert report["round_trips_after"] < report["round_trips_before"]
+    source = out.read_text(encoding="utf-8")
+    compile(source, str(out), "exec")
+    assert "def run_20250603_kuisioner(driver, base_url=BASE_URL):" in source
+    assert "'20250803 Review': run_20250803_review," in source
+
+
+def test_compile_test_names_functions_after_the_test():
+    function, steps, report = compile_test({"name": "Review 2", "commands": [command("open", "/")]})
+    assert function == "run_review_2"
+    assert steps == [("open", None, "/", True)]
+    assert report["round_trips_after"] == 1
@@ -0,0 +1,57 @@
+import json
+
+from step_metrics import RECORD_STEP, StepMetrics, percentile, print_step_table, read_metrics
+
+
+def test_percentile_uses_the_nearest_rank():
+    values = [0.5, 0.1, 0.4, 0.2, 0.3]
+    assert percentile(values, 50) == 0.3
+    assert percentile(values, 95) == 0.5
+    assert percentile([7], 95) == 7
+
+
+def test_laps_and_a_failed_step_are_streamed_per_record(tmp_path):
+    path = str(tmp_path / "metrics.jsonl")
+    metrics = StepMetrics(path)
+    metrics.lap("Step 1")  # before any record: ignored
+    metrics.start_record("1/10001")
+    metrics.lap("Step 1")
+    metrics.lap("Step 2")
+    metrics.end_record()
+    metrics.start_record("2/10002")
+    metrics.lap("Step 1")
+    metrics.end_record(ok=False, failed_step="Step 3")
+    metrics.close()
+
+    steps = [(e["record"], e["step"], e["ok"]) for e in read_metrics(path)]
+    assert steps == [
+        ("1/10001", "Step 1", True), ("1/10001", "Step 2", True), ("1/10001", RECORD_STEP, True),
+        ("2/10002", "Step 1", True), ("2/10002", "Step 3", False), ("2/10002", RECORD_STEP, False),
+    ]
+    assert metrics.events == read_metrics(path)
+
+
+def test_read_metrics_skips_a_torn_last_line(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    path.write_text(json.dumps({"step": "Step 1", "seconds": 0.2}) + '\n{"step": "Ste', encoding="utf-8")
+    assert read_metrics(str(path)) == [{"step": "Step 1", "seconds": 0.2}]
+    assert read_metrics(str(tmp_path / "missing.jsonl")) == []
+
+
+def test_step_table_orders_steps_numerically_with_the_record_total_last(capsys):
+    events = [
+        {"step": "Step 10.1", "seconds": 0.4},
+        {"step": RECORD_STEP, "seconds": 3.0},
+        {"step": "Step 10", "seconds": 0.6, "ok": False},
+        {"step": "Step 9", "seconds": 1.0},
+        {"step": "Step 9", "seconds": 2.0},
+        {"step": RECORD_STEP, "seconds": 4.0},
+    ]
+    print_step_table(events)
+    lines = capsys.readouterr().out.strip().splitlines()
+    assert "over 2 record(s)" in lines[0]
+    names = [line.split()[0:2] for line in lines[2:]]
+    assert names == [["Step", "9"], ["Step", "10"], ["Step", "10.1"], ["per", "record"]]
+    step_9 = lines[2].split()
+    assert step_9[-5:] == ["2", "1.000", "2.000", "2.000", "0"]
+    assert lines[3].split()[-1] == "1"  # Step 10 failed once
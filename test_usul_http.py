@@ -0,0 +1,109 @@
+import concurrent.futures
+import csv
+
+import kinerja_http
+import run_usul_shards
+import usul_http
+from kinerja_http import HttpBackendError, HttpSession
+from run_usul_shards import run_shards
+from standin_server import StandinState
+from usul_http import USUL_SEND_PATH, process_usul_records_http
+from usul_records import SUCCESS, load_done_index, load_draft_index
+
+COOKIES = [{"name": "SESSION", "value": "standin"}]
+RECORDS = [("1", "12345678"), ("2", "23456789"), ("3", "34567890")]
+
+
+def write_usul_csv(path, records=RECORDS):
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh, delimiter=";")
+        writer.writerow(["no_urut", "no_peserta"])
+        writer.writerows(records)
+    return str(path)
+
+
+class SendFailsSession(HttpSession):
+    """Stops at the send step of the given records, like a run killed between create and send.
+    With delivered=True the send reaches the portal and only the answer is lost."""
+
+    def __init__(self, base_url, usul_ids, delivered=False):
+        super().__init__(COOKIES, base_url)
+        self.usul_ids = set(usul_ids)
+        self.delivered = delivered
+
+    def post_json(self, path, payload):
+        if path in {USUL_SEND_PATH.format(usul_id=u) for u in self.usul_ids}:
+            if self.delivered:
+                super().post_json(path, payload)
+            raise HttpBackendError(f"POST {path} failed: timed out")
+        return super().post_json(path, payload)
+
+
+def sent_records(state):
+    return sorted(no_urut for no_urut, _ in state.usul_sent)
+
+
+def test_all_records_are_created_and_sent(standin, tmp_path):
+    server, base_url = standin(StandinState())
+    csv_path, log_path = write_usul_csv(tmp_path / "usul.csv"), str(tmp_path / "log.csv")
+    assert process_usul_records_http(HttpSession(COOKIES, base_url), csv_path, log_path) == 3
+    assert len(server.state.usul) == 3
+    assert sent_records(server.state) == ["1", "2", "3"]
+
+
+def test_a_created_draft_is_sent_on_resume_not_created_again(standin, tmp_path):
+    server, base_url = standin(StandinState())
+    csv_path, log_path = write_usul_csv(tmp_path / "usul.csv"), str(tmp_path / "log.csv")
+    assert process_usul_records_http(SendFailsSession(base_url, ["usul-2"]), csv_path, log_path) == 2
+    assert load_draft_index(log_path) == {("2", "23456789"): "usul-2"}
+
+    assert process_usul_records_http(HttpSession(COOKIES, base_url), csv_path, log_path) == 1
+    assert len(server.state.usul) == 3
+    assert server.state.usul_sent[("2", "peserta-23456789")] == "usul-2"
+    assert load_draft_index(log_path) == {}
+
+
+def test_a_draft_already_sent_counts_as_done(standin, tmp_path):
+    server, base_url = standin(StandinState())
+    csv_path, log_path = write_usul_csv(tmp_path / "usul.csv"), str(tmp_path / "log.csv")
+    process_usul_records_http(SendFailsSession(base_url, ["usul-1"], delivered=True), csv_path, log_path)
+    assert sent_records(server.state) == ["1", "2", "3"]
+
+    # The resend is answered with 409: logged as SUCCESS without a second usul
+    assert process_usul_records_http(HttpSession(COOKIES, base_url), csv_path, log_path) == 1
+    assert len(server.state.usul) == 3
+    assert ("1", "12345678") in load_done_index(log_path)
+
+
+def test_shards_consume_a_handed_over_draft_once(standin, tmp_path, monkeypatch):
+    server, base_url = standin(StandinState())
+    monkeypatch.chdir(tmp_path)
+    csv_path, log_path = write_usul_csv(tmp_path / "usul.csv"), str(tmp_path / "log.csv")
+    process_usul_records_http(SendFailsSession(base_url, ["usul-3"]), csv_path, log_path)
+    assert load_draft_index(log_path) == {("3", "34567890"): "usul-3"}
+
+    # Shards as threads in this process, talking to the stand-in
+    monkeypatch.setattr(run_usul_shards, "ProcessPoolExecutor", concurrent.futures.ThreadPoolExecutor)
+    monkeypatch.setattr(run_usul_shards, "require_session", lambda host: True)
+    monkeypatch.setattr(usul_http, "SIASN_BASE_URL", base_url)
+    monkeypatch.setattr(kinerja_http.HttpSession, "from_cookie_files",
+                        classmethod(lambda cls, files, base_url, **kw: cls(COOKIES, base_url)))
+
+    results = run_shards(csv_path, shards=3, backend="http", log_path=log_path)
+    assert [error for _, _, error in results] == [""]
+    assert len(server.state.usul) == 3
+    assert sent_records(server.state) == ["1", "2", "3"]
+    assert load_draft_index(log_path) == {}
+    assert len(load_done_index(log_path)) == 3
+    # Nothing is left for a second sharded run
+    assert run_shards(csv_path, shards=3, backend="http", log_path=log_path) == []
+
+
+def test_the_log_marks_each_record_once_as_success(standin, tmp_path):
+    server, base_url = standin(StandinState())
+    csv_path, log_path = write_usul_csv(tmp_path / "usul.csv"), str(tmp_path / "log.csv")
+    process_usul_records_http(SendFailsSession(base_url, ["usul-1"]), csv_path, log_path)
+    process_usul_records_http(HttpSession(COOKIES, base_url), csv_path, log_path)
+    with open(log_path, newline="", encoding="utf-8") as fh:
+        statuses = [(row["no_urut"], row["status"]) for row in csv.DictReader(fh)]
+    assert [no_urut for no_urut, status in statuses if status == SUCCESS] == ["2", "3", "1"]
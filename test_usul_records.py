@@ -0,0 +1,115 @@
+import csv
+
+import pytest
+
+from usul_records import (
+    SUCCESS, UsulCsvReader, UsulRun, load_done_index, load_draft_index, load_unconfirmed_index,
+    validate_usul_row,
+)
+
+
+def write_csv(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def read_rejects(path):
+    with open(path, newline="", encoding="utf-8") as fh:
+        return [(row["line"], row["reason"]) for row in csv.DictReader(fh)]
+
+
+def test_validate_usul_row_normalises_spreadsheet_formatting():
+    assert validate_usul_row({"no_urut": " 12 ", "no_peserta": "1990 0101.2020-1"}) == ("12", "1990010120201", None)
+    assert validate_usul_row({"no_urut": "", "no_peserta": "123456"})[2] == "missing no_urut"
+    assert validate_usul_row({"no_urut": "1", "no_peserta": None})[2] == "missing no_peserta"
+    assert "is not a number" in validate_usul_row({"no_urut": "1a", "no_peserta": "123456"})[2]
+    assert "does not match" in validate_usul_row({"no_urut": "1", "no_peserta": "12AB56"})[2]
+
+
+def test_reader_yields_valid_rows_and_rejects_the_rest(tmp_path):
+    csv_path = write_csv(tmp_path / "usul.csv", "\ufeffno_urut;no_peserta\n"
+                         "1;12345678\n"
+                         "2;\n"
+                         "x;23456789\n"
+                         "1;1234 5678\n"
+                         "3;34567890\n")
+    reader = UsulCsvReader(csv_path)
+    rows = list(reader)
+    assert rows == [
+        {"no_urut": "1", "no_peserta": "12345678", "line": 2},
+        {"no_urut": "3", "no_peserta": "34567890", "line": 6},
+    ]
+    assert (reader.accepted, reader.rejected) == (2, 3)
+    assert read_rejects(reader.reject_path) == [
+        ("3", "missing no_peserta"),
+        ("4", "no_urut 'x' is not a number"),
+        ("5", "duplicate of line 2"),
+    ]
+
+
+def test_a_second_pass_keeps_the_rejects_file(tmp_path):
+    csv_path = write_csv(tmp_path / "usul.csv", "no_urut;no_peserta\n1;12345678\n1;12345678\n")
+    reader = UsulCsvReader(csv_path)
+    list(reader)
+    first = read_rejects(reader.reject_path)
+    assert list(reader) == [{"no_urut": "1", "no_peserta": "12345678", "line": 2}]
+    assert reader.rejected == 1
+    assert read_rejects(reader.reject_path) == first
+
+
+def test_a_clean_file_leaves_no_rejects_from_an_earlier_run(tmp_path):
+    csv_path = write_csv(tmp_path / "usul.csv", "no_urut;no_peserta\n1;12345678\n1;12345678\n")
+    list(UsulCsvReader(csv_path))
+    write_csv(tmp_path / "usul.csv", "no_urut;no_peserta\n1;12345678\n")
+    reader = UsulCsvReader(csv_path)
+    list(reader)
+    assert not (tmp_path / "usul_rejects.csv").exists()
+
+
+def test_a_missing_column_fails_before_any_row_is_read(tmp_path):
+    csv_path = write_csv(tmp_path / "usul.csv", "no_urut,no_peserta\n1,12345678\n")
+    with pytest.raises(ValueError, match="missing column"):
+        UsulCsvReader(csv_path)
+
+
+def test_usul_run_skips_done_and_unconfirmed_records_on_resume(tmp_path, capsys):
+    log_path = str(tmp_path / "log.csv")
+    rows = [{"no_urut": str(n), "no_peserta": f"1234567{n}"} for n in range(1, 4)]
+    with UsulRun(log_path, resume=True) as run:
+        for idx, row in run.rows(rows):
+            if row["no_urut"] == "1":
+                run.log("1", "12345671", SUCCESS, "All steps completed successfully.")
+            elif row["no_urut"] == "2":
+                run.submitted("2", "12345672")
+                run.log("2", "12345672", "ERROR", "Step 10.2: confirmation modal did not open")
+            else:
+                run.log("3", "12345673", "ERROR", "Step 3: no result")
+    assert load_unconfirmed_index(log_path) == {("2", "12345672")}
+
+    with UsulRun(log_path, resume=True) as run:
+        assert [row["no_urut"] for _, row in run.rows(rows)] == ["3"]
+    assert "submitted earlier without confirmation" in capsys.readouterr().out
+
+    # Even without resume, a submitted record is not run again
+    with UsulRun(log_path, resume=False) as run:
+        assert [row["no_urut"] for _, row in run.rows(rows)] == ["1", "3"]
+
+
+def test_a_success_clears_the_unconfirmed_mark(tmp_path):
+    log_path = str(tmp_path / "log.csv")
+    with UsulRun(log_path) as run:
+        run.submitted("2", "12345672")
+        run.log("2", "12345672", SUCCESS, "All steps completed successfully.")
+    assert load_unconfirmed_index(log_path) == set()
+    assert load_done_index(log_path) == {("2", "12345672")}
+
+
+def test_a_draft_is_handed_to_the_next_run_until_it_succeeds(tmp_path):
+    log_path = str(tmp_path / "log.csv")
+    with UsulRun(log_path) as run:
+        run.draft("4", "12345674", "usul-9")
+    assert load_draft_index(log_path) == {("4", "12345674"): "usul-9"}
+    with UsulRun(log_path) as run:
+        assert run.drafts == {("4", "12345674"): "usul-9"}
+        run.log("4", "12345674", SUCCESS, "All steps completed successfully.")
+    assert load_draft_index(log_path) == {}
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Browserless SIASN usul submission.
+Replays the siasn-instansi API calls behind process_usul_records_from_csv
+(search noPeserta, check the match, create the usul with no_urut/date/option,
+then send it - what the three confirmation modals do) using the
+siasn_cookies.pkl session, and writes the same testUsul_log.csv rows. A
+created usul is journaled as DRAFT before it is sent, so a run interrupted in
+between sends that draft on resume instead of creating a second one; when the
+portal answers that send with 409 (it went through before the run stopped) the
+record counts as done.
+
+The endpoint paths below mirror what the frontend requests; override them
+with the USUL_*_PATH environment variables if the portal moves them.
+standin_server.py serves the same API locally for testing.
+
+Usage:
+   python3 usul_http.py testUsul.csv
+   python3 usul_http.py testUsul.csv --base-url http://127.0.0.1:8765
+"""
+
+import argparse
+import os
+import time
+import urllib.parse
+
+from cookie_vault import SIASN_HOST
+from kinerja_http import HttpBackendError, HttpSession
+from usul_records import (
+    SUCCESS, USUL_CSV, USUL_DATE, USUL_LOG, USUL_OPTION_INDEX, USUL_RESUME, UsulCsvReader, UsulRun,
+)
+
+SIASN_BASE_URL = os.environ.get("SIASN_BASE_URL", "https://siasn-instansi.bkn.go.id")
+SIASN_SSO_BASE_URL = os.environ.get("SIASN_SSO_BASE_URL", "https://sso-siasn.bkn.go.id")
+COOKIE_FILE = "siasn_cookies.pkl"
+USUL_SEARCH_PATH = os.environ.get("USUL_SEARCH_PATH", "/api/usul/peserta?noPeserta={no_peserta}")
+USUL_OPTIONS_PATH = os.environ.get("USUL_OPTIONS_PATH", "/api/usul/referensi")
+USUL_CREATE_PATH = os.environ.get("USUL_CREATE_PATH", "/api/usul")
+USUL_SEND_PATH = os.environ.get("USUL_SEND_PATH", "/api/usul/{usul_id}/kirim")
+
+
+def _data(body):
+    return body.get("data") if isinstance(body, dict) else body
+
+
+def fetch_option_id(session):
+    """Id of the option the browser flow picks as option[5] of the select"""
+    options = _data(session.get_json(USUL_OPTIONS_PATH)) or []
+    # option[1] of the select is the "Pilih ..." placeholder, which the API omits
+    position = USUL_OPTION_INDEX - 1
+    if len(options) <= position:
+        raise HttpBackendError(f"Expected at least {position + 1} usul options, got {len(options)}")
+    return options[position]["id"]
+
+
+def submit_usul(session, no_urut, no_peserta, option_id, lap=None, draft_id=None, on_created=None):
+    """Run the usul steps for one record; returns (status, details) for the log.
+    lap(step) is called after each step that succeeds, for the step timings.
+    on_created(usul_id) runs between creating and sending the usul, to journal it; with
+    draft_id (a usul an earlier run created but did not send) only the send step runs."""
+    lap = lap or (lambda step: None)
+    if draft_id is not None:
+        return _send_usul(session, draft_id, lap)
+
+    # Steps 1-3: search by nomor peserta and validate the result row
+    try:
+        path = USUL_SEARCH_PATH.format(no_peserta=urllib.parse.quote(no_peserta))
+        results = _data(session.get_json(path)) or []
+    except HttpBackendError as exc:
+        return "ERROR", f"Step 2: search failed: {exc}"
+    lap("Step 2")
+    if not results:
+        return "ERROR", f"Step 3: no result for no_peserta '{no_peserta}'"
+    found = str(results[0].get("noPeserta", "")).strip()
+    if found != no_peserta:
+        return "ERROR", f"Step 3: no_peserta mismatch - table shows '{found}' but expected '{no_peserta}'"
+    lap("Step 3")
+
+    # Steps 4-9: create the usul with no_urut, date and option
+    try:
+        created = _data(session.post_json(USUL_CREATE_PATH, {
+            "peserta_id": results[0]["id"],
+            "no_urut": no_urut,
+            "tanggal": USUL_DATE,
+            "jenis_id": option_id,
+        })) or {}
+    except HttpBackendError as exc:
+        return "ERROR", f"Step 9: submit failed: {exc}"
+    if "id" not in created:
+        return "ERROR", "Step 9: submit returned no usul id"
+    lap("Step 9")
+    if on_created:
+        on_created(created["id"])
+    return _send_usul(session, created["id"], lap)
+
+
+def _send_usul(session, usul_id, lap):
+    # Step 10: the three confirmation modals send the usul
+    try:
+        session.post_json(USUL_SEND_PATH.format(usul_id=usul_id), {"konfirmasi": True})
+    except HttpBackendError as exc:
+        if exc.status != 409:
+            return "ERROR", f"Step 10: confirmation of usul {usul_id} failed: {exc}"
+        # 409: an earlier run sent it but stopped before logging SUCCESS
+        print(f"   ℹ️ Usul {usul_id} was already sent")
+    lap("Step 10")
+    return SUCCESS, "All steps completed successfully."
+
+
+def process_usul_records_http(session, csv_path=USUL_CSV, log_path=USUL_LOG, resume=USUL_RESUME, drafts=None):
+    """HTTP counterpart of TestUsulNIP.process_usul_records_from_csv.
+    drafts ({(no_urut, no_peserta): usul_id}) defaults to the unsent usul in log_path's journal."""
+    print(f"📄 Streaming usul records from {csv_path}...")
+    rows = UsulCsvReader(csv_path)
+    succeeded = processed = 0
+    start = time.perf_counter()
+    with UsulRun(log_path, resume, drafts=drafts) as run:
+        option_id = fetch_option_id(session)
+        for idx, row in run.rows(rows):
+            no_urut = row["no_urut"]
+            no_peserta = row["no_peserta"]
+            processed += 1
+            status, details = submit_usul(
+                session, no_urut, no_peserta, option_id, run.lap,
+                draft_id=run.drafts.get((no_urut, no_peserta)),
+                on_created=lambda usul_id: run.draft(no_urut, no_peserta, usul_id),
+            )
+            run.log(no_urut, no_peserta, status, details)
+            icon = "✓" if status == SUCCESS else "⚠️"
+            print(f"   {icon} Record {idx}: no_urut={no_urut}, no_peserta={no_peserta} - {details}")
+            succeeded += status == SUCCESS
+
+    elapsed = time.perf_counter() - start
+    rows.print_summary()
+    print(f"\n✅ {succeeded}/{processed} usul record(s) submitted in {elapsed:.1f}s")
+    return succeeded
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Submit SIASN usul records over HTTP")
+    parser.add_argument("csv_path", nargs="?", default=USUL_CSV)
+    parser.add_argument("--base-url", default=SIASN_BASE_URL)
+    parser.add_argument("--log", default=USUL_LOG)
+    parser.add_argument("--no-resume", dest="resume", action="store_false", default=USUL_RESUME,
+                        help="process rows already logged as SUCCESS again")
+    args = parser.parse_args()
+
+    try:
+        session = HttpSession.from_cookie_files([COOKIE_FILE], base_url=args.base_url, domain=SIASN_HOST)
+        process_usul_records_http(session, args.csv_path, args.log, args.resume)
+    except HttpBackendError as e:
+        print(f"\n❌ {e}")
+        print("💡 If the session expired, log in again with the browser flow to refresh siasn_cookies.pkl")
@@ -0,0 +1,348 @@
+"""
+Input and log files for the SIASN usul flow.
+testUsul.csv (";"-separated, columns no_urut and no_peserta) is the input,
+testUsul_log.csv gets one "timestamp,no_urut,no_peserta,status,details" row
+per record or error, and testUsul_log.jsonl the same events with the step,
+seconds spent on the record and error class. Both are written in batches by
+a RunJournal thread. Step timings go to testUsul_log_metrics.jsonl (see
+step_metrics.py). Shared by the browser flow and usul_http.py.
+
+UsulCsvReader streams the input and validates each row before it reaches a
+browser: malformed, incomplete and duplicate rows go to testUsul_rejects.csv
+with the reason instead of failing later in the search step. Run
+"python3 usul_records.py testUsul.csv" to check a file without processing it.
+
+UsulRun makes a pass resumable: records the log already shows as SUCCESS are
+skipped, and Ctrl+C stops after the current record so a restart continues
+where the run stopped. Set USUL_RESUME=0 to process every row again. Records
+logged as SUBMITTED_UNCONFIRMED (submitted, but a confirmation step failed)
+are always skipped and listed for a manual check, since running them again
+would submit a second usul. Use it as a context manager around the loop over
+run.rows(), so the log is closed and the Ctrl+C handler restored even when
+the loop body raises.
+"""
+
+import csv
+import json
+import os
+import re
+import signal
+import threading
+import time
+from datetime import datetime
+
+from run_journal import RunJournal
+from step_metrics import StepMetrics, metrics_path_for
+
+USUL_CSV = "testUsul.csv"
+USUL_LOG = "testUsul_log.csv"
+LOG_HEADER = ["timestamp", "no_urut", "no_peserta", "status", "details"]
+# Values the usul form is filled with for every record
+USUL_DATE = "2025-11-17"  # HTML5 date input, YYYY-MM-DD
+USUL_OPTION_INDEX = 4  # option[5] of the form's select (0-based index)
+USUL_RESUME = os.environ.get("USUL_RESUME", "1").strip().lower() not in ("0", "false", "no", "off")
+SUCCESS = "SUCCESS"
+# Logged (with its usul_id) when a usul is created but not sent yet, so a resumed run sends it
+DRAFT = "DRAFT"
+# Logged right after the browser's submit click; until SUCCESS follows, resume leaves the record alone
+SUBMITTED_UNCONFIRMED = "SUBMITTED_UNCONFIRMED"
+# fsync the log after this many records, so a crash loses at most a few lines
+CHECKPOINT_EVERY = 25
+STEP_PATTERN = re.compile(r"^(Step [\d.]+)")
+NO_URUT_PATTERN = re.compile(r"^\d{1,6}$")
+# Nomor peserta is all digits; spaces/dots/dashes from spreadsheets are removed first
+NO_PESERTA_PATTERN = re.compile(os.environ.get("USUL_PESERTA_PATTERN", r"^\d{5,30}$"))
+PESERTA_SEPARATORS = re.compile(r"[\s.\-]")
+
+
+def rejects_path_for(csv_path):
+    """testUsul.csv -> testUsul_rejects.csv"""
+    return os.path.splitext(csv_path)[0] + "_rejects.csv"
+
+
+def validate_usul_row(row):
+    """Normalise one CSV row; returns (no_urut, no_peserta, reason), reason is None for a valid row"""
+    no_urut = (row.get("no_urut") or "").strip()
+    no_peserta = PESERTA_SEPARATORS.sub("", row.get("no_peserta") or "")
+    if not no_urut:
+        return no_urut, no_peserta, "missing no_urut"
+    if not no_peserta:
+        return no_urut, no_peserta, "missing no_peserta"
+    if not NO_URUT_PATTERN.match(no_urut):
+        return no_urut, no_peserta, f"no_urut '{no_urut}' is not a number"
+    if not NO_PESERTA_PATTERN.match(no_peserta):
+        return no_urut, no_peserta, f"no_peserta '{no_peserta}' does not match {NO_PESERTA_PATTERN.pattern}"
+    return no_urut, no_peserta, None
+
+
+class UsulCsvReader:
+    """Stream valid, normalised {"no_urut", "no_peserta", "line"} rows from the usul CSV.
+    Rejected rows are written to reject_path with their line number and reason, on the
+    first pass over the file only; later passes validate the same way without rewriting it."""
+
+    def __init__(self, csv_path=USUL_CSV, reject_path=None):
+        self.csv_path = csv_path
+        self.reject_path = reject_path or rejects_path_for(csv_path)
+        self.accepted = 0
+        self.rejected = 0
+        self.passes = 0
+        # Fail on a missing file or wrong header now, not when the first row is needed
+        with self._open() as fh:
+            self._check_header(csv.DictReader(fh, delimiter=";"))
+
+    def _open(self):
+        # utf-8-sig: spreadsheets often save the CSV with a byte order mark
+        return open(self.csv_path, newline="", encoding="utf-8-sig")
+
+    def _check_header(self, reader):
+        missing = {"no_urut", "no_peserta"} - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"{self.csv_path} is missing column(s): {', '.join(sorted(missing))}")
+
+    def __iter__(self):
+        seen = {}
+        reject_fh = reject_writer = None
+        self.accepted = self.rejected = 0
+        self.passes += 1
+        write_rejects = self.passes == 1
+        if write_rejects and os.path.exists(self.reject_path):
+            os.remove(self.reject_path)  # the report only describes the current run
+        with self._open() as fh:
+            reader = csv.DictReader(fh, delimiter=";")
+            self._check_header(reader)
+            try:
+                for row in reader:
+                    no_urut, no_peserta, reason = validate_usul_row(row)
+                    if reason is None and (no_urut, no_peserta) in seen:
+                        reason = f"duplicate of line {seen[(no_urut, no_peserta)]}"
+                    if reason:
+                        if write_rejects and reject_writer is None:
+                            reject_fh = open(self.reject_path, "w", newline="", encoding="utf-8")
+                            reject_writer = csv.writer(reject_fh)
+                            reject_writer.writerow(["line", "no_urut", "no_peserta", "reason"])
+                        if reject_writer:
+                            reject_writer.writerow([reader.line_num, no_urut, no_peserta, reason])
+                        self.rejected += 1
+                        continue
+                    seen[(no_urut, no_peserta)] = reader.line_num
+                    self.accepted += 1
+                    yield {"no_urut": no_urut, "no_peserta": no_peserta, "line": reader.line_num}
+            finally:
+                if reject_fh:
+                    reject_fh.close()
+
+    def print_summary(self):
+        print(f"📄 {self.csv_path}: {self.accepted} valid row(s), {self.rejected} rejected")
+        if self.rejected:
+            print(f"   ⚠️  Rejected rows and reasons: {self.reject_path}")
+
+
+def journal_path_for(log_path):
+    """testUsul_log.csv -> testUsul_log.jsonl"""
+    return os.path.splitext(log_path)[0] + ".jsonl"
+
+
+def _load_statuses(log_path):
+    """{(no_urut, no_peserta): set of statuses the log records for the pair}"""
+    statuses = {}
+    if not os.path.exists(log_path):
+        return statuses
+    with open(log_path, newline="", encoding="utf-8") as log_fh:
+        for row in csv.DictReader(log_fh):
+            key = ((row.get("no_urut") or "").strip(), (row.get("no_peserta") or "").strip())
+            statuses.setdefault(key, set()).add(row.get("status"))
+    return statuses
+
+
+def load_done_index(log_path=USUL_LOG):
+    """(no_urut, no_peserta) pairs the log records as SUCCESS, read in one pass"""
+    return {key for key, seen in _load_statuses(log_path).items() if SUCCESS in seen}
+
+
+def load_unconfirmed_index(log_path=USUL_LOG):
+    """Pairs submitted but never confirmed (SUBMITTED_UNCONFIRMED without a SUCCESS)"""
+    return {key for key, seen in _load_statuses(log_path).items()
+            if SUBMITTED_UNCONFIRMED in seen and SUCCESS not in seen}
+
+
+def load_draft_index(log_path=USUL_LOG):
+    """{(no_urut, no_peserta): usul_id} for usul created but never logged as SUCCESS.
+    Read from the JSONL journal, which keeps the usul_id the CSV log has no column for."""
+    drafts = {}
+    journal_path = journal_path_for(log_path)
+    if not os.path.exists(journal_path):
+        return drafts
+    with open(journal_path, encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue  # a line cut short by a crash
+            key = (str(event.get("no_urut", "")).strip(), str(event.get("no_peserta", "")).strip())
+            if event.get("status") == DRAFT and event.get("usul_id"):
+                drafts[key] = event["usul_id"]
+            elif event.get("status") == SUCCESS:
+                drafts.pop(key, None)
+    return drafts
+
+
+class UsulRun:
+    """One resumable pass over the usul rows, logging to log_path"""
+
+    def __init__(self, log_path=USUL_LOG, resume=USUL_RESUME, journal_path=None,
+                 checkpoint_every=CHECKPOINT_EVERY, drafts=None):
+        self.log_path = log_path
+        self.done = load_done_index(log_path) if resume else set()
+        # Submitted before but not confirmed: never run again automatically, even without resume
+        self.unconfirmed = load_unconfirmed_index(log_path) - self.done
+        self.held = []
+        # Usul created by an earlier run but not sent; drafts overrides the ones in this log
+        self.drafts = drafts if drafts is not None else load_draft_index(log_path) if resume else {}
+        self.stop_requested = False
+        self.skipped = 0
+        self.logged = 0
+        self.checkpoint_every = checkpoint_every
+        self.record_started = time.perf_counter()
+        self.pending = None  # the rows() generator in progress
+        self.closed = False
+        self.journal = RunJournal(log_path, journal_path or journal_path_for(log_path), LOG_HEADER)
+        self.metrics = StepMetrics(metrics_path_for(log_path))
+        if self.done:
+            print(f"↩️  Resuming: {len(self.done)} record(s) already logged as {SUCCESS} will be skipped")
+        if self.unconfirmed:
+            print(f"⚠️  {len(self.unconfirmed)} record(s) were submitted but not confirmed; they are skipped, "
+                  f"check them in the portal")
+        if self.drafts:
+            print(f"↩️  Resuming: {len(self.drafts)} usul created but not sent will be sent, not created again")
+
+    def lap(self, step):
+        """Mark step (e.g. "Step 4") of the current record as done, for the step timings"""
+        self.metrics.lap(step)
+
+    def log(self, no_urut_val, no_peserta_val, status, details, error=None, step=None):
+        """Queue one log event; step defaults to the "Step N" prefix of details"""
+        if step is None:
+            match = STEP_PATTERN.match(details)
+            step = match.group(1) if match else ("done" if status == SUCCESS else "")
+        self.metrics.end_record(status == SUCCESS, failed_step=None if status == SUCCESS else step)
+        self.journal.write({
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "no_urut": no_urut_val,
+            "no_peserta": no_peserta_val,
+            "record": f"{no_urut_val}/{no_peserta_val}",
+            "status": status,
+            "step": step,
+            "seconds": round(time.perf_counter() - self.record_started, 3),
+            "error_class": type(error).__name__ if error is not None else "",
+            "details": details,
+        })
+        self.logged += 1
+        if status == SUCCESS:
+            self.done.add((no_urut_val, no_peserta_val))
+            self.drafts.pop((no_urut_val, no_peserta_val), None)
+            self.unconfirmed.discard((no_urut_val, no_peserta_val))
+        if self.logged % self.checkpoint_every == 0:
+            self.journal.checkpoint()
+
+    def _mark(self, no_urut_val, no_peserta_val, status, details, **extra):
+        """Log an intermediate status of the current record and fsync it right away"""
+        self.journal.write({
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "no_urut": no_urut_val,
+            "no_peserta": no_peserta_val,
+            "record": f"{no_urut_val}/{no_peserta_val}",
+            "status": status,
+            "step": "Step 9",
+            "seconds": round(time.perf_counter() - self.record_started, 3),
+            "error_class": "",
+            "details": details,
+            **extra,
+        })
+        self.journal.checkpoint()
+
+    def draft(self, no_urut_val, no_peserta_val, usul_id):
+        """Log a created usul before it is sent, so a crash in between does not lead to a
+        second draft on resume"""
+        self.drafts[(no_urut_val, no_peserta_val)] = usul_id
+        self._mark(no_urut_val, no_peserta_val, DRAFT, f"Step 9: usul {usul_id} created, not sent yet",
+                   usul_id=usul_id)
+
+    def submitted(self, no_urut_val, no_peserta_val):
+        """Log that the usul form was submitted; until SUCCESS follows, resume skips the record"""
+        self.unconfirmed.add((no_urut_val, no_peserta_val))
+        self._mark(no_urut_val, no_peserta_val, SUBMITTED_UNCONFIRMED,
+                   "Step 9: usul submitted, confirmation pending")
+
+    def close(self):
+        """Write out and fsync everything still queued (once)"""
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self.journal.close()
+        finally:
+            self.metrics.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # An exception in the loop body leaves rows() suspended; closing it runs its cleanup now
+        if self.pending is not None:
+            self.pending.close()
+        self.close()
+
+    def _on_sigint(self, signum, frame):
+        if self.stop_requested:
+            raise KeyboardInterrupt
+        self.stop_requested = True
+        print("\n⏸️  Ctrl+C: finishing the current record, then stopping (press again to abort now)")
+
+    def rows(self, rows):
+        """Yield (idx, row) for the records still to do; stops cleanly after Ctrl+C"""
+        self.pending = self._rows(rows)
+        return self.pending
+
+    def _rows(self, rows):
+        handle_signal = threading.current_thread() is threading.main_thread()
+        previous = signal.signal(signal.SIGINT, self._on_sigint) if handle_signal else None
+        try:
+            for idx, row in enumerate(rows, start=1):
+                if self.stop_requested:
+                    self.journal.checkpoint()
+                    print(f"\n💾 Checkpoint: stopped before record {idx}; {len(self.done)} record(s) done. "
+                          f"Run again to continue.")
+                    break
+                key = (row["no_urut"].strip(), row["no_peserta"].strip())
+                if key in self.done:
+                    self.skipped += 1
+                    continue
+                if key in self.unconfirmed:
+                    self.held.append(key)
+                    continue
+                self.record_started = time.perf_counter()
+                self.metrics.start_record(f"{row['no_urut'].strip()}/{row['no_peserta'].strip()}")
+                yield idx, row
+        finally:
+            try:
+                if handle_signal:
+                    signal.signal(signal.SIGINT, previous)
+            finally:
+                self.close()
+            if self.skipped:
+                print(f"↩️  Skipped {self.skipped} record(s) already submitted")
+            if self.held:
+                print(f"⚠️  Skipped {len(self.held)} record(s) submitted earlier without confirmation "
+                      f"(check them in the portal, then log them as {SUCCESS} or remove their lines): "
+                      + ", ".join(f"{u}/{p}" for u, p in self.held))
+            self.metrics.print_summary()
+
+
+if __name__ == "__main__":
+    # Validation-only pass: python3 usul_records.py [testUsul.csv]
+    import sys
+
+    reader = UsulCsvReader(sys.argv[1] if len(sys.argv) > 1 else USUL_CSV)
+    for _ in reader:
+        pass
+    reader.print_summary()